@@ -0,0 +1,72 @@
+"""Measures Alfred's cold-start cost: import time of each entry point in a fresh interpreter.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--output startup.jsonl]
+
+Each case runs in a new `python -c` process, so nothing is cached between runs;
+the median of `--runs` is reported. `--output` appends one JSON line per run of
+the benchmark, so import time can be tracked across changes.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ("langchain_core", "langchain_openai", "openai", "langgraph", "PyPDF2", "docx",
+                 "numpy")
+
+CASES = [
+    ("python (baseline)", "pass"),
+    ("core.client", "import core.client"),
+    ("core.chat_with_alfred", "import core.chat_with_alfred"),
+    ("core.tools", "import core.tools"),
+    ("core.langgraph_workflow", "import core.langgraph_workflow"),
+    ("core.ai.load_models()", "import core.ai; core.ai.load_models()"),
+]
+
+REPORT = ("import json, sys; print('\\n' + json.dumps("
+          "[m for m in %r if m in sys.modules]))" % (HEAVY_MODULES,))
+
+
+def time_case(code, runs):
+    """Returns (median seconds, heavy modules the case loaded) over `runs` fresh processes."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")  # load_models() builds, never calls
+    timings = []
+    loaded = []
+    for _ in range(runs):
+        began = time.perf_counter()
+        finished = subprocess.run([sys.executable, "-c", f"{code}\n{REPORT}"], cwd=ROOT, env=env,
+                                  capture_output=True, text=True)
+        timings.append(time.perf_counter() - began)
+        if finished.returncode != 0:
+            raise RuntimeError(f"{code!r} failed:\n{finished.stderr}")
+        loaded = json.loads(finished.stdout.strip().splitlines()[-1])
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="append the results to this JSONL file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in CASES:
+        seconds, loaded = time_case(code, args.runs)
+        results[name] = {"seconds": round(seconds, 4), "loaded": loaded}
+        print(f"{name:28s} {seconds * 1000:8.1f} ms   {', '.join(loaded) or '-'}")
+
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as file:
+            file.write(json.dumps({"timestamp": time.time(), "python": sys.version.split()[0],
+                                   "runs": args.runs, "results": results}) + "\n")
+        print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
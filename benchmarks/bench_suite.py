@@ -0,0 +1,279 @@
+"""Offline benchmarks for Alfred's hot paths on synthetic trees and document corpora.
+
+Usage: python -m benchmarks.bench_suite [--entries 10000 100000] [--documents 30]
+       [--repeat 5] [--output results.json] [--baseline baseline.json] [--tolerance 0.25]
+
+Times `search_for_target` (live walk, index build, index lookup), `read_file_content`
+(TXT/PDF/DOCX, cold and warm), `execute_tool_call` and full `graph.invoke` runs.
+The graph is driven by `ScriptedModel`, a deterministic stand-in for
+`model_with_tools`, and embeddings are hashed locally, so no API is called and no
+key is needed. Everything is written under a temporary HOME.
+
+`--output` writes the results, plus the per-stage span latencies, as JSON. With
+`--baseline`, any case whose median is more than `--tolerance` slower than in the
+baseline file is reported and the exit status is 1, so the suite can gate changes.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_walker import build_tree  # noqa: E402
+
+FILES_PER_DIR = 20
+TARGET = "Batman"
+WORDS = ("alfred", "wayne", "manor", "cave", "gotham", "butler", "ledger", "invoice",
+         "meeting", "report", "quarterly", "budget", "garden", "silver", "archive")
+
+
+def offline_environment(home):
+    """Points every Alfred cache at `home` and switches to local embeddings.
+
+    Must run before any `core` module is imported; they read the environment once.
+    """
+    os.environ["HOME"] = home
+    os.environ["ALFRED_VECTOR_BACKEND"] = "local"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+    os.environ.pop("ALFRED_CHECKPOINT_PATH", None)
+    os.environ.pop("ALFRED_WATCH_ROOTS", None)
+
+
+def sentence(seed, words=12):
+    """Deterministic filler text."""
+    return " ".join(WORDS[(seed * 7 + i * 3) % len(WORDS)] for i in range(words)) + "."
+
+
+def write_pdf(path, pages):
+    """Writes a minimal PDF with one line of text per page (no PDF library needed)."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    with open(path, "w", encoding="latin-1") as file:
+        file.write(out)
+
+
+def build_corpus(root, documents, pdf_pages=40, docx_paragraphs=400, txt_lines=5000):
+    """Writes `documents` each of .txt, .pdf and .docx files; returns {extension: [paths]}."""
+    import docx
+
+    os.makedirs(root, exist_ok=True)
+    corpus = {".txt": [], ".pdf": [], ".docx": []}
+    for n in range(documents):
+        path = os.path.join(root, f"notes_{n}.txt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(sentence(n + i) for i in range(txt_lines)))
+        corpus[".txt"].append(path)
+
+        path = os.path.join(root, f"report_{n}.pdf")
+        write_pdf(path, [sentence(n + i) for i in range(pdf_pages)])
+        corpus[".pdf"].append(path)
+
+        path = os.path.join(root, f"letter_{n}.docx")
+        document = docx.Document()
+        for i in range(docx_paragraphs):
+            document.add_paragraph(sentence(n + i))
+        document.save(path)
+        corpus[".docx"].append(path)
+    return corpus
+
+
+class ScriptedModel:
+    """Deterministic stand-in for `model_with_tools`.
+
+    For a new request it asks for `tool_calls` (all at once); once their results
+    are in, it answers with a short summary of them. It never calls an API.
+    """
+
+    def __init__(self, tool_calls):
+        self.tool_calls = tool_calls
+        self.invocations = 0
+
+    def invoke(self, messages):
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+        self.invocations += 1
+        since_request = []
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            since_request.append(message)
+
+        results = [message for message in since_request if isinstance(message, ToolMessage)]
+        if results:
+            return AIMessage(content=f"I ran {len(results)} tools; "
+                                     f"{sum(len(result.content) for result in results)} "
+                                     "characters of results.")
+        return AIMessage(content="", tool_calls=[
+            {"name": call["name"], "args": call["args"], "id": f"call_{self.invocations}_{i}"}
+            for i, call in enumerate(self.tool_calls)])
+
+
+def measure(func, repeat):
+    """Runs `func` `repeat` times (tool output silenced); returns timing stats in seconds."""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            began = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - began)
+    timings.sort()
+    return {
+        "median": round(statistics.median(timings), 6),
+        "min": round(timings[0], 6),
+        "max": round(timings[-1], 6),
+        "runs": repeat,
+    }
+
+
+def run_suite(workdir, entries, documents, repeat):
+    """Builds the synthetic data under `workdir` and times every case; returns {case: stats}."""
+    from core import tools
+    from core.langgraph_workflow import graph
+    from core.memory import session_config
+    from core.tool_execution import execute_tool_call
+    import core.langgraph_workflow as workflow
+    from langchain_core.messages import HumanMessage
+
+    results = {}
+
+    def record(case, func, times=repeat):
+        results[case] = measure(func, times)
+        print(f"{case:48s} {results[case]['median'] * 1000:10.2f} ms")
+
+    corpus = build_corpus(os.path.join(workdir, "corpus"), documents)
+    for extension, paths in corpus.items():
+        def read_all(paths=paths):
+            for path in paths:
+                tools.read_file_content.invoke({"file_path": path})
+
+        tools.get_document_cache().clear()
+        record(f"read_file_content{extension} cold x{documents}", read_all, 1)
+        record(f"read_file_content{extension} warm x{documents}", read_all)
+    tools.get_document_cache().clear()
+    record(f"read_file_content.pdf pages 5-10 x{documents}", lambda: [
+        tools.read_file_content.invoke({"file_path": path, "start_page": 5, "end_page": 10})
+        for path in corpus[".pdf"]])
+
+    calls = [{"name": "read_file_content",
+              "args": {"file_path": path, "start_page": None, "end_page": None,
+                       "max_chars": 2000}}
+             for paths in corpus.values() for path in paths]
+    record(f"execute_tool_call {len(calls)} reads", lambda: execute_tool_call(calls))
+
+    for size in entries:
+        tree = os.path.join(workdir, f"tree_{size}")
+        os.mkdir(tree)
+        build_tree(tree, max(2, size // (FILES_PER_DIR + 1)), FILES_PER_DIR)
+        search = {"target_name": TARGET, "search_path": tree}
+
+        tools.USE_FILE_INDEX = False
+        record(f"search_for_target walk {size}", lambda: tools.search_for_target.invoke(search))
+        record(f"search_for_target walk first hit {size}",
+               lambda: tools.search_for_target.invoke({**search, "max_results": 1}))
+
+        tools.USE_FILE_INDEX = True
+        record(f"search_for_target index build {size}",
+               lambda: tools.search_for_target.invoke(search), 1)
+        record(f"search_for_target index lookup {size}",
+               lambda: tools.search_for_target.invoke(search))
+
+        model = ScriptedModel([
+            {"name": "search_for_target",
+             "args": {"target_name": TARGET, "search_path": tree, "max_results": None,
+                      "max_depth": None, "time_budget": None}},
+            {"name": "read_file_content",
+             "args": {"file_path": corpus[".pdf"][0], "start_page": None, "end_page": None,
+                      "max_chars": None}},
+        ])
+        workflow.get_model_for_request = lambda user_input, required_tools=(): model
+        sessions = iter(range(10 ** 9))
+        record(f"graph.invoke scripted {size}", lambda: graph.invoke(
+            {"messages": [HumanMessage(content=f"Where is my {TARGET} folder?")]},
+            session_config(f"bench-{next(sessions)}")))
+        shutil.rmtree(tree)
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """Cases whose median is more than `tolerance` (a fraction) slower than `baseline`."""
+    slower = []
+    for case, stats in results.items():
+        before = baseline.get(case)
+        if before and before["median"] > 0 and \
+                stats["median"] > before["median"] * (1 + tolerance):
+            slower.append((case, before["median"], stats["median"]))
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[10000],
+                        help="synthetic tree sizes, e.g. 10000 100000 1000000")
+    parser.add_argument("--documents", type=int, default=30,
+                        help="files of each type (.txt, .pdf, .docx) in the corpus")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against an earlier --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="alfred_bench_")
+    try:
+        offline_environment(os.path.join(workdir, "home"))
+        print(f"Synthetic data in {workdir}: trees of {args.entries} entries, "
+              f"{args.documents} documents per type\n")
+        results = run_suite(workdir, args.entries, args.documents, args.repeat)
+        from core.tracing import latency_summary
+        stages = latency_summary()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {"timestamp": time.time(), "python": sys.version.split()[0],
+              "entries": args.entries, "documents": args.documents, "results": results,
+              "stages": stages}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        slower = regressions(results, baseline, args.tolerance)
+        for case, before, after in slower:
+            print(f"❌ Regression: {case}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        if slower:
+            sys.exit(1)
+        print(f"\n✅ No case more than {args.tolerance:.0%} slower than {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Compares the old Manager/Pool search with `ParallelWalker` on a synthetic tree.
+
+Usage: python -m benchmarks.bench_walker [--dirs 2000] [--files-per-dir 20]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from multiprocessing import Pool, Manager, cpu_count
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")))
+
+from core.walker import ParallelWalker  # noqa: E402
+
+EXCLUDED_FOLDERS = {
+    "node_modules", ".git", ".venv", "venv", "__pycache__", ".DS_Store",
+    "Library", "System", "Applications", "usr", "bin", "opt", "var", ".Trash"
+}
+
+
+def build_tree(root, dirs, files_per_dir, fanout=8):
+    """Creates `dirs` nested directories with `files_per_dir` empty files each."""
+    created = [root]
+    for i in range(1, dirs):
+        parent = created[(i - 1) // fanout]
+        path = os.path.join(parent, f"dir_{i}")
+        os.mkdir(path)
+        created.append(path)
+    for path in created:
+        for j in range(files_per_dir):
+            open(os.path.join(path, f"file_{j}.txt"), "w").close()
+    os.mkdir(os.path.join(created[-1], "Batman"))
+    return created
+
+
+### LEGACY SEARCH (the implementation ParallelWalker replaced) ###
+def legacy_should_exclude(path):
+    return any(excluded in path.split(os.sep) for excluded in EXCLUDED_FOLDERS)
+
+
+def legacy_search_directory(path, target_name):
+    if legacy_should_exclude(path):
+        return [], []
+    found_paths = []
+    subdirectories = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name == target_name:
+                    found_paths.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+    except (PermissionError, OSError):
+        pass
+    return found_paths, subdirectories
+
+
+def legacy_search(target_name, search_path):
+    max_workers = cpu_count()
+    manager = Manager()
+    queue = manager.Queue()
+    queue.put(search_path)
+    found_paths = manager.list()
+
+    with Pool(processes=max_workers) as pool:
+        while not queue.empty():
+            tasks = []
+            for _ in range(min(queue.qsize(), max_workers)):
+                current_dir = queue.get()
+                tasks.append(pool.apply_async(
+                    legacy_search_directory, (current_dir, target_name)))
+            for task in tasks:
+                result, new_dirs = task.get()
+                if result:
+                    found_paths.extend(result)
+                for new_dir in new_dirs:
+                    if legacy_should_exclude(new_dir):
+                        continue
+                    queue.put(new_dir)
+
+    found = list(found_paths)
+    manager.shutdown()
+    return found
+
+
+def timed(label, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:10.1f} ms   matches={len(result)}")
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=2000)
+    parser.add_argument("--files-per-dir", type=int, default=20)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="alfred_walker_bench_")
+    try:
+        build_tree(root, args.dirs, args.files_per_dir)
+        entries = args.dirs * (args.files_per_dir + 1)
+        print(f"Synthetic tree: {args.dirs} directories, ~{entries} entries\n")
+
+        walker = ParallelWalker(EXCLUDED_FOLDERS)
+        legacy_time, legacy_found = timed(
+            "Manager/Pool BFS", legacy_search, "Batman", root)
+        walker_time, walker_found = timed(
+            "ParallelWalker", walker.find, root, "Batman")
+        first_time, _ = timed(
+            "ParallelWalker (first hit)", walker.find, root, "Batman", 1)
+
+        assert sorted(legacy_found) == sorted(walker_found)
+        print(f"\nSpeedup: {legacy_time / walker_time:.1f}x full walk, "
+              f"{legacy_time / first_time:.1f}x first hit")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
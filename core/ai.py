@@ -1,18 +1,112 @@
-from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 import os
-from core.tools import get_tool_registry
+import threading
+from collections import OrderedDict
+from core.tracing import INFO, log
 
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
-model = ChatOpenAI(
-    openai_api_key=api_key,
-    model_name="gpt-4o"
-)
+# `model`, `tools` and `model_with_tools` are built on first use (see __getattr__),
+# so importing this module does not load the OpenAI client or the tool stack.
+MODELS = {}
+_MODELS_LOCK = threading.Lock()
 
-# ✅ Ensure AI has the correct tools
-tools = list(get_tool_registry().values())
-model_with_tools = model.bind_tools(tools)
 
-print("\n✅ AI Model Bound to Tools Successfully!")
+def load_models():
+    """Builds the chat model and binds every registered tool, once."""
+    with _MODELS_LOCK:
+        if not MODELS:
+            from langchain_openai import ChatOpenAI
+            from core.tools import get_tool_registry
+
+            model = ChatOpenAI(
+                openai_api_key=api_key,
+                model_name="gpt-4o"
+            )
+
+            # ✅ Ensure AI has the correct tools
+            tools = list(get_tool_registry().values())
+            MODELS.update(model=model, tools=tools, model_with_tools=model.bind_tools(tools))
+
+            log(INFO, "\n✅ AI Model Bound to Tools Successfully!")
+    return MODELS
+
+
+def __getattr__(name):
+    if name in ("model", "tools", "model_with_tools"):
+        return load_models()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Off by default: with OpenAI embeddings, selection costs an embedding round trip
+# for each new request, which can outweigh the smaller prompt.
+USE_TOOL_SELECTION = os.getenv("ALFRED_TOOL_SELECTION", "0") == "1"
+SELECTION_CACHE_SIZE = 64
+
+BOUND_MODELS = {}
+SELECTIONS = OrderedDict()
+_BINDINGS_LOCK = threading.Lock()
+
+
+def bind_tool_subset(selected_tools):
+    """Returns the model bound to exactly `selected_tools`, reusing earlier bindings."""
+    key = tuple(sorted(tool.name for tool in selected_tools))
+    with _BINDINGS_LOCK:
+        if key not in BOUND_MODELS:
+            BOUND_MODELS[key] = load_models()["model"].bind_tools(selected_tools)
+        return BOUND_MODELS[key]
+
+
+def select_tools_once(user_input):
+    """Selects tools for a user turn once; the graph's later steps reuse the choice."""
+    with _BINDINGS_LOCK:
+        if user_input in SELECTIONS:
+            SELECTIONS.move_to_end(user_input)
+            return SELECTIONS[user_input]
+
+    from core.tool_selector import select_tools
+    selected_tools = select_tools(user_input)
+    with _BINDINGS_LOCK:
+        SELECTIONS[user_input] = selected_tools
+        while len(SELECTIONS) > SELECTION_CACHE_SIZE:
+            SELECTIONS.popitem(last=False)
+    return selected_tools
+
+
+def get_model_for_request(user_input, required_tools=()):
+    """Returns a model bound only to the tools relevant to `user_input`.
+
+    Tools named in `required_tools` are always bound as well. Falls back to
+    `model_with_tools` (every tool) when selection is disabled (the default; set
+    ALFRED_TOOL_SELECTION=1) or not confident.
+    """
+    models = load_models()
+    if not USE_TOOL_SELECTION:
+        return models["model_with_tools"]
+
+    selected_tools = select_tools_once(user_input)
+    if selected_tools is None:
+        return models["model_with_tools"]
+    selected_names = {tool.name.lower() for tool in selected_tools}
+    selected_tools = selected_tools + [tool for tool in models["tools"] if tool.name.lower() in required_tools
+                       and tool.name.lower() not in selected_names]
+    return bind_tool_subset(selected_tools)
+
+
+async def astream_response(model, messages, on_token=None):
+    """Streams a completion, passing each text token to `on_token` as it arrives.
+
+    Returns the merged message, including any tool calls assembled from the chunks.
+    """
+    response = None
+    async for chunk in model.astream(messages):
+        if on_token and isinstance(chunk.content, str) and chunk.content:
+            on_token(chunk.content)
+        response = chunk if response is None else response + chunk
+    return response
+
+
+def print_token(token):
+    """Writes a streamed token to the terminal without buffering."""
+    print(token, end="", flush=True)
@@ -0,0 +1,209 @@
+"""Runs queued requests from a JSONL file through the LangGraph workflow.
+
+Usage: python -m core.batch_runner requests.jsonl results.jsonl [--concurrency 4]
+       [--rate 2] [--retries 3]
+
+Each input line is a JSON object with the request text in "input", "prompt",
+"text" or "body" and an optional "id" or "request_id" (the line number otherwise).
+One result line is appended per request as soon as it finishes, so a crashed run
+can be restarted with the same arguments and only unfinished requests are re-run.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")))
+
+TEXT_FIELDS = ("input", "prompt", "text", "body")
+ID_FIELDS = ("id", "request_id")
+
+
+class RateLimiter:
+    """Spaces out starts so no more than `rate` requests begin per second."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def read_requests(path):
+    """Yields (request id, text) for each usable line of a JSONL file."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"⚠️ Skipping malformed line {line_number} of {path}")
+                continue
+            text = next((request[field] for field in TEXT_FIELDS if request.get(field)), None)
+            if not text:
+                print(f"⚠️ Skipping line {line_number} of {path}: no request text")
+                continue
+            request_id = next((request[field] for field in ID_FIELDS if request.get(field)),
+                              f"line-{line_number}")
+            yield str(request_id), text
+
+
+def completed_ids(path):
+    """Ids already answered successfully in an earlier run's output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if result.get("status") == "ok":
+                done.add(result["id"])
+    return done
+
+
+def ends_mid_line(path):
+    """True if a non-empty file does not end with a newline."""
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        if not file.tell():
+            return False
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) != b"\n"
+
+
+async def run_through_graph(request_id, text):
+    """Answers one request with the compiled graph in its own session."""
+    from langchain_core.messages import HumanMessage
+    from core.langgraph_workflow import graph
+    from core.memory import get_memory, session_config
+    from core.tracing import span
+
+    session_id = f"batch-{request_id}"
+    try:
+        with span("graph.run", request=request_id):
+            state = await graph.ainvoke({"messages": [HumanMessage(content=text)]},
+                                        session_config(session_id))
+    finally:
+        get_memory().results.drop_session(session_id)  # each request is its own session
+    messages = state["messages"]
+    return {
+        "reply": messages[-1].content,
+        "tools": [call["name"] for message in messages
+                  for call in getattr(message, "tool_calls", None) or []],
+    }
+
+
+class BatchRunner:
+    """Streams requests through `run(request_id, text)` with bounded concurrency.
+
+    At most `concurrency` requests are in flight and at most `rate` start per
+    second. A failed request is retried `retries` times with exponential backoff
+    and jitter. Results are appended to the output file as they complete.
+    """
+
+    def __init__(self, run=run_through_graph, concurrency=4, rate=None, retries=3,
+                 backoff=1.0, max_backoff=30.0):
+        self.run = run
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    async def run_file(self, input_path, output_path):
+        """Processes every unfinished request in `input_path`; returns {"ok", "error", "skipped"}."""
+        done = completed_ids(output_path)
+        counts = {"ok": 0, "error": 0, "skipped": 0}
+        slots = asyncio.Semaphore(self.concurrency)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        with open(output_path, "a", encoding="utf-8") as output:
+            if ends_mid_line(output_path):
+                output.write("\n")  # finish a line cut short by a crash
+
+            async def process(request_id, text):
+                try:
+                    result = await self.attempt(request_id, text)
+                    async with write_lock:
+                        output.write(json.dumps(result, default=str) + "\n")
+                        output.flush()
+                    counts[result["status"]] += 1
+                finally:
+                    slots.release()
+
+            for request_id, text in read_requests(input_path):
+                if request_id in done:
+                    counts["skipped"] += 1
+                    continue
+                done.add(request_id)
+                await slots.acquire()
+                task = asyncio.create_task(process(request_id, text))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        return counts
+
+    async def attempt(self, request_id, text):
+        """Runs one request with retries; returns its result record."""
+        started = time.time()
+        error = None
+        for attempt in range(1, self.retries + 2):
+            await self.limiter.acquire()
+            began = time.monotonic()
+            try:
+                answer = await self.run(request_id, text)
+                return {"id": request_id, "input": text, "status": "ok", **answer,
+                        "attempts": attempt, "seconds": round(time.monotonic() - began, 3),
+                        "started_at": started}
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ Request {request_id} failed (attempt {attempt}): {error}")
+            if attempt <= self.retries:
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        return {"id": request_id, "input": text, "status": "error", "error": error,
+                "attempts": self.retries + 1, "started_at": started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued Alfred requests from a JSONL file.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None,
+                        help="maximum requests started per second")
+    parser.add_argument("--retries", type=int, default=3)
+    args = parser.parse_args()
+
+    runner = BatchRunner(concurrency=args.concurrency, rate=args.rate, retries=args.retries)
+    started = time.monotonic()
+    counts = asyncio.run(runner.run_file(args.input, args.output))
+    print(f"\n✅ Batch finished in {time.monotonic() - started:.1f}s: {counts}")
+
+    from core.tracing import print_latency_summary
+    print_latency_summary()
+
+
+if __name__ == "__main__":
+    main()
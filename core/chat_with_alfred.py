@@ -1,10 +1,17 @@
-from core.ai import model_with_tools
-from core.prompt import format_prompt
+from core.ai import get_model_for_request, astream_response, print_token
 from core.tool_execution import execute_tool_call
+from core import intent_router, plan_cache, tracing
+from core.intent_router import get_router
+from core.plan_cache import get_plan_cache
+from core.tracing import DEBUG, INFO, enabled, log, span
+import asyncio
 import sys
 import os
 import json
-from langchain_core.messages import SystemMessage, HumanMessage
+
+USE_FAST_PATH = os.getenv("ALFRED_FAST_PATH", "1") != "0"
+USE_PLAN_CACHE = os.getenv("ALFRED_PLAN_CACHE", "1") != "0"
+USE_STREAMING = os.getenv("ALFRED_STREAMING", "1") != "0"
 
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..")))
@@ -12,51 +19,172 @@ sys.path.insert(0, os.path.abspath(
 
 def chat_with_alfred(user_input):
     """Processes user input, formats the prompt, and invokes the AI model."""
+    with span("chat"):
+        log(DEBUG, f"\n You: {user_input}")
+        log(DEBUG, "\n Processing user input...")
 
-    print(f"\n You: {user_input}")
-    print("\n Processing user input...")
+        routed_calls = fast_path(user_input)
+        if routed_calls:
+            return execute_tool_call(routed_calls)
 
-    formatted_prompt = format_prompt(user_input)
+        messages, prompt_text = prepare_messages(user_input)
+
+        cached_calls = cached_plan(prompt_text, user_input)
+        if cached_calls:
+            return execute_tool_call(cached_calls)
+
+        model = get_model_for_request(user_input)
+        with span("llm.call"):
+            response = model.invoke(messages)
+
+        if enabled(DEBUG):
+            print(f"\n AI Response (RAW): {response}")
+
+        tool_calls = plan_from_response(response, prompt_text, user_input)
+        if tool_calls:
+            return execute_tool_call(tool_calls)
+
+        log(DEBUG, "\n⚠️ Response is not a tool call. Proceeding normally.")
+        return response.content
+
+
+async def achat_with_alfred(user_input, on_token=print_token):
+    """Async `chat_with_alfred`: streams the reply's tokens to `on_token` as they arrive.
+
+    Blocking work (tool selection, embedding lookups, tool execution) runs in worker
+    threads, so many sessions can share one event loop.
+    """
+    with span("chat", streaming=True):
+        routed_calls = await asyncio.to_thread(fast_path, user_input)
+        if routed_calls:
+            return await asyncio.to_thread(execute_tool_call, routed_calls)
+
+        messages, prompt_text = prepare_messages(user_input)
+
+        cached_calls = await asyncio.to_thread(cached_plan, prompt_text, user_input)
+        if cached_calls:
+            return await asyncio.to_thread(execute_tool_call, cached_calls)
+
+        model = await asyncio.to_thread(get_model_for_request, user_input)
+        with span("llm.call", streaming=True):
+            response = await astream_response(model, messages, on_token)
+
+        tool_calls = await asyncio.to_thread(plan_from_response, response, prompt_text, user_input)
+        if tool_calls:
+            return await asyncio.to_thread(execute_tool_call, tool_calls)
+        return response.content
 
-    if hasattr(formatted_prompt, "messages"):
-        messages = [
-            SystemMessage(content=formatted_prompt.messages[0].content),
-            HumanMessage(content=formatted_prompt.messages[1].content),
-        ]
-    else:
-        raise ValueError(f"Unexpected format in prompt: {formatted_prompt}")
 
-    print(f"\n Extracted Messages for AI: {messages}")
+def fast_path(user_input):
+    """Returns the router's tool calls for an unambiguous command, or None."""
+    if not USE_FAST_PATH:
+        return None
+    with span("fast_path"):
+        routed_calls = get_router().route(user_input)
+    if routed_calls:
+        log(INFO, f"\n⚡ Fast path: {routed_calls[0]['name']} (no model call needed)")
+    return routed_calls
 
-    response = model_with_tools.invoke(messages)
 
-    print(f"\n AI Response (RAW): {response}")
+def prepare_messages(user_input):
+    """Formats the prompt into model messages; returns (messages, prompt text)."""
+    # Imported here so starting (or quitting) the REPL does not load langchain.
+    from langchain_core.messages import SystemMessage, HumanMessage
+    from core.prompt import format_prompt
 
+    with span("prompt.format"):
+        formatted_prompt = format_prompt(user_input)
+
+        if hasattr(formatted_prompt, "messages"):
+            messages = [
+                SystemMessage(content=formatted_prompt.messages[0].content),
+                HumanMessage(content=formatted_prompt.messages[1].content),
+            ]
+        else:
+            raise ValueError(f"Unexpected format in prompt: {formatted_prompt}")
+
+    if enabled(DEBUG):
+        print(f"\n Extracted Messages for AI: {messages}")
+    return messages, formatted_prompt.to_string()
+
+
+def cached_plan(prompt_text, user_input):
+    """Returns tool calls cached for an equivalent earlier request, or None."""
+    if not USE_PLAN_CACHE:
+        return None
+    with span("plan_cache.lookup"):
+        cached_calls = get_plan_cache().get(prompt_text, user_input)
+    if cached_calls:
+        log(INFO, f"\n♻️ Plan cache: reusing {[call['name'] for call in cached_calls]} (no model call needed)")
+    return cached_calls
+
+
+def plan_from_response(response, prompt_text, user_input):
+    """Extracts the tool calls from a model response and caches them as a plan."""
+    tool_calls = None
     if hasattr(response, "tool_calls") and response.tool_calls:
-        print(f"\n AI detected tool calls. Executing...\n")
-        return execute_tool_call(response.tool_calls)
+        log(INFO, "\n AI detected tool calls. Executing...\n")
+        tool_calls = response.tool_calls
+    else:
+        try:
+            parsed_response = json.loads(response.content)
+            if "function" in parsed_response and "arguments" in parsed_response:
+                tool_calls = [{"name": parsed_response["function"],
+                               "args": parsed_response["arguments"]}]
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    if tool_calls and USE_PLAN_CACHE:
+        get_plan_cache().put(prompt_text, user_input, tool_calls)
+    return tool_calls
+
+
+def print_stats():
+    """Prints fast path and plan cache counters and stage latencies, if they were used."""
+    if intent_router.ROUTER is not None:
+        print(f"\n⚡ Fast path stats: {get_router().stats()}")
+    if plan_cache.PLAN_CACHE is not None:
+        print(f"\n♻️ Plan cache stats: {get_plan_cache().stats()}")
+    tracing.print_latency_summary()
+    if tracing.TRACE_EXPORT_PATH:
+        print(f"\n⏱️ Trace written to {tracing.export_json()}")
+
+
+async def arepl(session_name="You"):
+    """Async REPL session; several can run side by side in one process."""
+    while True:
+        user_input = await asyncio.to_thread(input, f"\n🗣️ {session_name}: ")
+        if user_input.lower() in ["exit", "quit"]:
+            return
 
-    try:
-        parsed_response = json.loads(response.content)
-        if "function" in parsed_response and "arguments" in parsed_response:
-            tool_call = [{"name": parsed_response["function"],
-                          "args": parsed_response["arguments"]}]
-            return execute_tool_call(tool_call)
-    except json.JSONDecodeError:
-        pass
+        streamed = []
 
-    print("\n⚠️ Response is not a tool call. Proceeding normally.")
-    return response.content
+        def on_token(token):
+            if not streamed:
+                print("\n🎩 Alfred: ", end="", flush=True)
+            streamed.append(token)
+            print_token(token)
+
+        response = await achat_with_alfred(user_input, on_token)
+        if streamed:
+            print()
+        else:
+            print(f"\n🎩 Alfred: {response}")
 
 
 if __name__ == "__main__":
     print("🎩 Alfred: At your service. Type 'exit' to quit.")
 
-    while True:
-        user_input = input("\n🗣️ You: ")
-        if user_input.lower() in ["exit", "quit"]:
-            print("\n🎩 Alfred: Until next time, sir/madam. Farewell! 👋")
-            break
+    if USE_STREAMING:
+        asyncio.run(arepl())
+    else:
+        while True:
+            user_input = input("\n🗣️ You: ")
+            if user_input.lower() in ["exit", "quit"]:
+                break
+
+            response = chat_with_alfred(user_input)
+            print(f"\n🎩 Alfred: {response}")
 
-        response = chat_with_alfred(user_input)
-        print(f"\n🎩 Alfred: {response}")
+    print_stats()
+    print("\n🎩 Alfred: Until next time, sir/madam. Farewell! 👋")
@@ -0,0 +1,143 @@
+"""Thin client for the Alfred daemon; imports only the standard library.
+
+Usage: python -m core.client [--graph] [--session NAME] [--start] "where is my Batman folder"
+       python -m core.client --ping | --stats | --shutdown
+"""
+import argparse
+import json
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+
+SOCKET_PATH = os.getenv(
+    "ALFRED_DAEMON_SOCKET", os.path.join(os.path.expanduser("~"), ".alfred", "alfred.sock"))
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = int(os.getenv("ALFRED_DAEMON_PORT", "8765"))
+# Unix sockets where available, localhost TCP otherwise (or when asked for).
+USE_TCP = not hasattr(socket, "AF_UNIX") or os.getenv("ALFRED_DAEMON_TRANSPORT") == "tcp"
+# Any local user can reach the TCP port, so every TCP request carries this secret.
+TOKEN_PATH = os.getenv(
+    "ALFRED_DAEMON_TOKEN", os.path.join(os.path.expanduser("~"), ".alfred", "daemon.token"))
+
+
+def create_token():
+    """Writes a fresh random token to TOKEN_PATH, readable by the owner only; returns it."""
+    token = secrets.token_hex(32)
+    os.makedirs(os.path.dirname(TOKEN_PATH), exist_ok=True)
+    if os.path.exists(TOKEN_PATH):
+        os.unlink(TOKEN_PATH)
+    descriptor = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(descriptor, "w") as file:
+        file.write(token)
+    return token
+
+
+def read_token():
+    """Returns the running daemon's token, or "" if it has not written one."""
+    try:
+        with open(TOKEN_PATH, "r") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+
+def connect(timeout=None):
+    """Opens a connection to the running daemon (raises OSError if none is listening)."""
+    if USE_TCP:
+        return socket.create_connection((DAEMON_HOST, DAEMON_PORT), timeout=timeout)
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.settimeout(timeout)
+    try:
+        connection.connect(SOCKET_PATH)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def request(message, on_token=None, timeout=None):
+    """Sends one request and returns the final reply, passing streamed tokens to `on_token`."""
+    if USE_TCP:
+        message = dict(message, token=read_token())
+    with connect(timeout) as connection:
+        connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+        with connection.makefile("r", encoding="utf-8") as replies:
+            for line in replies:
+                reply = json.loads(line)
+                if "token" in reply:
+                    if on_token:
+                        on_token(reply["token"])
+                    continue
+                return reply
+    return {"error": "The daemon closed the connection without replying."}
+
+
+def is_running():
+    """True if a daemon answers on the configured socket."""
+    try:
+        return request({"op": "ping"}, timeout=2).get("ok", False)
+    except OSError:
+        return False
+
+
+def start_daemon(wait=60.0):
+    """Starts the daemon in the background and waits until it answers."""
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    subprocess.Popen([sys.executable, "-m", "core.daemon"], cwd=root,
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if is_running():
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a request to the Alfred daemon.")
+    parser.add_argument("text", nargs="*")
+    parser.add_argument("--graph", action="store_true", help="use the LangGraph workflow")
+    parser.add_argument("--session", default="default")
+    parser.add_argument("--start", action="store_true", help="start the daemon if needed")
+    parser.add_argument("--ping", action="store_true")
+    parser.add_argument("--stats", action="store_true")
+    parser.add_argument("--shutdown", action="store_true")
+    args = parser.parse_args()
+
+    if args.ping or args.stats or args.shutdown:
+        message = {"op": "ping" if args.ping else "stats" if args.stats else "shutdown"}
+    elif args.text:
+        message = {"op": "graph" if args.graph else "chat", "input": " ".join(args.text),
+                   "session": args.session}
+    else:
+        parser.error("nothing to send")
+
+    if args.start and not is_running() and not start_daemon():
+        sys.exit("❌ The Alfred daemon did not start.")
+
+    streamed = []
+
+    def print_token(token):
+        streamed.append(token)
+        print(token, end="", flush=True)
+
+    try:
+        reply = request(message, print_token)
+    except OSError as e:
+        sys.exit(f"❌ Alfred daemon is not running ({e}). Start it with: python -m core.daemon")
+
+    if "error" in reply:
+        sys.exit(f"\n❌ {reply['error']}")
+    result = reply.get("result", reply)
+    if streamed and isinstance(result, str):
+        print()
+    else:
+        print(result if isinstance(result, str) else json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
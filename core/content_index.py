@@ -0,0 +1,223 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from core.file_index import subtree_bounds
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    text BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings(doc_id);
+"""
+
+TOKEN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text):
+    """Splits text into lower-cased word tokens."""
+    return TOKEN.findall(text.lower())
+
+
+class ContentIndex:
+    """Inverted index over document text with BM25 ranking and snippets.
+
+    `list_files(root)` returns the candidate files under a root and
+    `extract(path)` returns a file's text; both are supplied by the caller so the
+    index reuses the existing file listing and extractors.
+    """
+
+    def __init__(self, db_path, list_files, extract, max_chars=2_000_000):
+        self.db_path = db_path
+        self.list_files = list_files
+        self.extract = extract
+        self.max_chars = max_chars
+        self._lock = threading.RLock()
+        self._updated = {}
+        self._updating = {}
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    ### INDEXING ###
+    def update(self, root):
+        """Indexes new or modified files under `root` and drops deleted ones.
+
+        Returns the number of files (re)indexed.
+        """
+        root = os.path.abspath(root)
+        low, high = subtree_bounds(root)
+        with self._lock:
+            known = {path: (doc_id, size, mtime_ns) for doc_id, path, size, mtime_ns in
+                     self._conn.execute(
+                         "SELECT id, path, size, mtime_ns FROM docs "
+                         "WHERE path >= ? AND path < ?", (low, high))}
+
+        indexed = 0
+        seen = set()
+        for path in self.list_files(root):
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            previous = known.get(path)
+            if previous and previous[1:] == (stat.st_size, stat.st_mtime_ns):
+                continue
+            try:
+                text = self.extract(path)
+            except Exception as e:
+                print(f"⚠️ Could not index '{path}': {e}")
+                continue
+            self.add_document(path, stat.st_size, stat.st_mtime_ns, text)
+            indexed += 1
+
+        for path, (doc_id, _, _) in known.items():
+            if path not in seen:
+                self._delete(doc_id)
+        return indexed
+
+    def refresh_in_background(self, root, max_age=300.0):
+        """Starts `update(root)` on a background thread if `root` is stale.
+
+        A root counts as fresh for `max_age` seconds after it (or a folder above
+        it) was last updated. Returns the updating thread, or None if fresh.
+        """
+        root = os.path.abspath(root)
+        now = time.monotonic()
+        with self._lock:
+            running = self._updating.get(root)
+            if running is not None:
+                return running
+            if any(now - updated_at < max_age for path, updated_at in self._updated.items()
+                   if root == path or root.startswith(path.rstrip(os.sep) + os.sep)):
+                return None
+            thread = threading.Thread(target=self._update_in_background, args=(root,),
+                                      name="alfred-content-index", daemon=True)
+            self._updating[root] = thread
+        thread.start()
+        return thread
+
+    def _update_in_background(self, root):
+        try:
+            self.update(root)
+        except Exception as e:
+            print(f"⚠️ Content index update of '{root}' failed: {e}")
+        finally:
+            with self._lock:
+                del self._updating[root]
+                self._updated[root] = time.monotonic()
+
+    def add_document(self, path, size, mtime_ns, text):
+        """Replaces the postings and stored text of one document."""
+        text = text[:self.max_chars]
+        counts = Counter(tokenize(text))
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM docs WHERE path = ?", (path,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (row[0],))
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO docs (id, path, size, mtime_ns, length, text) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (row[0] if row else None, path, size, mtime_ns,
+                 sum(counts.values()), zlib.compress(text.encode("utf-8"))),
+            )
+            doc_id = row[0] if row else cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                ((term, doc_id, tf) for term, tf in counts.items()),
+            )
+
+    def _delete(self, doc_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    ### SEARCH ###
+    def search(self, query, root, limit=10, snippet_chars=160):
+        """Returns up to `limit` {"path", "score", "snippet"} hits under `root`, best first."""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        root = os.path.abspath(root)
+        low, high = subtree_bounds(root)
+        placeholders = ",".join("?" * len(terms))
+        with self._lock:
+            total_docs, total_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+            if not total_docs:
+                return []
+            document_frequency = dict(self._conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) "
+                "GROUP BY term", terms))
+            rows = self._conn.execute(
+                "SELECT p.doc_id, d.path, d.length, p.term, p.tf FROM postings p "
+                f"JOIN docs d ON d.id = p.doc_id WHERE p.term IN ({placeholders}) "
+                "AND d.path >= ? AND d.path < ?",
+                (*terms, low, high),
+            ).fetchall()
+
+        average_length = total_length / total_docs or 1.0
+        scores = {}
+        paths = {}
+        for doc_id, path, length, term, tf in rows:
+            df = document_frequency[term]
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+            paths[doc_id] = path
+
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [{"path": paths[doc_id], "score": round(score, 3),
+                 "snippet": self.snippet(doc_id, query, terms, snippet_chars)}
+                for doc_id, score in best]
+
+    def snippet(self, doc_id, query, terms, width=160):
+        """Returns the text around the first occurrence of the query (or a query term)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM docs WHERE id = ?", (doc_id,)).fetchone()
+        if not row:
+            return ""
+        text = zlib.decompress(row[0]).decode("utf-8")
+        lowered = text.lower()
+
+        position = lowered.find(query.lower().strip())
+        if position < 0:
+            positions = [match.start() for term in terms
+                         for match in [re.search(rf"\b{re.escape(term)}\b", lowered)]
+                         if match]
+            position = min(positions) if positions else 0
+
+        start = max(0, position - width // 3)
+        excerpt = " ".join(text[start:start + width].split())
+        return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
@@ -0,0 +1,166 @@
+"""Long-lived Alfred process that keeps the models, tools, graph and caches warm.
+
+Usage: python -m core.daemon
+
+Serves newline-delimited JSON requests on a Unix socket (localhost TCP where Unix
+sockets are unavailable, or with ALFRED_DAEMON_TRANSPORT=tcp). Over TCP every
+request must carry the token the daemon writes to ALFRED_DAEMON_TOKEN. A request is
+{"op": "chat" | "graph" | "ping" | "stats" | "shutdown", "input": ..., "session": ...};
+chat and graph replies stream {"token": ...} lines before the final
+{"result": ..., "seconds": ...} or {"error": ...} line. See core/client.py.
+"""
+import asyncio
+import hmac
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..")))
+
+from core.client import (  # noqa: E402
+    DAEMON_HOST, DAEMON_PORT, SOCKET_PATH, TOKEN_PATH, USE_TCP, create_token, is_running)
+
+
+class AlfredDaemon:
+    """Answers client requests from one warm process; each connection is its own task."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.served = 0
+        self.failed = 0
+        self.token = None
+        self._stopping = None
+
+    def warm_up(self):
+        """Imports the heavy stacks and builds the shared state once, before serving."""
+        began = time.monotonic()
+        from core import chat_with_alfred, langgraph_workflow  # noqa: F401
+        from core.ai import load_models
+        from core.tools import WATCH_ROOTS, get_file_index, get_vector_store
+        load_models()
+        get_vector_store()
+        get_file_index()
+        print(f"🔥 Alfred warmed up in {time.monotonic() - began:.2f}s"
+              + (f", watching {WATCH_ROOTS}" if WATCH_ROOTS else ""))
+
+    async def serve(self):
+        """Listens until a shutdown request arrives."""
+        self._stopping = asyncio.Event()
+        if USE_TCP:
+            server = await asyncio.start_server(self.handle, DAEMON_HOST, DAEMON_PORT)
+            # Only once the port is ours, so a daemon that fails to bind leaves the
+            # running one's token alone.
+            self.token = create_token()
+            where = f"{DAEMON_HOST}:{DAEMON_PORT}"
+        else:
+            os.makedirs(os.path.dirname(SOCKET_PATH), mode=0o700, exist_ok=True)
+            if os.path.exists(SOCKET_PATH):
+                os.unlink(SOCKET_PATH)  # left behind by a daemon that did not exit cleanly
+            # The socket is trusted without a token, so it is never reachable by others,
+            # not even between creating it and the chmod.
+            previous_umask = os.umask(0o077)
+            try:
+                server = await asyncio.start_unix_server(self.handle, SOCKET_PATH)
+            finally:
+                os.umask(previous_umask)
+            os.chmod(SOCKET_PATH, 0o600)
+            where = SOCKET_PATH
+
+        print(f"🎩 Alfred daemon listening on {where}")
+        async with server:
+            await self._stopping.wait()
+        if not USE_TCP and os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+        if USE_TCP and os.path.exists(TOKEN_PATH):
+            os.unlink(TOKEN_PATH)
+
+    async def handle(self, reader, writer):
+        """Serves requests from one connection until the client disconnects."""
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if not self.authorised(message):
+                        writer.write(b'{"error": "Missing or invalid daemon token."}\n')
+                        await writer.drain()
+                        break
+                    reply = await self.dispatch(message, writer)
+                except Exception as e:
+                    self.failed += 1
+                    reply = {"error": f"{type(e).__name__}: {e}"}
+                writer.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def authorised(self, message):
+        """Unix-socket requests are trusted (the socket is 0600); TCP ones need the token."""
+        if self.token is None:
+            return True
+        token = message.pop("token", None) if isinstance(message, dict) else None
+        return isinstance(token, str) and hmac.compare_digest(token, self.token)
+
+    async def dispatch(self, message, writer):
+        """Runs one request, streaming tokens to `writer`; returns the final reply."""
+        op = message.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "stats":
+            return {"result": self.stats()}
+        if op == "shutdown":
+            self._stopping.set()
+            return {"result": "Shutting down."}
+        if op not in ("chat", "graph") or not message.get("input"):
+            return {"error": f"Unknown request: {message}"}
+
+        def send_token(token):
+            writer.write((json.dumps({"token": token}) + "\n").encode("utf-8"))
+
+        began = time.monotonic()
+        if op == "chat":
+            from core.chat_with_alfred import achat_with_alfred
+            result = await achat_with_alfred(message["input"], send_token)
+        else:
+            from core.langgraph_workflow import astream_reply
+            messages = await astream_reply(
+                message["input"], send_token, message.get("session", "default"))
+            result = messages[-1].content
+        self.served += 1
+        return {"result": result, "seconds": round(time.monotonic() - began, 3)}
+
+    def stats(self):
+        """Uptime, request counters, the warm caches' own counters and stage latencies."""
+        from core.chat_with_alfred import USE_FAST_PATH, USE_PLAN_CACHE
+        from core.intent_router import get_router
+        from core.plan_cache import get_plan_cache
+        from core.tools import get_document_cache
+        from core.tracing import latency_summary
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+            "served": self.served,
+            "failed": self.failed,
+            "fast_path": get_router().stats() if USE_FAST_PATH else None,
+            "plan_cache": get_plan_cache().stats() if USE_PLAN_CACHE else None,
+            "document_cache": get_document_cache().stats(),
+            "latency_ms": latency_summary(),
+        }
+
+
+def main():
+    if is_running():
+        sys.exit("⚠️ An Alfred daemon is already running.")
+    daemon = AlfredDaemon()
+    daemon.warm_up()
+    try:
+        asyncio.run(daemon.serve())
+    except KeyboardInterrupt:
+        pass
+    print("\n🎩 Alfred daemon stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import hashlib
+import os
+import sys
+import threading
+import zlib
+from collections import OrderedDict
+
+
+class DocumentCache:
+    """LRU cache of extracted document text, in memory and optionally on disk.
+
+    Entries are keyed by the resolved path plus the file's size and mtime, so an
+    edited file is simply a new key and stale text is never served. On disk the
+    text is compressed but not encrypted, so entries are owner-only files (0600)
+    in a directory created owner-only (0700).
+    """
+
+    def __init__(self, max_memory_bytes=64 * 1024 * 1024, disk_dir=None,
+                 max_disk_bytes=512 * 1024 * 1024):
+        self.max_memory_bytes = max_memory_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, mode=0o700, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+
+    @staticmethod
+    def key_for(path, *variant):
+        """Builds the cache key for a file; `variant` distinguishes partial extractions."""
+        resolved = os.path.realpath(path)
+        stat = os.stat(resolved)
+        return (resolved, stat.st_size, stat.st_mtime_ns) + tuple(variant)
+
+    def get_or_extract(self, path, extract, *variant):
+        """Returns cached text for `path`, calling `extract(path)` on a miss."""
+        key = self.key_for(path, *variant)
+        text = self.get(key)
+        if text is None:
+            text = extract(path)
+            self.put(key, text)
+        return text
+
+    def get(self, key):
+        """Returns the cached text for `key`, or None."""
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+        text = self._read_disk(key)
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        """Stores text in memory and, if configured, on disk."""
+        with self._lock:
+            self._remember(key, text)
+        self._write_disk(key, text)
+
+    def clear(self):
+        """Drops every in-memory entry (disk entries are left in place)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        """Returns hit/miss counters and current sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    ### MEMORY LEVEL ###
+    def _remember(self, key, text):
+        size = sys.getsizeof(text)
+        if size > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= sys.getsizeof(self._memory.pop(key))
+        self._memory[key] = text
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= sys.getsizeof(evicted)
+
+    ### DISK LEVEL ###
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, digest + ".z")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as file:
+                text = zlib.decompress(file.read()).decode("utf-8")
+            os.utime(path)  # Marks the entry as recently used for eviction.
+            return text
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+
+    def _write_disk(self, key, text):
+        if not self.disk_dir:
+            return
+        data = zlib.compress(text.encode("utf-8"), 6)
+        if len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temporary, path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._disk_bytes += len(data) - previous
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _disk_files(self):
+        """Returns (path, size, mtime) for every entry file in the disk cache."""
+        files = []
+        with os.scandir(self.disk_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".z"):
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict_disk(self):
+        """Deletes least recently used files until the disk level fits its limit."""
+        files = sorted(self._disk_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
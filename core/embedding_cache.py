@@ -0,0 +1,199 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still whole records, just not cross-process locked
+    fcntl = None
+
+MAGIC = b"ALFEMB1\0"
+HEADER = struct.Struct("<8sI")
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an embeddings client with a content-hash keyed cache on disk.
+
+    One file per model holds a header (magic, vector size) followed by fixed-size
+    records, each the SHA-256 of an embedded text and its float32 vector, so only
+    new or changed text is ever sent to the backend and a miss appends only its own
+    records. Appends take a file lock, and a torn record at the end is cut off on
+    load. Past `max_entries` the oldest vectors are dropped and the file rewritten.
+    Query vectors are one-offs: they are kept in memory (the latest `max_queries`)
+    and never written to disk.
+    """
+
+    def __init__(self, underlying, cache_dir, namespace=None, max_entries=50000, max_queries=256):
+        self.underlying = underlying
+        self.cache_dir = cache_dir
+        self.namespace = namespace or getattr(underlying, "model", type(underlying).__name__)
+        self.max_entries = max_entries
+        self.max_queries = max_queries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()
+
+        slug = hashlib.sha256(self.namespace.encode("utf-8")).hexdigest()[:16]
+        self._path = os.path.join(cache_dir, f"{slug}.emb")
+        self._lock_path = self._path + ".lock"
+        self._rows = {}
+        self._matrix = None
+        self._queries = OrderedDict()
+        self._load()
+
+    def key(self, text, kind="document"):
+        """Returns the cache key of a text."""
+        return hashlib.sha256(f"{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts):
+        """Embeds texts, sending only the ones not cached yet to the backend."""
+        texts = list(texts)
+        keys = [self.key(text) for text in texts]
+        with self._lock:
+            found = {}
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key in self._rows:
+                    found[key] = self._matrix[self._rows[key]].tolist()
+                elif key not in missing:
+                    missing[key] = text
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            self._store(list(missing.keys()), vectors)
+            found.update(zip(missing, np.asarray(vectors, dtype=np.float32).tolist()))
+        return [found[key] for key in keys]
+
+    def embed_query(self, text):
+        """Embeds a search query, remembering the latest ones in memory only."""
+        key = self.key(text, "query")
+        with self._lock:
+            vector = self._queries.get(key)
+            if vector is not None:
+                self._queries.move_to_end(key)
+                self.hits += 1
+                return vector
+            self.misses += 1
+
+        vector = self.underlying.embed_query(text)
+        with self._lock:
+            self._queries[key] = vector
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+        return vector
+
+    ### PERSISTENCE ###
+    @staticmethod
+    def record_type(dimensions):
+        """The on-disk record: a raw SHA-256 key followed by the vector."""
+        return np.dtype([("key", "S32"), ("vector", "<f4", (dimensions,))])
+
+    @contextmanager
+    def _file_locked(self):
+        """Holds the in-process lock and, where available, an exclusive lock file."""
+        with self._file_lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._lock_path, "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(self):
+        if not os.path.exists(self._path):
+            return
+        try:
+            with self._file_locked(), open(self._path, "r+b") as file:
+                magic, dimensions = HEADER.unpack(file.read(HEADER.size))
+                if magic != MAGIC or not dimensions:
+                    return
+                record = self.record_type(dimensions)
+                data = file.read()
+                complete = len(data) - len(data) % record.itemsize
+                if complete != len(data):
+                    file.truncate(HEADER.size + complete)  # a torn last record
+        except (OSError, struct.error):
+            return
+        records = np.frombuffer(data[:complete], dtype=record)
+        self._matrix = records["vector"].astype(np.float32)
+        self._rows = {key.hex(): row for row, key in enumerate(records["key"])}
+
+    def _records(self, keys, rows):
+        records = np.empty(len(keys), dtype=self.record_type(rows.shape[1]))
+        records["key"] = [bytes.fromhex(key) for key in keys]
+        records["vector"] = rows
+        return records.tobytes()
+
+    def _store(self, keys, vectors):
+        new_rows = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            fresh = [i for i, key in enumerate(keys) if key not in self._rows]
+            keys = [keys[i] for i in fresh]
+            new_rows = new_rows[fresh]
+            if not keys:
+                return
+            rewrite = self._matrix is None or self._matrix.shape[1] != new_rows.shape[1]
+            if rewrite:
+                self._matrix = new_rows
+                self._rows = {}
+            else:
+                self._matrix = np.vstack([self._matrix, new_rows])
+            offset = len(self._matrix) - len(new_rows)
+            self._rows.update({key: offset + i for i, key in enumerate(keys)})
+            if len(self._rows) > self.max_entries:
+                self._evict()
+                rewrite = True
+            if rewrite:
+                keys, new_rows = sorted(self._rows, key=self._rows.get), self._matrix
+
+        try:
+            with self._file_locked():
+                if rewrite:
+                    self._rewrite(keys, new_rows)
+                else:
+                    self._append(keys, new_rows)
+        except OSError as e:
+            print(f"⚠️ Could not persist the embedding cache: {e}")
+
+    def _evict(self):
+        """Drops the oldest vectors down to 3/4 of `max_entries` (called with the lock held)."""
+        keep = self.max_entries * 3 // 4
+        ordered = sorted(self._rows, key=self._rows.get)[-keep:] if keep else []
+        self._matrix = self._matrix[[self._rows[key] for key in ordered]]
+        self._rows = {key: row for row, key in enumerate(ordered)}
+
+    def _append(self, keys, rows):
+        """Adds whole records to the end of the file, starting it if needed."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._path, "ab+") as file:
+            file.seek(0)
+            header = file.read(HEADER.size)
+            if header != HEADER.pack(MAGIC, rows.shape[1]):
+                file.truncate(0)
+                header = HEADER.pack(MAGIC, rows.shape[1])
+                file.write(header)
+            else:
+                size = file.seek(0, os.SEEK_END) - HEADER.size
+                file.truncate(HEADER.size + size - size % self.record_type(rows.shape[1]).itemsize)
+            file.write(self._records(keys, rows))
+
+    def _rewrite(self, keys, matrix):
+        """Replaces the file atomically with `matrix` and its `keys`."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = self._path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, matrix.shape[1]))
+            file.write(self._records(keys, matrix))
+        os.replace(temporary, self._path)
@@ -0,0 +1,202 @@
+import os
+from collections import OrderedDict
+
+
+OPERATIONS = ("create_folder", "create_file", "write", "append")
+
+
+class Journal:
+    """Remembers how to undo each change a batch makes, for rollback."""
+
+    def __init__(self):
+        self._undo = []
+
+    def created_folder(self, path):
+        self._undo.append(lambda: os.rmdir(path))
+
+    def created_file(self, path):
+        self._undo.append(lambda: os.remove(path))
+
+    def replaced_file(self, path):
+        with open(path, "rb") as file:
+            original = file.read()
+
+        def restore():
+            with open(path, "wb") as file:
+                file.write(original)
+        self._undo.append(restore)
+
+    def appended_file(self, path):
+        size = os.path.getsize(path)
+
+        def restore():
+            with open(path, "r+b") as file:
+                file.truncate(size)
+        self._undo.append(restore)
+
+    def undo(self):
+        """Reverts every recorded change, newest first; returns the failures."""
+        failures = []
+        for action in reversed(self._undo):
+            try:
+                action()
+            except OSError as e:
+                failures.append(str(e))
+        self._undo.clear()
+        return failures
+
+
+def plan_operations(operations, base_path):
+    """Validates each operation and resolves its path against `base_path` once.
+
+    Returns one entry per operation: {"op", "path", "content", "error"}.
+    """
+    planned = []
+    for operation in operations:
+        entry = {"op": None, "path": None, "content": "", "error": None}
+        planned.append(entry)
+        if not isinstance(operation, dict):
+            entry["error"] = f"Expected an object like {{'op': 'write', 'path': ...}}, got {operation!r}."
+            continue
+        entry["op"] = operation.get("op")
+        entry["content"] = operation.get("content", "")
+        path = operation.get("path")
+        if entry["op"] not in OPERATIONS:
+            entry["error"] = f"Unknown operation {entry['op']!r}. Use one of: {', '.join(OPERATIONS)}."
+        elif not isinstance(path, str) or not path:
+            entry["error"] = "Missing 'path'."
+        elif not isinstance(entry["content"], str):
+            entry["error"] = "'content' must be a string."
+        else:
+            entry["path"] = os.path.normpath(os.path.join(base_path, os.path.expanduser(path)))
+    return planned
+
+
+def group_writes(planned):
+    """Folds each file's operations into one buffered write.
+
+    Returns ({path: {"mode", "chunks", "indexes"}}, folders to create). A create or
+    write starts the file afresh ("w"); appends on their own extend it ("a").
+    Appends follow append_to_file: each adds its content and a newline.
+    """
+    files = OrderedDict()
+    folders = []
+    for index, entry in enumerate(planned):
+        if entry["error"]:
+            continue
+        path = entry["path"]
+        if entry["op"] == "create_folder":
+            folders.append(path)
+            continue
+
+        plan = files.setdefault(path, {"mode": None, "chunks": [], "indexes": []})
+        if entry["op"] == "append" and plan["mode"] is None and not os.path.isfile(path):
+            entry["error"] = f"File '{path}' does not exist."
+            continue
+        if entry["op"] in ("create_file", "write"):
+            plan["mode"] = "w"
+            plan["chunks"] = [entry["content"]] if entry["op"] == "write" else []
+        else:
+            plan["mode"] = plan["mode"] or "a"
+            plan["chunks"].append(entry["content"] + "\n")
+        plan["indexes"].append(index)
+
+    for path in list(files):
+        if not files[path]["indexes"]:
+            del files[path]
+        else:
+            folders.append(os.path.dirname(path))
+    return files, folders
+
+
+def make_folders(path, journal, created):
+    """Creates `path` and any missing parents, journaling each folder it makes."""
+    missing = []
+    current = path
+    while current and not os.path.isdir(current):
+        missing.append(current)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    for folder in reversed(missing):
+        os.mkdir(folder)
+        journal.created_folder(folder)
+        created.append(folder)
+
+
+def apply_operations(operations, base_path=".", rollback=False):
+    """Runs create_folder / create_file / write / append operations in one pass.
+
+    Paths are resolved against `base_path` once, every file is opened and written
+    once however many operations touch it, and missing parent folders are made.
+    With `rollback`, nothing is applied unless every operation is valid, and a
+    failure part-way undoes all earlier changes.
+
+    Returns (per-operation results, paths created) where each result is
+    {"op", "path", "status": "ok" | "error" | "skipped" | "rolled back", "message"}.
+    """
+    planned = plan_operations(operations, base_path)
+    files, folders = group_writes(planned)
+    results = [{"op": entry["op"], "path": entry["path"],
+                "status": "error" if entry["error"] else "pending",
+                "message": entry["error"] or ""} for entry in planned]
+
+    if rollback and any(result["status"] == "error" for result in results):
+        for result in results:
+            if result["status"] == "pending":
+                result.update(status="skipped", message="Not applied: another operation is invalid.")
+        return results, []
+
+    journal = Journal()
+    created = []
+    failed = None
+
+    for folder in dict.fromkeys(folders):
+        try:
+            make_folders(folder, journal, created)
+        except OSError as e:
+            failed = f"Could not create folder '{folder}': {e}"
+            for index, entry in enumerate(planned):
+                if results[index]["status"] == "pending" and \
+                        (entry["path"] == folder or os.path.dirname(entry["path"]) == folder):
+                    results[index].update(status="error", message=failed)
+            if rollback:
+                break
+
+    for path, plan in files.items():
+        if failed and rollback:
+            break
+        if any(results[index]["status"] == "error" for index in plan["indexes"]):
+            continue
+        existed = os.path.exists(path)
+        try:
+            if existed and plan["mode"] == "w":
+                journal.replaced_file(path)
+            elif existed:
+                journal.appended_file(path)
+            with open(path, plan["mode"], encoding="utf-8") as file:
+                file.write("".join(plan["chunks"]))
+            if not existed:
+                journal.created_file(path)
+                created.append(path)
+        except OSError as e:
+            failed = f"Could not write '{path}': {e}"
+            for index in plan["indexes"]:
+                results[index].update(status="error", message=failed)
+            continue
+        for index in plan["indexes"]:
+            results[index].update(status="ok", message=f"{planned[index]['op']} applied to {path}.")
+
+    for index, entry in enumerate(planned):
+        if entry["op"] == "create_folder" and results[index]["status"] == "pending":
+            results[index].update(status="ok", message=f"Folder ready at {entry['path']}.")
+
+    if failed and rollback:
+        problems = journal.undo()
+        note = "Rolled back after: " + failed + (f" (undo problems: {problems})" if problems else "")
+        for result in results:
+            if result["status"] in ("ok", "pending"):
+                result.update(status="rolled back", message=note)
+        return results, []
+    return results, created
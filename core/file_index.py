@@ -0,0 +1,423 @@
+import os
+import sqlite3
+import threading
+import time
+from core.name_matcher import TrigramIndex
+from core.walker import ParallelWalker
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (
+    path TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    is_dir INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_name ON entries(name);
+CREATE INDEX IF NOT EXISTS entries_parent ON entries(parent);
+"""
+
+
+def subtree_bounds(path):
+    """Returns the (low, high) key range covering everything below a path."""
+    prefix = path if path.endswith(os.sep) else path + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def covers(root, path):
+    """True if `path` is `root` or lies below it."""
+    return path == root or path.startswith(subtree_bounds(root)[0])
+
+
+class FileIndex:
+    """Persistent name → path index of the filesystem, refreshed by directory mtimes.
+
+    Roots marked with `watch` are kept current by a file watcher, so lookups never
+    re-scan them for staleness.
+    """
+
+    def __init__(self, db_path, excluded=(), max_age=30.0, walker=None):
+        self.db_path = db_path
+        self.excluded = set(excluded)
+        self.max_age = max_age
+        self.walker = walker or ParallelWalker(self.excluded)
+        self._lock = threading.RLock()
+        self._names = None
+        self._watched = set()
+        self._updating = {}
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    ### LOOKUPS ###
+    def lookup(self, target_name, root, max_results=None, max_depth=None, deadline=None):
+        """Returns indexed paths under `root` whose name is `target_name`.
+
+        `max_depth` counts levels below `root` (1 = direct children only). Returns
+        None if the index could not be brought up to date before `deadline`.
+        """
+        root = os.path.abspath(root)
+        if not self.ensure_fresh(root, deadline):
+            return None
+        return self._query_name(target_name, root, max_results, max_depth)
+
+    def match(self, query, root, mode="fuzzy", limit=10, deadline=None):
+        """Returns up to `limit` (path, score) pairs under `root`, best first.
+
+        `mode` is one of "exact" (case-insensitive), "prefix", "glob" or "fuzzy".
+        Returns None if the index could not be brought up to date before `deadline`.
+        """
+        root = os.path.abspath(root)
+        if not self.ensure_fresh(root, deadline):
+            return None
+        names = self.name_index()
+
+        # Rank distinct names first, then resolve them to paths under `root`;
+        # widen the candidate list until enough paths are found or names run out.
+        results = []
+        wanted = limit
+        while True:
+            ranked = names.search(query, mode=mode, limit=wanted)
+            scores = dict(ranked)
+            results = []
+            for chunk_start in range(0, len(ranked), 500):
+                chunk = [name for name, _ in ranked[chunk_start:chunk_start + 500]]
+                results.extend(
+                    (path, scores[name]) for path, name in self._query_names(chunk, root))
+            if len(results) >= limit or len(ranked) < wanted:
+                break
+            wanted *= 4
+
+        results.sort(key=lambda item: (-item[1], len(item[0]), item[0]))
+        return results[:limit]
+
+    def files_with_extensions(self, root, extensions):
+        """Returns every indexed file under `root` ending in one of `extensions`."""
+        root = os.path.abspath(root)
+        self.ensure_fresh(root)
+        low, high = subtree_bounds(root)
+        clauses = " OR ".join("name LIKE ?" for _ in extensions)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT path FROM entries WHERE is_dir = 0 AND path >= ? AND path < ? "
+                f"AND ({clauses})",
+                (low, high, *("%" + extension for extension in extensions)),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def name_index(self):
+        """Returns the trigram index over every distinct indexed name, loading it once."""
+        with self._lock:
+            if self._names is None:
+                rows = self._conn.execute("SELECT DISTINCT name FROM entries")
+                self._names = TrigramIndex(row[0] for row in rows)
+            return self._names
+
+    def _query_names(self, names, root):
+        low, high = subtree_bounds(root)
+        placeholders = ",".join("?" * len(names))
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT path, name FROM entries WHERE name IN ({placeholders}) "
+                "AND path >= ? AND path < ?",
+                (*names, low, high),
+            ).fetchall()
+
+    def _query_name(self, target_name, root, max_results=None, max_depth=None):
+        """Reads the paths named `target_name` under `root` straight from the index."""
+        low, high = subtree_bounds(root)
+        query = ("SELECT path FROM entries WHERE name = ? AND path >= ? AND path < ? "
+                 "ORDER BY path")
+        params = [target_name, low, high]
+        if max_results is not None and max_depth is None:
+            query += " LIMIT ?"
+            params.append(max_results)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        found = [row[0] for row in rows]
+        if max_depth is not None:
+            found = [path for path in found
+                     if path[len(low):].count(os.sep) < max_depth]
+        return found[:max_results] if max_results is not None else found
+
+    def ensure_fresh(self, root, deadline=None):
+        """Builds the index for `root` on first use, otherwise re-scans stale directories.
+
+        Watched roots are never re-scanned here. `deadline` is a `time.monotonic()`
+        value: work that is not done by then carries on in a background thread.
+        Returns True if the index can answer for `root` now, False if it cannot yet.
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            if any(covers(path, root) for path in self._updating):
+                return False
+        update = self._pending_update(root)
+        if update is None or update(root, deadline) is not None:
+            return True
+        self._update_in_background(update, root)
+        return False
+
+    def update_in_background(self, root):
+        """Builds or refreshes `root` on a background thread if it needs it.
+
+        Returns the updating thread, or None if the index is already fresh.
+        """
+        root = os.path.abspath(root)
+        update = self._pending_update(root)
+        return None if update is None else self._update_in_background(update, root)
+
+    def _pending_update(self, root):
+        """Returns `build` or `refresh` if `root` needs it, or None if it is fresh or watched."""
+        covering_root, refreshed_at = self._covering_root(root)
+        if covering_root is None:
+            return self.build
+        if self.is_watched(root) or time.time() - refreshed_at <= self.max_age:
+            return None
+        return self.refresh
+
+    def watch(self, root):
+        """Marks `root` as kept current by a file watcher."""
+        with self._lock:
+            self._watched.add(os.path.abspath(root))
+
+    def unwatch(self, root):
+        with self._lock:
+            self._watched.discard(os.path.abspath(root))
+
+    def is_watched(self, path):
+        """Returns True if `path` lies inside a watched root."""
+        path = os.path.abspath(path)
+        with self._lock:
+            return any(covers(root, path) for root in self._watched)
+
+    def _update_in_background(self, update, root):
+        """Runs `update(root)` on a background thread, once per root; returns the thread."""
+        with self._lock:
+            if root in self._updating:
+                return self._updating[root]
+            thread = threading.Thread(target=self._finish_update, args=(update, root),
+                                      name="alfred-file-index", daemon=True)
+            self._updating[root] = thread
+        thread.start()
+        return thread
+
+    def _finish_update(self, update, root):
+        try:
+            update(root)
+        except Exception as e:
+            print(f"⚠️ File index update of '{root}' failed: {e}")
+        finally:
+            with self._lock:
+                del self._updating[root]
+
+    def is_indexed(self, path):
+        """Returns True if `path` lies inside an indexed root."""
+        return self._covering_root(os.path.abspath(path))[0] is not None
+
+    def directories(self, root):
+        """Returns every indexed directory at or below `root`."""
+        root = os.path.abspath(root)
+        low, high = subtree_bounds(root)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, low, high),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _covering_root(self, path):
+        """Finds the indexed root that contains `path`, if any."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, refreshed_at FROM roots").fetchall()
+
+        best = (None, 0.0)
+        for root, refreshed_at in rows:
+            if covers(root, path):
+                if best[0] is None or len(root) > len(best[0]):
+                    best = (root, refreshed_at)
+        return best
+
+    ### INDEXING ###
+    def build(self, root, deadline=None):
+        """Walks `root` from scratch and records every entry below it.
+
+        Returns None, leaving `root` unrecorded, if the walk did not finish by `deadline`.
+        """
+        root = os.path.abspath(root)
+        started = time.time()
+        if not self._walk([root], deadline=deadline):
+            return None
+
+        with self._lock, self._conn:
+            low, high = subtree_bounds(root)
+            # A new root replaces any narrower roots it now covers.
+            self._conn.execute(
+                "DELETE FROM roots WHERE path >= ? AND path < ?", (low, high))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO roots (path, refreshed_at) VALUES (?, ?)",
+                (root, started),
+            )
+        return True
+
+    def refresh(self, root, deadline=None):
+        """Re-scans only the directories under `root` whose mtime has changed.
+
+        Returns how many were stale, or None if it did not finish by `deadline`.
+        """
+        root = os.path.abspath(root)
+        started = time.time()
+        low, high = subtree_bounds(root)
+
+        with self._lock:
+            known = self._conn.execute(
+                "SELECT path, mtime_ns FROM dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (root, low, high),
+            ).fetchall()
+
+        stale = []
+        for number, (path, mtime_ns) in enumerate(known):
+            if deadline is not None and number % 256 == 0 and time.monotonic() >= deadline:
+                return None
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                self.remove_subtree(path)
+                continue
+            if current != mtime_ns:
+                stale.append(path)
+
+        if not self._walk(stale, known_dirs={path for path, _ in known}, deadline=deadline):
+            return None
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE roots SET refreshed_at = ? WHERE path = ? OR (path >= ? AND path < ?)",
+                (started, root, low, high),
+            )
+        return len(stale)
+
+    def update_directory(self, path):
+        """Re-scans a single directory, e.g. after a tool has changed its contents."""
+        path = os.path.abspath(path)
+        if not self.is_indexed(path):
+            return
+        if not os.path.isdir(path):
+            self.remove_subtree(path)
+            return
+        low, high = subtree_bounds(path)
+        with self._lock:
+            known = {row[0] for row in self._conn.execute(
+                "SELECT path FROM dirs WHERE path >= ? AND path < ?", (low, high))}
+        self._walk([path], known_dirs=known)
+
+    def add_path(self, path):
+        """Records a path the caller has just created, plus any new parent folders.
+
+        The parent directory's stored mtime is left alone, so the next refresh
+        still re-scans it and picks up anything else that changed.
+        """
+        path = os.path.abspath(path)
+        if not self.is_indexed(path):
+            return
+
+        rows = []
+        current = path
+        with self._lock:
+            while True:
+                parent = os.path.dirname(current)
+                if parent == current or not self.is_indexed(parent):
+                    break
+                rows.append((current, os.path.basename(current), parent,
+                             int(os.path.isdir(current) and not os.path.islink(current))))
+                known_parent = self._conn.execute(
+                    "SELECT 1 FROM dirs WHERE path = ?", (parent,)).fetchone()
+                if known_parent:
+                    break
+                current = parent
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (path, name, parent, is_dir) "
+                    "VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+            if self._names is not None:
+                self._names.add_many(row[1] for row in rows)
+
+    def remove_subtree(self, path):
+        """Drops a path and everything indexed below it."""
+        low, high = subtree_bounds(path)
+        with self._lock, self._conn:
+            for table in ("entries", "dirs"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE path = ? OR (path >= ? AND path < ?)",
+                    (path, low, high),
+                )
+
+    def _walk(self, start_dirs, known_dirs=frozenset(), deadline=None):
+        """Scans `start_dirs`, descending into any subdirectory not already indexed.
+
+        Returns False if the walk was cut short by `deadline`.
+        """
+        listings = self.walker.walk(
+            start_dirs, list_directory, skip=known_dirs, stat_dirs=True, deadline=deadline)
+        for path, mtime_ns, children in listings:
+            self._store_directory(path, mtime_ns, children)
+        return deadline is None or time.monotonic() < deadline
+
+    def _store_directory(self, path, mtime_ns, children):
+        """Replaces the indexed children of `path` with a fresh listing."""
+        current = {child[0] for child in children}
+
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT path FROM entries WHERE parent = ?", (path,)
+            ).fetchall()
+            for (old_path,) in previous:
+                if old_path not in current:
+                    self.remove_subtree(old_path)
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (path, name, parent, is_dir) "
+                    "VALUES (?, ?, ?, ?)",
+                    children,
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)",
+                    (path, mtime_ns),
+                )
+            if self._names is not None:
+                self._names.add_many(child[1] for child in children)
+
+
+def list_directory(path, mtime_ns, entries):
+    """Walker callback that turns one directory listing into index rows."""
+    children = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            is_dir = False
+        children.append((entry.path, entry.name, path, int(is_dir)))
+    return [(path, mtime_ns, children)]
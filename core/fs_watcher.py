@@ -0,0 +1,271 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import platform
+import select
+import struct
+import threading
+import time
+
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """Keeps a `FileIndex` current by refreshing its roots every few seconds.
+
+    The roots are indexed on the watcher's own thread and then marked as watched,
+    so lookups stop re-scanning them for staleness.
+    """
+
+    def __init__(self, index, roots, interval=5.0):
+        self.index = index
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the background thread, which indexes the roots first if needed."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the background thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        for root in self.roots:
+            self.index.unwatch(root)
+
+    def add_root(self, root):
+        """Starts polling one more root that is already indexed."""
+        self.roots.append(root)
+        self.index.watch(root)
+
+    def _run(self):
+        for root in list(self.roots):
+            index_root(self.index, root)
+            self.index.watch(root)
+        while not self._stopped.wait(self.interval):
+            for root in self.roots:
+                try:
+                    self.index.refresh(root)
+                except Exception as e:
+                    print(f"⚠️ Watcher failed to refresh '{root}': {e}")
+
+
+class InotifyWatcher:
+    """Keeps a `FileIndex` current from Linux inotify events.
+
+    The roots are indexed on the watcher's thread, then every indexed directory
+    gets a watch and the root is marked as watched, so lookups stop re-scanning it
+    for staleness. Events are collected for `settle`
+    seconds and then each touched directory is re-scanned once. A directory that
+    cannot be watched is skipped; once the kernel's watch limit is reached, the
+    roots left incomplete are handed to a `PollingWatcher` every `interval` seconds.
+    """
+
+    def __init__(self, index, roots, settle=0.2, interval=5.0):
+        self.index = index
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.settle = settle
+        self.interval = interval
+        self.polling = None
+        self._libc = load_libc()
+        self._fd = None
+        self._watches = {}
+        self._watched_paths = set()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Opens inotify and starts the thread that indexes and watches the roots.
+
+        Raises OSError if inotify is unavailable.
+        """
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _watch_roots(self):
+        """Indexes each root (if needed) and adds a watch per directory."""
+        limited = []
+        for root in self.roots:
+            index_root(self.index, root)
+            if self._watch(self.index.directories(root)):
+                self.index.watch(root)
+            else:
+                limited.append(root)
+        if limited:
+            self._poll(limited)
+
+    def stop(self):
+        """Stops the background thread and releases the inotify descriptor."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.polling is not None:
+            self.polling.stop()
+        for root in self.roots:
+            self.index.unwatch(root)
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _add_watch(self, path):
+        if path in self._watched_paths:
+            return
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
+                return
+            raise OSError(error, os.strerror(error), path)
+        self._watches[wd] = path
+        self._watched_paths.add(path)
+
+    def _watch(self, directories):
+        """Watches each directory, skipping failures; False if the watch limit was hit."""
+        for directory in directories:
+            try:
+                self._add_watch(directory)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    return False
+                print(f"⚠️ Watcher cannot watch '{directory}': {e}")
+        return True
+
+    def _poll(self, roots):
+        """Keeps `roots` current by polling, as inotify cannot watch all of them."""
+        polled = self.polling.roots if self.polling is not None else []
+        roots = [root for root in dict.fromkeys(roots) if root not in polled]
+        if not roots:
+            return
+        print(f"⚠️ inotify watch limit reached; polling {', '.join(roots)} "
+              f"every {self.interval:g}s instead.")
+        if self.polling is None:
+            self.polling = PollingWatcher(self.index, roots, self.interval).start()
+        else:
+            for root in roots:
+                self.polling.add_root(root)
+
+    def _run(self):
+        try:
+            self._watch_roots()
+        except Exception as e:
+            print(f"⚠️ Watcher failed to index its roots: {e}")
+        while not self._stopped.is_set():
+            ready, _, _ = select.select([self._fd], [], [], 0.5)
+            if not ready:
+                continue
+
+            dirty = set()
+            overflowed = False
+            deadline = time.monotonic() + self.settle
+            while time.monotonic() < deadline:
+                overflowed |= self._read_events(dirty)
+                time.sleep(min(0.05, self.settle))
+
+            try:
+                self._apply(dirty, overflowed)
+            except Exception as e:
+                print(f"⚠️ Watcher failed to update the file index: {e}")
+
+    def _read_events(self, dirty):
+        """Drains pending events into `dirty`; returns True on queue overflow."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        overflowed = False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+                continue
+            path = self._watches.get(wd)
+            if path is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+                self._watched_paths.discard(path)
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                dirty.add(os.path.dirname(path))
+            else:
+                dirty.add(path)
+        return overflowed
+
+    def _apply(self, dirty, overflowed):
+        """Re-scans touched directories and watches any new ones."""
+        if overflowed:
+            for root in self.roots:
+                self.index.refresh(root)
+            dirty = set(self.roots)
+        else:
+            for path in dirty:
+                self.index.update_directory(path)
+
+        limited = []
+        for path in dirty:
+            if not self._watch(self.index.directories(path)):
+                limited.extend(root for root in self.roots
+                               if path == root or path.startswith(root.rstrip(os.sep) + os.sep))
+        if limited:
+            self._poll(limited)
+
+
+def index_root(index, root):
+    """Builds or refreshes `root` in the index, sharing any update already running."""
+    try:
+        thread = index.update_in_background(root)
+        if thread is not None:
+            thread.join()
+    except Exception as e:
+        print(f"⚠️ Watcher failed to index '{root}': {e}")
+
+
+def load_libc():
+    """Loads libc with the inotify entry points, raising OSError if they are missing."""
+    if platform.system() != "Linux":
+        raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "libc has no inotify support")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+def start_watcher(index, roots, interval=5.0):
+    """Starts an inotify watcher for `roots`, or a polling one where inotify is unavailable."""
+    try:
+        return InotifyWatcher(index, roots, interval=interval).start()
+    except OSError as e:
+        print(f"⚠️ inotify unavailable ({e}); polling every {interval:g}s instead.")
+        return PollingWatcher(index, roots, interval).start()
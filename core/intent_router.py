@@ -0,0 +1,161 @@
+import re
+import threading
+import uuid
+from core.tool_registry import get_registry
+
+
+def name(group):
+    """One name or filename ("Batman", "notes.txt"), or any quoted name ("'Tax Returns'")."""
+    return (rf"(?P<quote_{group}>['\"])?(?P<{group}>(?(quote_{group})[^'\"]+|[^\s'\"]*[^\s'\".!?]))"
+            rf"(?(quote_{group})['\"])")
+
+
+LOCATION = (r"(?:\s+(?:on|in|at|under|inside)\s+(?:my\s+|the\s+)?" + name("path")
+            + r"(?:\s+(?:folder|directory))?)?")
+POLITE = r"^(?:(?:please|alfred|hey alfred|can you|could you|would you)[,\s]+)*"
+END = r"\s*[.!?]*\s*(?:please)?[.!?]*$"
+TARGET = (r"(?:(?:my|the|your)\s+)?(?:(?:folder|file|directory)\s+(?:named\s+|called\s+)?)?"
+          + name("target_name") + r"(?:\s+(?:folder|directory|file))?")
+# Unquoted words that refer to something instead of naming it.
+GENERIC_NAMES = {
+    "it", "this", "that", "these", "those", "them", "one", "all", "everything", "anything",
+    "something", "stuff", "things", "file", "files", "folder", "folders", "directory",
+    "directories", "contents", "my", "me", "a", "an", "the", "new", "recent", "here", "there",
+    "on", "in", "at", "under", "inside", "for",
+}
+
+# Inputs that chain or condition several actions, or describe a target instead of
+# naming it, always go to the model.
+AMBIGUOUS = re.compile(
+    r"\b(?:and|then|also|after|before|if|unless|or|but|that|which|what|why|how|"
+    r"containing|mentioning|about|with|without|from|to)\b|[,;]", re.I)
+
+
+class Rule:
+    """A pattern that maps one phrasing of a request onto a single registered tool."""
+
+    def __init__(self, tool_name, pattern, build_args):
+        self.tool_name = tool_name
+        self.pattern = re.compile(POLITE + pattern + END, re.I)
+        self.build_args = build_args
+
+    def match(self, text):
+        match = self.pattern.match(text)
+        if not match:
+            return None
+        groups = match.groupdict()
+        args = {}
+        for key, value in groups.items():
+            if not value or key.startswith("quote_"):
+                continue
+            if not groups.get(f"quote_{key}") and value.lower() in GENERIC_NAMES:
+                return None
+            args[key] = value.strip()
+        return self.build_args(args)
+
+
+def with_path(args, name_key):
+    """Copies the target name and adds `path` only if the user gave a location."""
+    routed = {name_key: args[name_key]}
+    if args.get("path"):
+        routed["path"] = args["path"]
+    return routed
+
+
+RULES = [
+    Rule("create_folder",
+         r"(?:create|make|add)\s+(?:a\s+)?(?:new\s+)?(?:folder|directory)\s+(?:named\s+|called\s+)?"
+         + name("folder_name") + LOCATION,
+         lambda args: with_path(args, "folder_name")),
+    Rule("create_file",
+         r"(?:create|make|add)\s+(?:a\s+)?(?:new\s+)?(?:empty\s+)?(?:\w+\s+)?file\s+(?:named\s+|called\s+)?"
+         + name("file_name") + LOCATION,
+         lambda args: with_path(args, "file_name")),
+    Rule("list_files_and_folders",
+         r"(?:list|show\s+(?:me\s+)?(?=(?:all\s+)?(?:the\s+)?(?:files|contents|everything)\b))\s*"
+         r"(?:(?:all\s+)?(?:the\s+)?(?:files|contents|everything)\s+(?:in|on|of)\s+)?"
+         r"(?:my\s+|the\s+)?" + name("path") + r"(?:\s+(?:folder|directory))?",
+         lambda args: {"path": args["path"]}),
+    Rule("open_file_or_folder",
+         r"open\s+(?:up\s+)?" + TARGET,
+         lambda args: {"target_name": args["target_name"]}),
+    Rule("search_for_target",
+         r"(?:where\s+is|where's|find|locate|search\s+for)\s+" + TARGET + r"(?:\s+located)?",
+         lambda args: {"target_name": args["target_name"]}),
+]
+
+
+class IntentRouter:
+    """Maps unambiguous commands straight to validated tool calls, skipping the LLM.
+
+    Only rules whose tool is actually registered are used, and every routed call
+    must satisfy that tool's argument schema; anything else returns None so the
+    caller falls back to the model.
+    """
+
+    def __init__(self, rules=RULES):
+        self.rules = [rule for rule in rules if rule.tool_name in get_registry()]
+        self.total = 0
+        self.routed = 0
+        self.by_tool = {}
+        self._lock = threading.Lock()
+
+    def route(self, user_input):
+        """Returns a one-element tool_calls list for `user_input`, or None."""
+        text = " ".join(user_input.split())
+        tool_call = None
+        if text and not AMBIGUOUS.search(text):
+            for rule in self.rules:
+                args = rule.match(text)
+                if args is not None:
+                    args = self.with_defaults(rule.tool_name, args)
+                if args is not None and self.is_valid(rule.tool_name, args):
+                    tool_call = {"name": rule.tool_name, "args": args,
+                                 "id": f"fastpath_{uuid.uuid4().hex[:12]}"}
+                    break
+
+        with self._lock:
+            self.total += 1
+            if tool_call:
+                self.routed += 1
+                self.by_tool[tool_call["name"]] = self.by_tool.get(tool_call["name"], 0) + 1
+        return [tool_call] if tool_call else None
+
+    @staticmethod
+    def schema_fields(tool_name):
+        """Returns {argument name: (required, default)} from a tool's argument schema."""
+        return get_registry().get(tool_name).fields
+
+    def with_defaults(self, tool_name, args):
+        """Spells out the tool's defaults for optional arguments the user did not give."""
+        defaults = {name: default for name, (required, default)
+                    in self.schema_fields(tool_name).items() if not required}
+        return {**defaults, **args}
+
+    def is_valid(self, tool_name, args):
+        """Checks routed arguments against the tool's schema (required and known keys)."""
+        fields = self.schema_fields(tool_name)
+        required = {name for name, (is_required, _) in fields.items() if is_required}
+        return (required <= args.keys() <= fields.keys()
+                and all(args[name] for name in required))
+
+    def stats(self):
+        """Returns routing counters and the share of inputs that bypassed the model."""
+        with self._lock:
+            return {
+                "total": self.total,
+                "routed": self.routed,
+                "bypass_rate": self.routed / self.total if self.total else 0.0,
+                "by_tool": dict(self.by_tool),
+            }
+
+
+ROUTER = None
+
+
+def get_router():
+    """Returns the shared intent router, building its rules on first use."""
+    global ROUTER
+    if ROUTER is None:
+        ROUTER = IntentRouter()
+    return ROUTER
@@ -1,49 +1,120 @@
+import asyncio
 import json
+from typing import Annotated
+from typing_extensions import TypedDict
 from langgraph.graph import StateGraph, START, END
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from core.ai import model_with_tools
+from langgraph.graph.message import add_messages
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from core.ai import get_model_for_request, astream_response, print_token
+from core.memory import SUMMARY_TAG, get_memory, open_checkpointer, session_config
 from core.tool_execution import execute_tool_call
+from core.tracing import DEBUG, INFO, enabled, log, span
 
 
-class State(dict):
-    """Graph state to track messages and tool executions."""
-    messages: list
+class State(TypedDict, total=False):
+    """Graph state: messages are appended (never copied) and old turns live in `summary`."""
+    messages: Annotated[list, add_messages]
+    summary: str
 
 
 def call_ai(state: State):
     """Invoke AI model and determine next step."""
-    messages = state["messages"]
-    response = model_with_tools.invoke(messages)
+    with span("graph.ai"):
+        update, messages = remember(state)
+        model = get_model_for_request(latest_user_input(messages), referenced_tools(messages))
+        with span("llm.call"):
+            response = model.invoke(get_memory().model_messages(messages, update["summary"]))
+
+    update["messages"].append(response)
+    return update
+
 
-    state["messages"].append(response)
+async def acall_ai(state: State):
+    """Async `call_ai`: streams the completion so graph.astream can emit tokens."""
+    with span("graph.ai", streaming=True):
+        update, messages = await asyncio.to_thread(remember, state)
+        model = await asyncio.to_thread(
+            get_model_for_request, latest_user_input(messages), referenced_tools(messages))
+        with span("llm.call", streaming=True):
+            response = await astream_response(
+                model, get_memory().model_messages(messages, update["summary"]))
 
-    if hasattr(response, "tool_calls") and response.tool_calls:
-        return {"messages": state["messages"], "next_step": "tools"}
+    update["messages"].append(AIMessage(
+        content=response.content, tool_calls=response.tool_calls, id=response.id))
+    return update
 
-    return {"messages": state["messages"], "next_step": END}
 
+def remember(state: State):
+    """Folds old turns into the summary if the history is over budget.
+
+    Returns the state update (removals and summary so far) and the messages to keep.
+    """
+    messages = state["messages"]
+    summary = state.get("summary", "")
+    compacted = get_memory().compact(messages, summary)
+    if compacted is None:
+        return {"messages": [], "summary": summary}, messages
 
-def execute_tools(state: State):
-    """Execute tools and append properly formatted responses."""
+    removals, summary = compacted
+    removed = {removal.id for removal in removals}
+    kept = [message for message in messages if message.id not in removed]
+    return {"messages": removals, "summary": summary}, kept
+
+
+def execute_tools(state: State, config=None):
+    """Execute tools and append properly formatted responses.
+
+    Large results are compacted to the chunks relevant to the latest request.
+    """
     latest_ai_message = state["messages"][-1]
 
     if hasattr(latest_ai_message, "tool_calls") and latest_ai_message.tool_calls:
-        print(f"\n🔧 Executing tool: {latest_ai_message.tool_calls}")
+        if enabled(DEBUG):
+            print(f"\n🔧 Executing tool: {latest_ai_message.tool_calls}")
+        else:
+            log(INFO, f"\n🔧 Executing tools: "
+                      f"{[call['name'] for call in latest_ai_message.tool_calls]}")
+
+        with span("graph.tools", calls=len(latest_ai_message.tool_calls)):
+            tool_responses = execute_tool_call(latest_ai_message.tool_calls)
 
-        tool_responses = execute_tool_call(latest_ai_message.tool_calls)
+            memory = get_memory()
+            query = latest_user_input(state["messages"])
+            session_id = (config or {}).get("configurable", {}).get("thread_id", "default")
+            tool_messages = [
+                ToolMessage(
+                    content=memory.tool_message_content(
+                        resp["result"] if "result" in resp else "Error", query, session_id),
+                    tool_call_id=call["id"]
+                )
+                for call, resp in zip(latest_ai_message.tool_calls, tool_responses)
+            ]
 
-        tool_messages = [
-            ToolMessage(
-                content=json.dumps(
-                    {"result": resp["result"] if "result" in resp else "Error"}),
-                tool_call_id=call["id"]
-            )
-            for call, resp in zip(latest_ai_message.tool_calls, tool_responses)
-        ]
+        return {"messages": tool_messages}
 
-        return {"messages": state["messages"] + tool_messages, "next_step": "ai"}
+    return {"messages": []}
 
-    return {"messages": state["messages"], "next_step": END}
+
+async def aexecute_tools(state: State, config=None):
+    """Async `execute_tools`: runs the tools in a worker thread, off the event loop."""
+    return await asyncio.to_thread(execute_tools, state, config)
+
+
+def latest_user_input(messages):
+    """Returns the text of the most recent human message, used for tool selection."""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return message.content
+    return ""
+
+
+def referenced_tools(messages):
+    """Tools the model needs regardless of selection, e.g. to read compacted results."""
+    for message in messages:
+        if isinstance(message, ToolMessage) and "fetch_result_chunks(" in message.content:
+            return {"fetch_result_chunks", "read_tool_result"}
+    return set()
 
 
 def determine_next_step(state: State):
@@ -53,17 +124,37 @@ def determine_next_step(state: State):
     return END
 
 
+async def astream_reply(user_input, on_token=print_token, session_id="default"):
+    """Runs the graph asynchronously, streaming the model's tokens to `on_token`.
+
+    With a checkpointer, earlier turns of `session_id` are restored first.
+    Returns the final message list.
+    """
+    state = {"messages": [HumanMessage(content=user_input)]}
+    with span("graph.run", streaming=True):
+        async for mode, payload in graph.astream(state, session_config(session_id),
+                                                 stream_mode=["messages", "values"]):
+            if mode == "messages":
+                chunk, metadata = payload
+                if isinstance(chunk, AIMessageChunk) and isinstance(chunk.content, str) \
+                        and chunk.content and SUMMARY_TAG not in metadata.get("tags", []):
+                    on_token(chunk.content)
+            else:
+                state = payload
+    return state["messages"]
+
+
 graph = StateGraph(State)
-graph.add_node("ai", call_ai)
-graph.add_node("tools", execute_tools)
+graph.add_node("ai", RunnableLambda(call_ai, afunc=acall_ai, name="ai"))
+graph.add_node("tools", RunnableLambda(execute_tools, afunc=aexecute_tools, name="tools"))
 
 graph.add_edge(START, "ai")
 graph.add_conditional_edges("ai", determine_next_step)
 graph.add_edge("tools", "ai")
 
-graph = graph.compile()
+graph = graph.compile(checkpointer=open_checkpointer())
 
 if __name__ == "__main__":
     test_input = "Where is my Batman folder located"
-    response = graph.invoke({"messages": [HumanMessage(content=test_input)]})
+    response = graph.invoke({"messages": [HumanMessage(content=test_input)]}, session_config())
     print("\n🎩 Alfred: ", response["messages"][-1].content)
@@ -0,0 +1,146 @@
+import re
+import threading
+import uuid
+import zlib
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+
+WORD = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """Offline embeddings: hashed word and character-trigram counts, L2-normalised.
+
+    Deterministic across processes (CRC32, not Python's salted `hash`) and needs
+    no network or model files.
+    """
+
+    def __init__(self, size=1024):
+        self.size = size
+
+    def features(self, text):
+        """Returns the hashed feature ids of a text."""
+        words = WORD.findall(text.lower())
+        grams = []
+        for word in words:
+            padded = f"#{word}#"
+            grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return [zlib.crc32(f"w:{word}".encode("utf-8")) for word in words] + \
+               [zlib.crc32(f"g:{gram}".encode("utf-8")) for gram in grams]
+
+    def embed_array(self, texts):
+        """Embeds texts into a (len(texts), size) float32 matrix."""
+        matrix = np.zeros((len(texts), self.size), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.asarray(self.features(text), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(matrix[row], hashes % self.size, signs)
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_documents(self, texts):
+        return self.embed_array(list(texts)).tolist()
+
+    def embed_query(self, text):
+        return self.embed_array([text])[0].tolist()
+
+
+class NumpyVectorStore(VectorStore):
+    """Vector store over one contiguous float32 matrix with vectorised cosine top-k.
+
+    Rows are stored normalised, so a search is a single matrix-vector product
+    followed by `argpartition`; capacity grows geometrically to keep inserts cheap.
+    """
+
+    def __init__(self, embedding):
+        self.embedding = embedding
+        self._matrix = None
+        self._count = 0
+        self._documents = []
+        self._ids = {}
+        self._lock = threading.RLock()
+
+    @property
+    def embeddings(self):
+        return self.embedding
+
+    def __len__(self):
+        return self._count
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [i or str(uuid.uuid4()) for i in (ids or [None] * len(texts))]
+        vectors = self._embed_documents(texts)
+
+        with self._lock:
+            for text, metadata, doc_id, vector in zip(texts, metadatas, ids, vectors):
+                document = Document(page_content=text, metadata=metadata, id=doc_id)
+                if doc_id in self._ids:
+                    row = self._ids[doc_id]
+                    self._documents[row] = document
+                else:
+                    row = self._count
+                    self._reserve(row + 1, len(vector))
+                    self._documents.append(document)
+                    self._ids[doc_id] = row
+                    self._count += 1
+                self._matrix[row] = vector
+        return ids
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        query_vector = self._normalise(np.asarray(
+            self.embedding.embed_query(query), dtype=np.float32)[None, :])[0]
+        return self.similarity_search_by_vector_with_score(query_vector, k)
+
+    def similarity_search_by_vector_with_score(self, vector, k=4):
+        """Returns the `k` (document, cosine score) pairs closest to `vector`."""
+        with self._lock:
+            if not self._count:
+                return []
+            scores = self._matrix[:self._count] @ np.asarray(vector, dtype=np.float32)
+            k = min(k, self._count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._documents[row], float(scores[row])) for row in top]
+
+    def similarity_search(self, query, k=4, **kwargs):
+        return [document for document, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_by_vector(self, embedding, k=4, **kwargs):
+        vector = self._normalise(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        return [document for document, _ in
+                self.similarity_search_by_vector_with_score(vector, k)]
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, **kwargs):
+        store = cls(embedding=embedding)
+        store.add_texts(texts, metadatas, ids=kwargs.get("ids"))
+        return store
+
+    def _embed_documents(self, texts):
+        if hasattr(self.embedding, "embed_array"):
+            vectors = self.embedding.embed_array(texts)
+        else:
+            vectors = np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+        return self._normalise(vectors.reshape(len(texts), -1))
+
+    @staticmethod
+    def _normalise(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def _reserve(self, rows, dimensions):
+        if self._matrix is None:
+            self._matrix = np.zeros((max(rows, 64), dimensions), dtype=np.float32)
+        elif rows > len(self._matrix):
+            grown = np.zeros((max(rows, 2 * len(self._matrix)), dimensions), dtype=np.float32)
+            grown[:self._count] = self._matrix[:self._count]
+            self._matrix = grown
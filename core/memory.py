@@ -0,0 +1,201 @@
+import asyncio
+import json
+import os
+import sqlite3
+from langchain_core.messages import HumanMessage, RemoveMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from core.result_index import ResultIndex
+
+
+MEMORY_TOKEN_BUDGET = int(os.getenv("ALFRED_MEMORY_TOKENS", "6000"))
+TOOL_RESULT_TOKENS = int(os.getenv("ALFRED_TOOL_RESULT_TOKENS", "1000"))
+CHECKPOINT_PATH = os.getenv("ALFRED_CHECKPOINT_PATH")
+# Rough characters per token, used to size previews of compacted tool results.
+CHARS_PER_TOKEN = 4
+# Tags the summariser's model calls so streamed replies can leave them out.
+SUMMARY_TAG = "alfred_summary"
+
+SUMMARY_PROMPT = (
+    "Update the running summary of a conversation between a user and Alfred, a file "
+    "assistant. Keep names, paths and decisions; drop pleasantries. At most 150 words.\n\n"
+    "Current summary: {summary}\n\nNew messages:\n{transcript}"
+)
+
+
+class MemoryManager:
+    """Keeps the graph's conversation within a token budget.
+
+    Once the history exceeds `token_budget`, the oldest turns are folded into a
+    rolling summary and removed from the state, so every model call sees at most
+    the summary plus about half the budget of recent messages. Tool results above
+    `tool_result_tokens` are chunked into the session's index in `results`, and only
+    the chunks relevant to the request are shown, with a reference the model can
+    pass to `fetch_result_chunks` or `read_tool_result` for more.
+    """
+
+    def __init__(self, token_budget=MEMORY_TOKEN_BUDGET, tool_result_tokens=TOOL_RESULT_TOKENS,
+                 results=None, summarize=None):
+        self.token_budget = token_budget
+        self.tool_result_tokens = tool_result_tokens
+        self.results = results or ResultIndex()
+        self.summarize = summarize or summarize_with_model
+
+    @staticmethod
+    def count(messages):
+        """Approximate token count of a message list."""
+        return count_tokens_approximately(messages)
+
+    def tool_message_content(self, result, query="", session_id="default"):
+        """JSON content of a ToolMessage, with an oversized result compacted."""
+        text = result if isinstance(result, str) else json.dumps(result, default=str)
+        if len(text) > self.tool_result_tokens * CHARS_PER_TOKEN:
+            result = self.compact_tool_result(text, query, session_id)
+        return json.dumps({"result": result}, default=str)
+
+    def compact_tool_result(self, content, query="", session_id="default"):
+        """Returns `content`, or its chunks most relevant to `query` plus a reference."""
+        max_chars = self.tool_result_tokens * CHARS_PER_TOKEN
+        if len(content) <= max_chars:
+            return content
+        reference = self.results.put(content, session_id)
+        chunks = self.results.search(reference, query, k=max_chars // 400) if query.strip() else []
+
+        shown = []
+        used = 0
+        for chunk in chunks:
+            if used + len(chunk["text"]) > max_chars:
+                break
+            shown.append(f"[chunk {chunk['position']}, offset {chunk['offset']}] {chunk['text']}")
+            used += len(chunk["text"])
+        if not shown:
+            shown.append(f"[offset 0] {content[:max_chars // 2]}")
+
+        return (f"[Large result {reference}: {len(content)} characters in "
+                f"{self.results.chunk_count(reference)} chunks; showing the parts most relevant "
+                f"to the request]\n" + "\n".join(shown) +
+                f"\n[Call fetch_result_chunks(reference=\"{reference}\", query=...) for other "
+                f"parts, or read_tool_result(reference=\"{reference}\", offset=...) to read in order]")
+
+    def compact(self, messages, summary=""):
+        """Folds old turns into the summary once `messages` exceed the budget.
+
+        Returns (messages to remove, new summary), or None if nothing needs to change.
+        """
+        if self.count(messages) <= self.token_budget:
+            return None
+        start = self.recent_start(messages)
+        if start == 0:
+            return None
+        old = messages[:start]
+        try:
+            summary = self.summarize(summary, old)
+        except Exception as e:
+            print(f"⚠️ Could not summarise old messages, keeping an excerpt instead: {e}")
+            summary = excerpt_summary(summary, old)
+        return [RemoveMessage(id=message.id) for message in old], summary
+
+    def recent_start(self, messages):
+        """Index of the first message kept verbatim: about half the budget, newest first.
+
+        Never starts on a ToolMessage, so tool results stay with the call that asked for them.
+        """
+        used = 0
+        start = len(messages)
+        while start > 0:
+            used += self.count([messages[start - 1]])
+            if used > self.token_budget // 2:
+                break
+            start -= 1
+        while start < len(messages) and isinstance(messages[start], ToolMessage):
+            start += 1
+        if start == len(messages):
+            start -= 1
+            while start > 0 and isinstance(messages[start], ToolMessage):
+                start -= 1
+        return start
+
+    @staticmethod
+    def model_messages(messages, summary=""):
+        """The messages to send to the model: the rolling summary first, then the history."""
+        if not summary:
+            return list(messages)
+        return [SystemMessage(content=f"Summary of the earlier conversation: {summary}"),
+                *messages]
+
+
+def transcript(messages, max_chars=400):
+    """Renders messages as short "role: text" lines for summarisation."""
+    lines = []
+    for message in messages:
+        text = message.content if isinstance(message.content, str) else str(message.content)
+        calls = getattr(message, "tool_calls", None)
+        if calls:
+            text += " " + ", ".join(f"{call['name']}({call['args']})" for call in calls)
+        lines.append(f"{message.type}: {' '.join(text.split())[:max_chars]}")
+    return "\n".join(lines)
+
+
+def summarize_with_model(summary, messages):
+    """Asks the plain (tool-less) model to extend the running summary."""
+    from core.ai import model
+    prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", transcript=transcript(messages))
+    return model.invoke([HumanMessage(content=prompt)],
+                        config={"tags": [SUMMARY_TAG]}).content
+
+
+def excerpt_summary(summary, messages, max_chars=2000):
+    """Fallback summary: the previous summary plus the start of each user request."""
+    requests = [message.content[:200] for message in messages
+                if isinstance(message, HumanMessage) and isinstance(message.content, str)]
+    return " | ".join(filter(None, [summary, *requests]))[-max_chars:]
+
+
+def open_checkpointer(path=CHECKPOINT_PATH):
+    """Returns a checkpointer for `path` (":memory:" keeps sessions in this process only).
+
+    Returns None when no path is configured or langgraph-checkpoint-sqlite is missing.
+    """
+    if not path:
+        return None
+    if path == ":memory:":
+        from langgraph.checkpoint.memory import MemorySaver
+        return MemorySaver()
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite is not installed; sessions will not be saved.")
+        return None
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        """SqliteSaver whose async methods run the sync ones in a worker thread."""
+
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            found = await asyncio.to_thread(
+                lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+            for item in found:
+                yield item
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+def session_config(session_id="default"):
+    """Graph config selecting the checkpointed conversation of `session_id`."""
+    return {"configurable": {"thread_id": session_id}}
+
+
+MEMORY = MemoryManager()
+
+
+def get_memory():
+    """Returns the shared memory manager."""
+    return MEMORY
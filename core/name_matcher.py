@@ -0,0 +1,155 @@
+import bisect
+import fnmatch
+import heapq
+import os
+import re
+import threading
+from collections import Counter
+
+
+MATCH_MODES = ("exact", "prefix", "glob", "fuzzy")
+GLOB_CHARS = re.compile(r"[*?]")
+GLOB_CLASS = re.compile(r"\[[^\]]*\]")
+MIN_FUZZY_SCORE = 0.3
+
+
+def trigrams(text):
+    """Returns the padded trigrams of an already lower-cased name."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def literal_runs(pattern):
+    """Returns the literal (non-wildcard) pieces of a glob pattern."""
+    return [run for run in GLOB_CHARS.split(GLOB_CLASS.sub("?", pattern)) if run]
+
+
+def stem(name):
+    """Returns a name without its extension."""
+    return os.path.splitext(name)[0]
+
+
+def score_name(query, name, mode="fuzzy"):
+    """Scores how well `name` matches `query` (0.0 = no match, 1.0 = exact).
+
+    Matching is case-insensitive except for a small bonus on exact case.
+    """
+    lowered_query = query.lower()
+    lowered = name.lower()
+
+    if lowered == lowered_query:
+        return 1.0 if name == query else 0.99
+
+    if mode == "exact":
+        return 0.0
+    if mode == "glob":
+        if not fnmatch.fnmatchcase(lowered, lowered_query):
+            return 0.0
+        literal = sum(len(run) for run in literal_runs(lowered_query))
+        return 0.5 + 0.45 * literal / max(len(lowered), 1)
+
+    if stem(lowered) == lowered_query:
+        return 0.95
+    if lowered.startswith(lowered_query):
+        return 0.7 + 0.2 * len(lowered_query) / len(lowered)
+    if mode == "prefix":
+        return 0.0
+
+    query_grams = trigrams(lowered_query)
+    name_grams = trigrams(lowered)
+    shared = len(query_grams & name_grams)
+    dice = 2 * shared / (len(query_grams) + len(name_grams))
+    if lowered_query in lowered:
+        dice = max(dice, 0.5 + 0.2 * len(lowered_query) / len(lowered))
+    return 0.7 * dice if dice >= MIN_FUZZY_SCORE else 0.0
+
+
+class TrigramIndex:
+    """In-memory index of distinct names with trigram postings and a sorted prefix table.
+
+    Names are only ever added; callers resolve hits back to live paths, so a
+    name that no longer exists on disk simply produces no results.
+    """
+
+    def __init__(self, names=()):
+        self._names = []
+        self._ids = {}
+        self._postings = {}
+        self._sorted = []
+        self._lock = threading.RLock()
+        self.add_many(names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add_many(self, names):
+        """Adds names that are not indexed yet."""
+        with self._lock:
+            new_sorted = []
+            for name in names:
+                if name in self._ids:
+                    continue
+                name_id = len(self._names)
+                lowered = name.lower()
+                self._ids[name] = name_id
+                self._names.append(name)
+                for gram in trigrams(lowered):
+                    self._postings.setdefault(gram, []).append(name_id)
+                new_sorted.append((lowered, name_id))
+
+            if len(new_sorted) > 64:
+                self._sorted = sorted(self._sorted + new_sorted)
+            else:
+                for item in new_sorted:
+                    bisect.insort(self._sorted, item)
+
+    def add(self, name):
+        """Adds a single name."""
+        self.add_many([name])
+
+    def search(self, query, mode="fuzzy", limit=10):
+        """Returns up to `limit` (name, score) pairs, best first, in a single pass."""
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{mode}', expected one of {MATCH_MODES}")
+
+        with self._lock:
+            candidates = self._candidates(query.lower(), mode)
+            scored = (
+                (score_name(query, self._names[name_id], mode), self._names[name_id])
+                for name_id in candidates
+            )
+            best = heapq.nlargest(
+                limit, (item for item in scored if item[0] > 0.0),
+                key=lambda item: (item[0], -len(item[1])))
+        return [(name, score) for score, name in best]
+
+    def _candidates(self, lowered_query, mode):
+        """Narrows the name ids worth scoring for a query."""
+        if mode in ("exact", "prefix"):
+            start = bisect.bisect_left(self._sorted, (lowered_query, -1))
+            end = bisect.bisect_left(self._sorted, (lowered_query + "\uffff", -1))
+            return [name_id for _, name_id in self._sorted[start:end]]
+
+        if mode == "glob":
+            grams = set()
+            for run in literal_runs(lowered_query):
+                if len(run) >= 3:
+                    grams |= {run[i:i + 3] for i in range(len(run) - 2)}
+            if not grams:
+                return range(len(self._names))
+            postings = sorted(
+                (self._postings.get(gram, ()) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                candidates.intersection_update(posting)
+            return candidates
+
+        # Fuzzy: any name sharing enough trigrams, plus every prefix match.
+        query_grams = trigrams(lowered_query)
+        counts = Counter()
+        for gram in query_grams:
+            counts.update(self._postings.get(gram, ()))
+        needed = max(1, int(len(query_grams) * MIN_FUZZY_SCORE / 2))
+        candidates = {name_id for name_id, count in counts.items() if count >= needed}
+        candidates.update(self._candidates(lowered_query, "prefix"))
+        return candidates
@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+PARALLEL_MIN_PAGES = int(os.getenv("ALFRED_PDF_PARALLEL_MIN_PAGES", "24"))
+PAGES_PER_TASK = int(os.getenv("ALFRED_PDF_PAGES_PER_TASK", "16"))
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+# Per worker process: the (file key, open file, reader) of the last PDF it read.
+_WORKER_READER = None
+
+
+def load_pdf_reader():
+    """Imports PyPDF2 on first use so importing this module stays cheap."""
+    from PyPDF2 import PdfReader
+    return PdfReader
+
+
+def get_pdf_pool():
+    """Returns the shared process pool for PDF extraction, starting it on first use.
+
+    Workers are started with forkserver (or spawn where that is unavailable), never
+    fork: forking a process that already runs threads and holds open clients can
+    deadlock the child.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context(method))
+        return _POOL
+
+
+def extract_pages(file_path, start, end):
+    """Extracts pages [start, end) (0-based) and returns one string per page.
+
+    Runs inside pool workers. Each worker keeps the reader of the last PDF it
+    opened, so a document is parsed once per worker rather than once per slice.
+    """
+    global _WORKER_READER
+    stat = os.stat(file_path)
+    key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+    if _WORKER_READER is None or _WORKER_READER[0] != key:
+        if _WORKER_READER is not None:
+            _WORKER_READER[1].close()
+        _WORKER_READER = None
+        file = open(file_path, 'rb')
+        try:
+            _WORKER_READER = (key, file, load_pdf_reader()(file))
+        except Exception:
+            file.close()
+            raise
+    reader = _WORKER_READER[2]
+    return [reader.pages[number].extract_text() or "" for number in range(start, end)]
+
+
+def extract_pdf_text(file_path, start_page=None, end_page=None, max_chars=None):
+    """Extracts the text of pages `start_page`..`end_page` (1-based, inclusive).
+
+    Large ranges are split into slices of PAGES_PER_TASK pages and extracted in
+    parallel; with `max_chars`, slices are consumed in order and the remaining work
+    is cancelled once enough text has been collected.
+    """
+    with open(file_path, 'rb') as file:
+        reader = load_pdf_reader()(file)
+        total = len(reader.pages)
+        start = max(1, start_page or 1) - 1
+        end = total if end_page is None else min(total, end_page)
+        if start >= end:
+            return ""
+
+        if end - start < PARALLEL_MIN_PAGES:
+            pages = []
+            collected = 0
+            for number in range(start, end):
+                text = reader.pages[number].extract_text() or ""
+                pages.append(text)
+                collected += len(text)
+                if max_chars is not None and collected >= max_chars:
+                    break
+            return truncate("".join(pages), max_chars)
+
+    pool = get_pdf_pool()
+    futures = [
+        pool.submit(extract_pages, file_path, slice_start,
+                    min(slice_start + PAGES_PER_TASK, end))
+        for slice_start in range(start, end, PAGES_PER_TASK)
+    ]
+
+    pages = []
+    collected = 0
+    try:
+        for future in futures:
+            for text in future.result():
+                pages.append(text)
+                collected += len(text)
+            if max_chars is not None and collected >= max_chars:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return truncate("".join(pages), max_chars)
+
+
+def truncate(text, max_chars):
+    """Cuts text to `max_chars` characters (None = no limit)."""
+    return text if max_chars is None else text[:max_chars]
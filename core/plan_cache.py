@@ -0,0 +1,181 @@
+import copy
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+import numpy as np
+from core.tool_registry import get_registry
+
+
+PLAN_CACHE_TTL = float(os.getenv("ALFRED_PLAN_CACHE_TTL", "3600"))
+PLAN_CACHE_SIZE = int(os.getenv("ALFRED_PLAN_CACHE_SIZE", "256"))
+
+
+class PlanCache:
+    """Two-level cache of the model's tool-call plans (never of tool results).
+
+    Level one is an exact match on the formatted prompt. Level two embeds the
+    user's text and reuses the closest cached plan above `threshold`, but only for
+    read-only plans whose arguments are all strings (or unset) that appear in the
+    new request as whole words, so "where is Batman" never replays a plan for
+    "where is Robin". Plans with a write tool, per the registry, or with numeric
+    or nested arguments only match exactly. Entries expire after
+    `ttl` seconds and the least recently used one is evicted beyond `max_entries`.
+    """
+
+    def __init__(self, embeddings=None, max_entries=256, ttl=3600.0, threshold=0.92):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(prompt_text):
+        """Returns the exact-match key of a formatted prompt."""
+        return hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+
+    def get(self, prompt_text, user_input):
+        """Returns a copy of the cached tool calls for this request, or None."""
+        now = time.monotonic()
+        key = self.key(prompt_text)
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                return fresh_ids(entry["tool_calls"])
+
+        match = self._closest(user_input)
+        with self._lock:
+            if match is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(match)
+            self.similar_hits += 1
+            return fresh_ids(self._entries[match]["tool_calls"])
+
+    def put(self, prompt_text, user_input, tool_calls):
+        """Remembers the tool calls the model chose for this request."""
+        if not tool_calls:
+            return
+        reusable = not writes_files(tool_calls) and has_only_text_arguments(tool_calls)
+        vector = self._embed(user_input) if reusable else None
+        with self._lock:
+            key = self.key(prompt_text)
+            self._entries[key] = {
+                "tool_calls": copy.deepcopy(list(tool_calls)),
+                "vector": vector,
+                "expires_at": time.monotonic() + self.ttl,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        """Returns hit/miss counters per level."""
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+    def _expire(self, now):
+        expired = [key for key, entry in self._entries.items() if entry["expires_at"] <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def _embed(self, text):
+        if self.embeddings is None:
+            return None
+        try:
+            vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        except Exception as e:
+            print(f"⚠️ Plan cache could not embed the request: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _closest(self, user_input):
+        """Returns the key of the most similar reusable entry, or None."""
+        with self._lock:
+            candidates = [(key, entry) for key, entry in self._entries.items()
+                          if entry["vector"] is not None]
+        if not candidates:
+            return None
+        vector = self._embed(user_input)
+        if vector is None:
+            return None
+
+        matrix = np.stack([entry["vector"] for _, entry in candidates])
+        scores = matrix @ vector
+        lowered = user_input.lower()
+        for index in np.argsort(-scores):
+            if scores[index] < self.threshold:
+                break
+            key, entry = candidates[index]
+            if arguments_appear_in(entry["tool_calls"], lowered):
+                return key
+        return None
+
+
+def writes_files(tool_calls):
+    """True if any call in the plan may change files: a registered write tool, or an unknown one."""
+    registry = get_registry()
+    for tool_call in tool_calls:
+        spec = registry.get(tool_call.get("name", ""))
+        if spec is None or spec.access is None or spec.access[0] == "write":
+            return True
+    return False
+
+
+def has_only_text_arguments(tool_calls):
+    """True if every argument is a string or unset, so `arguments_appear_in` can check them all."""
+    return all(value is None or isinstance(value, str)
+               for tool_call in tool_calls for value in tool_call.get("args", {}).values())
+
+
+def arguments_appear_in(tool_calls, lowered_text):
+    """True if every non-empty string argument of the plan occurs in the text as whole words."""
+    for tool_call in tool_calls:
+        for value in tool_call.get("args", {}).values():
+            if isinstance(value, str) and value and not re.search(
+                    r"(?<!\w)" + re.escape(value.lower()) + r"(?!\w)", lowered_text):
+                return False
+    return True
+
+
+def fresh_ids(tool_calls):
+    """Copies cached tool calls with new ids so replies can still be matched to calls."""
+    copied = copy.deepcopy(tool_calls)
+    for tool_call in copied:
+        tool_call["id"] = f"cached_{uuid.uuid4().hex[:12]}"
+    return copied
+
+
+PLAN_CACHE = None
+
+
+def get_plan_cache():
+    """Returns the shared plan cache, reusing the tool-retrieval embeddings."""
+    global PLAN_CACHE
+    if PLAN_CACHE is None:
+        from core.tools import VECTOR_BACKEND, get_embeddings
+        # Hashed bag-of-words vectors score lower than model embeddings for a rephrasing.
+        threshold = float(os.getenv(
+            "ALFRED_PLAN_CACHE_THRESHOLD", "0.85" if VECTOR_BACKEND == "local" else "0.92"))
+        PLAN_CACHE = PlanCache(get_embeddings(), max_entries=PLAN_CACHE_SIZE,
+                               ttl=PLAN_CACHE_TTL, threshold=threshold)
+    return PLAN_CACHE
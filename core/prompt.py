@@ -11,6 +11,8 @@ system_template = """
         - If the user asks to **locate a file**, always use **search_for_file()**.
         - If the user asks to **locate a folder**, always use **search_for_folder()**.
         - If the user asks to **open a file or folder**, use **open_file_or_folder()**.
+        - If the user asks to **create several files or folders, or write or append to several files**, use **apply_file_operations()** once with every operation instead of one call per item.
+        - If the exact name, case or extension is uncertain, use **find_matching_targets()** once instead of several exact searches.
         - If the user asks to **read, summarize, or manipulate a file**, ensure the tool call is structured properly.
         - If unsure, **always attempt a tool call before responding**.
     </behavior>
@@ -0,0 +1,111 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+
+def chunk_text(text, chunk_chars=1200, overlap=200):
+    """Splits text into overlapping chunks, preferring whitespace boundaries.
+
+    Returns a list of (offset, chunk) pairs.
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            space = text.rfind(" ", start + chunk_chars // 2, end)
+            end = space if space > 0 else end
+        chunks.append((start, text[start:end]))
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+class ResultIndex:
+    """Per-session store of large tool results, each chunked into a local vector index.
+
+    Only the chunks relevant to a question are shown to the model; the rest stay
+    here behind a reference. Embeddings are hashed locally, so indexing a result
+    costs no API calls. Each session keeps at most `max_results` results, and at
+    most `max_sessions` sessions are kept (both least recently used first).
+    """
+
+    def __init__(self, chunk_chars=1200, overlap=200, max_results=32, embeddings=None,
+                 max_sessions=64):
+        self.chunk_chars = chunk_chars
+        self.overlap = overlap
+        self.max_results = max_results
+        self.max_sessions = max_sessions
+        self.embeddings = embeddings
+        self._sessions = OrderedDict()
+        self._owners = {}
+        self._lock = threading.Lock()
+
+    def put(self, content, session_id="default"):
+        """Stores and indexes `content`; returns its reference."""
+        from core.local_vectors import HashingEmbeddings, NumpyVectorStore  # NumPy, on first use
+
+        reference = f"result_{uuid.uuid4().hex[:12]}"
+        chunks = chunk_text(content, self.chunk_chars, self.overlap)
+        if self.embeddings is None:
+            self.embeddings = HashingEmbeddings()
+        store = NumpyVectorStore(self.embeddings)
+        store.add_texts([chunk for _, chunk in chunks],
+                        [{"offset": offset, "position": i} for i, (offset, _) in enumerate(chunks)])
+
+        with self._lock:
+            results = self._sessions.setdefault(session_id, OrderedDict())
+            self._sessions.move_to_end(session_id)
+            results[reference] = {"content": content, "store": store, "chunks": len(chunks)}
+            self._owners[reference] = session_id
+            while len(results) > self.max_results:
+                evicted, _ = results.popitem(last=False)
+                del self._owners[evicted]
+            while len(self._sessions) > self.max_sessions:
+                _, evicted_results = self._sessions.popitem(last=False)
+                for evicted in evicted_results:
+                    del self._owners[evicted]
+        return reference
+
+    def _entry(self, reference):
+        with self._lock:
+            session_id = self._owners.get(reference)
+            if session_id is None:
+                return None
+            self._sessions.move_to_end(session_id)
+            results = self._sessions[session_id]
+            results.move_to_end(reference)
+            return results[reference]
+
+    def get(self, reference):
+        """Returns the full result for `reference`, or None if it was evicted."""
+        entry = self._entry(reference)
+        return entry["content"] if entry else None
+
+    def chunk_count(self, reference):
+        """Returns how many chunks `reference` was split into (0 if unknown)."""
+        entry = self._entry(reference)
+        return entry["chunks"] if entry else 0
+
+    def search(self, reference, query, k=3, skip=()):
+        """Returns up to `k` {"position", "offset", "text"} chunks most relevant to `query`.
+
+        Chunks whose position is in `skip` are left out, so repeated calls can page
+        through a result. Returns None if the reference is unknown.
+        """
+        entry = self._entry(reference)
+        if entry is None:
+            return None
+        hits = entry["store"].similarity_search_with_score(query, k=k + len(skip))
+        chunks = [{"position": document.metadata["position"],
+                   "offset": document.metadata["offset"],
+                   "text": document.page_content}
+                  for document, _ in hits if document.metadata["position"] not in skip]
+        return chunks[:k]
+
+    def drop_session(self, session_id):
+        """Forgets every result stored for `session_id`."""
+        with self._lock:
+            for reference in self._sessions.pop(session_id, {}):
+                del self._owners[reference]
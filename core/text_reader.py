@@ -0,0 +1,102 @@
+import codecs
+import mmap
+import os
+from contextlib import contextmanager
+
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+READ_MODES = ("head", "tail", "lines", "bytes")
+
+
+@contextmanager
+def mapped(file_path):
+    """Memory-maps a file read-only; yields an empty bytes object for empty files."""
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            yield view
+
+
+def decode(data):
+    """Decodes bytes as UTF-8, replacing anything that is not valid."""
+    return data.decode("utf-8", errors="replace")
+
+
+def iter_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, start=0, end=None):
+    """Yields the text between byte offsets `start` and `end` in chunks.
+
+    Multi-byte characters split across a chunk boundary are carried over, so
+    joining the chunks gives the same text as decoding the range at once.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with mapped(file_path) as view:
+        end = len(view) if end is None else min(end, len(view))
+        for offset in range(start, end, chunk_size):
+            text = decoder.decode(view[offset:min(offset + chunk_size, end)])
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def read_bytes(file_path, start=0, end=None, max_bytes=DEFAULT_CHUNK_SIZE):
+    """Returns the text between byte offsets `start` and `end`, capped at `max_bytes`."""
+    with mapped(file_path) as view:
+        end = len(view) if end is None else min(end, len(view))
+        return decode(view[start:min(end, start + max_bytes)])
+
+
+def head(file_path, lines=50, max_bytes=DEFAULT_CHUNK_SIZE):
+    """Returns the first `lines` lines, without reading past `max_bytes`."""
+    with mapped(file_path) as view:
+        limit = min(len(view), max_bytes)
+        position = 0
+        for _ in range(lines):
+            newline = view.find(b"\n", position, limit)
+            if newline < 0:
+                position = limit
+                break
+            position = newline + 1
+        return decode(view[:position])
+
+
+def tail(file_path, lines=50, max_bytes=DEFAULT_CHUNK_SIZE):
+    """Returns the last `lines` lines, without reading more than `max_bytes`."""
+    with mapped(file_path) as view:
+        size = len(view)
+        floor = max(0, size - max_bytes)
+        # A trailing newline ends the last line rather than starting an empty one.
+        position = size - 1 if size and view[size - 1] == ord("\n") else size
+        for _ in range(lines):
+            newline = view.rfind(b"\n", floor, position)
+            if newline < 0:
+                return decode(view[floor:size])
+            position = newline
+        return decode(view[position + 1:size])
+
+
+def read_lines(file_path, start_line=1, end_line=None, max_bytes=DEFAULT_CHUNK_SIZE):
+    """Returns lines `start_line`..`end_line` (1-based, inclusive), capped at `max_bytes`."""
+    with mapped(file_path) as view:
+        size = len(view)
+        position = 0
+        for _ in range(start_line - 1):
+            newline = view.find(b"\n", position)
+            if newline < 0:
+                return ""
+            position = newline + 1
+
+        start = position
+        limit = min(size, start + max_bytes)
+        if end_line is None:
+            return decode(view[start:limit])
+        for _ in range(end_line - start_line + 1):
+            newline = view.find(b"\n", position, limit)
+            if newline < 0:
+                position = limit
+                break
+            position = newline + 1
+        return decode(view[start:position])
@@ -1,83 +1,145 @@
 import sys
 import os
 import json
-from core.command_handler import get_tool_function
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.tool_registry import fix_ai_path, get_registry
+from core.tracing import DEBUG, INFO, enabled, log, span
 
 sys.path.insert(0, os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..")))
 
+TOOL_WORKERS = int(os.getenv("ALFRED_TOOL_WORKERS", "8"))
 
-def fix_ai_path(path):
-    """Fixes AI's incorrect path mapping to absolute paths."""
-    if path.lower() in ["desktop", "/desktop"]:
-        return os.path.join(os.path.expanduser("~"), "Desktop")
-    elif path.lower() in ["documents", "/documents"]:
-        return os.path.join(os.path.expanduser("~"), "Documents")
-    return os.path.expanduser(path)
 
+def tool_access(spec, args):
+    """Returns ("read" | "write", absolute paths) for a call, or None if unknown."""
+    try:
+        access = spec.paths(args)
+        if access is None:
+            return None
+        kind, paths = access
+        return kind, [os.path.abspath(fix_ai_path(path)) for path in paths if path]
+    except (TypeError, AttributeError):
+        return None
 
-def validate_tool_call(tool_name, args):
-    """Validates the tool call before execution."""
-    expected_function = get_tool_function(tool_name)
 
-    if expected_function is None:
-        print(f"⚠️ Error: No tool function found for '{tool_name}'")
+def paths_overlap(first, second):
+    """True if one path is the other or lies inside it."""
+    try:
+        return os.path.commonpath([first, second]) in (first, second)
+    except ValueError:
         return False
 
-    expected_args = expected_function.args_schema.__annotations__.keys()
-    received_args = args.keys()
 
-    missing_args = expected_args - received_args
-    extra_args = received_args - expected_args
+def conflicts(earlier, later):
+    """True if `later` must wait for `earlier`: a write overlaps the other call's paths.
 
-    if missing_args:
-        print(
-            f" Error: Missing required arguments {missing_args} for '{tool_name}'")
+    Calls whose access is unknown conflict with everything, which keeps them in order.
+    """
+    if earlier is None or later is None:
+        return True
+    if earlier[0] == "read" and later[0] == "read":
         return False
-    if extra_args:
-        print(
-            f"⚠️ Warning: Extra arguments {extra_args} provided to '{tool_name}'")
-
-    return True
-
-
-def execute_tool_call(tool_calls):
-    """Processes AI responses and executes tool calls after validation."""
-    print(f"\n🔧 Received tool calls: {json.dumps(tool_calls, indent=2)}")
-
-    results = []
-    for tool_call in tool_calls:
+    return any(paths_overlap(a, b) for a in earlier[1] for b in later[1])
+
+
+def prepare_tool_call(tool_call):
+    """Looks up, normalises and validates one tool call.
+
+    Returns (tool name, spec, args, error); the name is canonical once the tool is found.
+    """
+    tool_name = tool_call.get("name", "unknown")
+    raw_args = tool_call.get("args", {})
+
+    if enabled(DEBUG):
+        print(f"\n📜 Raw tool arguments: {raw_args}")
+
+    with span("tools.validate", tool=tool_name):
+        spec = get_registry().get(tool_name)
+        if spec is None:
+            log(INFO, f"⚠️ Error: No tool function found for '{tool_name}'")
+            return tool_name, None, raw_args, f"No tool named '{tool_name}'; not executed."
+        args = spec.normalise(raw_args)
+        error = spec.check(args)
+
+    if enabled(DEBUG):
+        print(f"\n🔍 Validated tool call: {spec.name} with args {args}")
+    if error:
+        log(INFO, f"\n❌ Tool call validation failed: {error}. {spec.name} not executed.")
+        return spec.name, spec, args, f"Tool call validation failed ({error}); not executed."
+    return spec.name, spec, args, None
+
+
+def run_tool_call(spec, args):
+    """Runs one validated tool call and returns its result entry."""
+    if enabled(DEBUG):
+        print(f"\n🚀 Running tool: {spec.name} with args {args}")
+    else:
+        log(INFO, f"\n🚀 Running tool: {spec.name}")
+    with span(f"tool.{spec.name}") as current:
         try:
-            tool_name = tool_call["name"]
-            raw_args = tool_call["args"]
-
-            print(f"\n📜 Raw tool arguments: {raw_args}")
+            result = spec.invoke(args)
+            if enabled(DEBUG):
+                print(f"\n✅ Tool Execution Result: {result}")
+            return {"tool": spec.name, "result": result}
+        except Exception as e:
+            if current is not None:
+                current.error = type(e).__name__
+            log(INFO, f"\n❌ Error processing tool call: {e}")
+            return {"tool": spec.name, "error": str(e)}
 
-            # 🔥 FIX AI-GENERATED ARGUMENTS BEFORE EXECUTION
-            if tool_name == "Search_for_Folder":
-                args = {"search_path": raw_args.get("param", "/")}
-            else:
-                args = raw_args  # Default case
 
-            print(f"\n🔍 Validating tool call: {tool_name} with args {args}")
+def execute_tool_call(tool_calls):
+    """Processes AI responses and executes tool calls after validation.
 
-            if not validate_tool_call(tool_name, args):
-                print(
-                    f"\n❌ Tool call validation failed: {tool_name} not executed.")
-                continue
+    Independent calls run concurrently; a call waits only for earlier calls it
+    conflicts with (a write to an overlapping path), so writes to the same path
+    keep their order. Results are returned in `tool_calls` order, one per call.
+    """
+    with span("tools.execute", calls=len(tool_calls)):
+        return run_tool_calls(tool_calls)
 
-            print(f"\n🚀 Running tool: {tool_name} with args {args}")
 
-            tool_function = get_tool_function(tool_name)
-            if tool_function:
-                result = tool_function.invoke(args)
-                print(f"\n✅ Tool Execution Result: {result}")
-                results.append({"tool": tool_name, "result": result})
-            else:
-                print(f"\n❌ Tool function '{tool_name}' not found!")
+def run_tool_calls(tool_calls):
+    """The body of `execute_tool_call`, timed as one "tools.execute" span."""
+    if enabled(DEBUG):
+        print(f"\n🔧 Received tool calls: {json.dumps(tool_calls, indent=2)}")
 
+    prepared = []
+    for tool_call in tool_calls:
+        try:
+            prepared.append(prepare_tool_call(tool_call))
         except Exception as e:
-            print(f"\n❌ Error processing tool call: {e}")
-            results.append({"tool": tool_name, "error": str(e)})
+            log(INFO, f"\n❌ Error processing tool call: {e}")
+            prepared.append((str(tool_call.get("name", "unknown")), None, {}, str(e)))
+
+    runnable = [i for i, (_, _, _, error) in enumerate(prepared) if error is None]
+    results = [{"tool": tool_name, "error": error} if error else None
+               for tool_name, _, _, error in prepared]
+
+    if len(runnable) <= 1 or TOOL_WORKERS <= 1:
+        for i in runnable:
+            results[i] = run_tool_call(*prepared[i][1:3])
+        return results  # ✅ Now returns structured results
+
+    accesses = {i: tool_access(*prepared[i][1:3]) for i in runnable}
+    futures = {}
+
+    def run_after(i, dependencies):
+        wait(dependencies)
+        return run_tool_call(*prepared[i][1:3])
+
+    # Calls are submitted in order and only wait on earlier submissions, which a
+    # FIFO pool has already started, so waiting inside a worker cannot deadlock.
+    with ThreadPoolExecutor(max_workers=min(TOOL_WORKERS, len(runnable)),
+                            thread_name_prefix="alfred-tool") as pool:
+        for position, i in enumerate(runnable):
+            dependencies = [futures[j] for j in runnable[:position]
+                            if conflicts(accesses[j], accesses[i])]
+            # Each call runs in a copy of this context, so its span nests under ours.
+            futures[i] = pool.submit(contextvars.copy_context().run, run_after, i, dependencies)
+        for i, future in futures.items():
+            results[i] = future.result()
 
     return results  # ✅ Now returns structured results
@@ -0,0 +1,140 @@
+"""The one registry of Alfred's tools, filled in as `core.tools` registers them.
+
+Every tool is reachable by its canonical name (the function name, which is also
+the name the model sees) and by aliases (its display name, and older or
+prompt-level names such as `Search_for_Folder`). All of them resolve with a
+single dict lookup to a `ToolSpec`: the tool, its argument check compiled from
+the schema once, its argument normalisers and how it touches the filesystem.
+"""
+import importlib
+import os
+import re
+from core.tracing import INFO, log
+
+PATH_ARGUMENTS = ("path", "file_path", "search_path")
+
+
+def fix_ai_path(path):
+    """Fixes AI's incorrect path mapping to absolute paths."""
+    if path.lower() in ["desktop", "/desktop"]:
+        return os.path.join(os.path.expanduser("~"), "Desktop")
+    elif path.lower() in ["documents", "/documents"]:
+        return os.path.join(os.path.expanduser("~"), "Documents")
+    return os.path.expanduser(path)
+
+
+def name_forms(name):
+    """The spellings a name is looked up under: as given, snake_case and lowercase."""
+    underscored = re.sub(r"[^\w\s]", "", name).strip().replace(" ", "_")
+    return {name, name.lower(), underscored, underscored.lower()}
+
+
+def schema_fields(tool):
+    """Returns {argument name: (required, default)} from a tool's argument schema."""
+    schema = tool.args_schema
+    fields = getattr(schema, "model_fields", None) or getattr(schema, "__fields__", {})
+    described = {}
+    for name, field in fields.items():
+        is_required = getattr(field, "is_required", None)
+        required = is_required() if callable(is_required) else getattr(field, "required", False)
+        described[name] = (required, getattr(field, "default", None))
+    return described
+
+
+class ToolSpec:
+    """A registered tool with everything dispatch needs, worked out at registration."""
+
+    __slots__ = ("name", "display_name", "description", "tool", "invoke", "fields",
+                 "required", "allowed", "normalisers", "access")
+
+    def __init__(self, tool, display_name, description, normalisers=(), access=None):
+        self.name = tool.name
+        self.display_name = display_name or tool.name
+        self.description = description or tool.description
+        self.tool = tool
+        self.invoke = tool.invoke
+        self.fields = schema_fields(tool)
+        self.required = frozenset(name for name, (required, _) in self.fields.items() if required)
+        self.allowed = frozenset(self.fields)
+        self.normalisers = tuple(normalisers)
+        self.access = access
+
+    def normalise(self, args):
+        """Returns `args` rewritten into the form the tool expects.
+
+        A legacy single `param` argument becomes the tool's required argument, the
+        tool's own normalisers run, unknown arguments are dropped (with a warning)
+        and path arguments go through `fix_ai_path`.
+        """
+        args = dict(args or {})
+        if "param" in args and "param" not in self.allowed and len(self.required) == 1:
+            args.setdefault(next(iter(self.required)), args.pop("param"))
+        for normaliser in self.normalisers:
+            args = normaliser(args)
+
+        unknown = args.keys() - self.allowed
+        if unknown:
+            log(INFO, f"⚠️ Warning: Extra arguments {unknown} provided to '{self.name}'; ignoring them")
+            args = {name: value for name, value in args.items() if name in self.allowed}
+        for name in PATH_ARGUMENTS:
+            if isinstance(args.get(name), str):
+                args[name] = fix_ai_path(args[name])
+        return args
+
+    def check(self, args):
+        """Returns why the tool cannot run with `args`, or None if it can."""
+        missing = self.required - args.keys()
+        if missing:
+            return f"Missing required arguments {sorted(missing)} for '{self.name}'"
+        return None
+
+    def paths(self, args):
+        """Returns ("read" | "write", paths) for a call, or None if undeclared."""
+        if self.access is None:
+            return None
+        kind, paths = self.access
+        return kind, paths(args)
+
+
+class ToolRegistry:
+    """Canonical and alias names → `ToolSpec`, for single-lookup dispatch."""
+
+    def __init__(self):
+        self.specs = {}
+        self._lookup = {}
+
+    def register(self, tool, display_name=None, description=None, aliases=(), normalisers=(),
+                 access=None):
+        """Adds `tool` under its own name, `display_name` and `aliases`; returns its spec."""
+        spec = ToolSpec(tool, display_name, description, normalisers, access)
+        self.specs[spec.name] = spec
+        for name in (spec.name, spec.display_name, *aliases):
+            for form in name_forms(name):
+                self._lookup[form] = spec
+        return spec
+
+    def get(self, name):
+        """Returns the spec registered under `name` (or its lowercase), or None."""
+        spec = self._lookup.get(name)
+        if spec is None and isinstance(name, str):
+            spec = self._lookup.get(name.lower())
+        return spec
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __iter__(self):
+        return iter(self.specs.values())
+
+    def __len__(self):
+        return len(self.specs)
+
+
+REGISTRY = ToolRegistry()
+
+
+def get_registry():
+    """Returns the registry, importing `core.tools` (which registers every tool) on first use."""
+    if not REGISTRY.specs:
+        importlib.import_module("core.tools")
+    return REGISTRY
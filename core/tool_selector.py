@@ -0,0 +1,31 @@
+import os
+from core.tools import VECTOR_BACKEND, get_tool_registry, get_vector_store
+
+
+TOOL_TOP_K = int(os.getenv("ALFRED_TOOL_TOP_K", "4"))
+# Hashed bag-of-words vectors score lower than model embeddings for the same match.
+MIN_TOOL_SCORE = float(os.getenv(
+    "ALFRED_TOOL_MIN_SCORE", "0.15" if VECTOR_BACKEND == "local" else "0.3"))
+
+
+def select_tools(user_input, k=TOOL_TOP_K, min_score=MIN_TOOL_SCORE):
+    """Picks the `k` registered tools whose descriptions best match the request.
+
+    Returns None when retrieval is not confident enough (best score below
+    `min_score`) or fails, meaning the caller should bind every tool.
+    """
+    registry = get_tool_registry()
+    if not user_input or k >= len(registry):
+        return None
+
+    try:
+        hits = get_vector_store().similarity_search_with_score(user_input, k=k)
+    except Exception as e:
+        print(f"⚠️ Tool retrieval failed, binding all tools: {e}")
+        return None
+
+    if not hits or hits[0][1] < min_score:
+        return None
+
+    selected = [registry[document.id] for document, _ in hits if document.id in registry]
+    return selected or None
@@ -1,21 +1,25 @@
 import os
 import subprocess
 import platform
-import re
-import uuid
-import PyPDF2
-import docx
-from concurrent.futures import ThreadPoolExecutor
-from multiprocessing import Pool, Manager, cpu_count
-from langchain_core.tools import StructuredTool, tool
+import heapq
+import time
+import sqlite3
+from typing import List, Literal, Optional
+from langchain_core.tools import tool
 from langchain_core.documents import Document
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_openai import OpenAIEmbeddings
+from pydantic import BaseModel
 from dotenv import load_dotenv
-try:
-    from pydantic.v1 import BaseModel, Field
-except ImportError:
-    from pydantic import BaseModel, Field
+from core.content_index import ContentIndex
+from core.document_cache import DocumentCache
+from core.file_batch import apply_operations
+from core.memory import get_memory
+from core.file_index import FileIndex
+from core.fs_watcher import start_watcher
+from core.name_matcher import MATCH_MODES, score_name
+from core.pdf_extract import extract_pdf_text, truncate
+from core import text_reader
+from core.tool_registry import REGISTRY, fix_ai_path
+from core.walker import ParallelWalker
 
 load_dotenv()
 
@@ -24,54 +28,112 @@ api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     raise ValueError("Error: OPENAI_API_KEY is not set in .env!")
 
-embeddings = OpenAIEmbeddings(
-    openai_api_key=api_key, model="text-embedding-3-large"
+EMBEDDING_CACHE_DIR = os.getenv(
+    "ALFRED_EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".alfred", "embeddings")
 )
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("ALFRED_EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
 
-EXCLUDED_FOLDERS = {
-    "node_modules", ".git", ".venv", "venv", "__pycache__", ".DS_Store",
-    "Library", "System", "Applications", "usr", "bin", "opt", "var", ".Trash"
-}
+VECTOR_BACKEND = os.getenv("ALFRED_VECTOR_BACKEND", "openai").lower()
 
 
-class ToolArgs(BaseModel):
-    """Schema to ensure argument validation works correctly."""
-    param: str = Field(..., description="Input parameter")
+def create_embeddings(backend=VECTOR_BACKEND):
+    """Builds the embeddings client for the configured backend ("openai" or "local")."""
+    if backend == "local":
+        from core.local_vectors import HashingEmbeddings
+        return HashingEmbeddings()
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        from core.embedding_cache import CachedEmbeddings
+        return CachedEmbeddings(
+            OpenAIEmbeddings(openai_api_key=api_key, model="text-embedding-3-large"),
+            EMBEDDING_CACHE_DIR,
+            max_entries=EMBEDDING_CACHE_MAX_ENTRIES
+        )
+    raise ValueError(f"Error: unknown ALFRED_VECTOR_BACKEND '{backend}' (use openai or local)")
 
 
-def create_tool(name: str, description: str, func):
-    """Dynamically creates a StructuredTool, ensuring compatibility with Pydantic v1 & v2."""
-    formatted_name = re.sub(r"[^\w\s]", "", name).replace(" ", "_")
+EMBEDDINGS = None
 
-    return StructuredTool.from_function(
-        func, name=formatted_name, description=description, args_schema=ToolArgs
-    )
 
+def get_embeddings():
+    """Returns the shared embeddings client, building it on first use."""
+    global EMBEDDINGS
+    if EMBEDDINGS is None:
+        EMBEDDINGS = create_embeddings()
+    return EMBEDDINGS
 
-TOOL_REGISTRY = {}
 
+def __getattr__(name):
+    # `core.tools.embeddings` stays importable without building the client at import time.
+    if name == "embeddings":
+        return get_embeddings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def register_tool(name: str, description: str, func):
-    """Registers a tool dynamically with an embedding."""
-    tool_id = str(uuid.uuid4())
-    TOOL_REGISTRY[tool_id] = create_tool(name, description, func)
-    return tool_id
+
+EXCLUDED_FOLDERS = {
+    "node_modules", ".git", ".venv", "venv", "__pycache__", ".DS_Store",
+    "Library", "System", "Applications", "usr", "bin", "opt", "var", ".Trash"
+}
+
+USE_FILE_INDEX = os.getenv("ALFRED_FILE_INDEX", "1") != "0"
+FILE_INDEX_PATH = os.getenv(
+    "ALFRED_FILE_INDEX_PATH",
+    os.path.join(os.path.expanduser("~"), ".alfred", "file_index.db")
+)
+FILE_INDEX_MAX_AGE = float(os.getenv("ALFRED_FILE_INDEX_MAX_AGE", "30"))
+WATCH_ROOTS = [os.path.expanduser(root) for root in
+               os.getenv("ALFRED_WATCH_ROOTS", "").split(os.pathsep) if root]
+WATCH_INTERVAL = float(os.getenv("ALFRED_WATCH_INTERVAL", "5"))
+OPEN_TIME_BUDGET = float(os.getenv("ALFRED_OPEN_TIME_BUDGET", "10"))
+SEARCH_TIME_BUDGET = float(os.getenv("ALFRED_SEARCH_TIME_BUDGET", "30"))
+# At most this long (and half the search budget) is spent bringing the index up to
+# date before a search falls back to a live walk; the update then finishes in the background.
+FILE_INDEX_WAIT = float(os.getenv("ALFRED_FILE_INDEX_WAIT", "2"))
+MAX_READ_BYTES = int(os.getenv("ALFRED_MAX_READ_BYTES", str(1024 * 1024)))
+CONTENT_INDEX_PATH = os.getenv(
+    "ALFRED_CONTENT_INDEX_PATH",
+    os.path.join(os.path.expanduser("~"), ".alfred", "content_index.db")
+)
+CONTENT_INDEX_MAX_AGE = float(os.getenv("ALFRED_CONTENT_INDEX_MAX_AGE", "300"))
+CONTENT_INDEX_MAX_CHARS = int(os.getenv("ALFRED_CONTENT_INDEX_MAX_CHARS", "2000000"))
+DOCUMENT_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+DOC_CACHE_MEMORY_BYTES = int(float(os.getenv("ALFRED_DOC_CACHE_MB", "64")) * 1024 * 1024)
+DOC_CACHE_DIR = os.getenv(
+    "ALFRED_DOC_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".alfred", "doc_cache")
+)
+DOC_CACHE_DISK_BYTES = int(float(os.getenv("ALFRED_DOC_CACHE_DISK_MB", "512")) * 1024 * 1024)
+
+WALKER = ParallelWalker(EXCLUDED_FOLDERS)
+
+
+def register_tool(name: str, description: str, func, access=None, aliases=(), normalisers=()):
+    """Registers a tool under its function name, `name` and `aliases`.
+
+    `description` is embedded for tool retrieval. `access` is ("read" | "write",
+    args -> paths) so independent calls can run concurrently, and `normalisers`
+    rewrite arguments before validation. Returns the tool's canonical name.
+    """
+    return REGISTRY.register(func, name, description, aliases, normalisers, access).name
 
 
 def get_tool_registry():
-    """Returns the tool registry."""
-    return TOOL_REGISTRY
+    """Returns {canonical name: tool} for every registered tool."""
+    return {spec.name: spec.tool for spec in REGISTRY}
 
 
 def initialize_vector_store():
     """Initializes a vector store with tool descriptions."""
+    from core.local_vectors import NumpyVectorStore
     tool_documents = [
-        Document(page_content=tool.description, id=tool_id,
-                 metadata={"tool_name": tool.name})
-        for tool_id, tool in TOOL_REGISTRY.items()
+        Document(page_content=spec.description, id=spec.name,
+                 metadata={"tool_name": spec.name})
+        for spec in REGISTRY
     ]
 
-    vector_store = InMemoryVectorStore(embedding=embeddings)
+    vector_store = NumpyVectorStore(embedding=get_embeddings())
     vector_store.add_documents(tool_documents)
 
     return vector_store
@@ -80,6 +142,60 @@ def initialize_vector_store():
 VECTOR_STORE = None
 
 
+def get_vector_store():
+    """Returns the tool-description vector store, building it on first use."""
+    global VECTOR_STORE
+    if VECTOR_STORE is None:
+        VECTOR_STORE = initialize_vector_store()
+    return VECTOR_STORE
+
+
+FILE_INDEX = None
+FILE_WATCHER = None
+CONTENT_INDEX = None
+DOCUMENT_CACHE = None
+
+
+def get_file_index():
+    """Returns the shared on-disk filename index, opening it on first use."""
+    global FILE_INDEX
+    if FILE_INDEX is None:
+        FILE_INDEX = FileIndex(
+            FILE_INDEX_PATH, EXCLUDED_FOLDERS, max_age=FILE_INDEX_MAX_AGE,
+            walker=WALKER)
+        if WATCH_ROOTS:
+            start_file_watcher(WATCH_ROOTS)
+    return FILE_INDEX
+
+
+def get_content_index():
+    """Returns the shared full-text index of document contents, opening it on first use."""
+    global CONTENT_INDEX
+    if CONTENT_INDEX is None:
+        CONTENT_INDEX = ContentIndex(
+            CONTENT_INDEX_PATH, list_document_files, extract_indexable_text,
+            max_chars=CONTENT_INDEX_MAX_CHARS)
+    return CONTENT_INDEX
+
+
+def get_document_cache():
+    """Returns the shared cache of extracted document text, creating it on first use."""
+    global DOCUMENT_CACHE
+    if DOCUMENT_CACHE is None:
+        DOCUMENT_CACHE = DocumentCache(
+            max_memory_bytes=DOC_CACHE_MEMORY_BYTES, disk_dir=DOC_CACHE_DIR,
+            max_disk_bytes=DOC_CACHE_DISK_BYTES)
+    return DOCUMENT_CACHE
+
+
+def start_file_watcher(roots):
+    """Starts a background watcher that keeps the filename index current for `roots`."""
+    global FILE_WATCHER
+    if FILE_WATCHER is None:
+        FILE_WATCHER = start_watcher(get_file_index(), roots, WATCH_INTERVAL)
+    return FILE_WATCHER
+
+
 @tool
 def resolve_path(path: str) -> str:
     """Resolves a user-provided path to its absolute system path."""
@@ -91,7 +207,8 @@ def resolve_path(path: str) -> str:
 
 
 register_tool("Resolve Path",
-              "Resolves relative paths to absolute paths.", resolve_path)
+              "Resolves relative paths to absolute paths.", resolve_path,
+              access=("read", lambda args: []))
 
 
 @tool
@@ -100,13 +217,16 @@ def create_folder(folder_name: str, path: str = ".") -> str:
     full_path = os.path.join(resolve_path(path), folder_name)
     try:
         os.makedirs(full_path, exist_ok=True)
+        record_created_path(full_path)
         return f"Folder '{folder_name}' created at {full_path}."
     except Exception as e:
         return f"Error creating folder '{folder_name}': {e}"
 
 
 register_tool("Create Folder",
-              "Creates a folder at a specified location.", create_folder)
+              "Creates a folder at a specified location.", create_folder,
+              access=("write", lambda args: [os.path.join(args.get("path") or ".",
+                                                         args.get("folder_name", ""))]))
 
 
 @tool
@@ -116,13 +236,16 @@ def create_file(file_name: str, path: str = ".") -> str:
     try:
         with open(full_path, 'w') as file:
             file.write("")
+        record_created_path(full_path)
         return f"File '{file_name}' created at {full_path}."
     except Exception as e:
         return f"Error creating file '{file_name}': {e}"
 
 
 register_tool("Create File",
-              "Creates a new file at a given path.", create_file)
+              "Creates a new file at a given path.", create_file,
+              access=("write", lambda args: [os.path.join(args.get("path") or ".",
+                                                         args.get("file_name", ""))]))
 
 
 @tool
@@ -135,27 +258,34 @@ def list_files_and_folders(path: str = ".") -> list:
 
 
 register_tool("List Files and Folders",
-              "Lists all files and directories in a path.", list_files_and_folders)
+              "Lists all files and directories in a path.", list_files_and_folders,
+              access=("read", lambda args: [args.get("path") or "."]))
 
 
 @tool
-def read_file_content(file_path: str) -> str:
-    """Reads the content of `.txt`, `.pdf`, and `.docx` files."""
+def read_file_content(file_path: str, start_page: Optional[int] = None, end_page: Optional[int] = None,
+                      max_chars: Optional[int] = None) -> str:
+    """Reads the content of `.txt`, `.pdf`, and `.docx` files.
+
+    For PDFs, `start_page`/`end_page` (1-based, inclusive) read only part of the
+    document. `max_chars` returns at most that many characters. Text files larger
+    than ALFRED_MAX_READ_BYTES are truncated; use `read_file_range` to page on.
+    """
     file_extension = os.path.splitext(file_path)[1].lower()
     content = ""
 
     try:
         if file_extension == ".txt":
-            with open(file_path, 'r') as file:
-                content = file.read()
-        elif file_extension == ".pdf":
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                for page in reader.pages:
-                    content += page.extract_text() or ""
-        elif file_extension == ".docx":
-            doc = docx.Document(file_path)
-            content = "\n".join([para.text for para in doc.paragraphs])
+            content = read_text_file(file_path, max_chars)
+        elif file_extension == ".pdf" and any(
+                value is not None for value in (start_page, end_page, max_chars)):
+            content = get_document_cache().get_or_extract(
+                file_path,
+                lambda path: extract_pdf_text(path, start_page, end_page, max_chars),
+                "pages", start_page, end_page, max_chars)
+        elif file_extension in (".pdf", ".docx"):
+            content = truncate(
+                get_document_cache().get_or_extract(file_path, extract_document_text), max_chars)
         else:
             return f"Unsupported file format: {file_extension}"
     except Exception as e:
@@ -165,7 +295,36 @@ def read_file_content(file_path: str) -> str:
 
 
 register_tool("Read File Content",
-              "Reads content from .txt, .pdf, and .docx files.", read_file_content)
+              "Reads content from .txt, .pdf, and .docx files.", read_file_content,
+              access=("read", lambda args: [args.get("file_path")]))
+
+
+@tool
+def read_file_range(file_path: str, mode: str = "head", lines: int = 50,
+                    start: Optional[int] = None, end: Optional[int] = None) -> str:
+    """Reads part of a large text file without loading all of it.
+
+    `mode` is "head" or "tail" (first/last `lines` lines), "lines" (lines
+    `start`..`end`, 1-based, inclusive) or "bytes" (byte offsets `start`..`end`).
+    """
+    resolved_path = resolve_path(file_path)
+    try:
+        if mode == "head":
+            return text_reader.head(resolved_path, lines, MAX_READ_BYTES)
+        elif mode == "tail":
+            return text_reader.tail(resolved_path, lines, MAX_READ_BYTES)
+        elif mode == "lines":
+            return text_reader.read_lines(resolved_path, start or 1, end, MAX_READ_BYTES)
+        elif mode == "bytes":
+            return text_reader.read_bytes(resolved_path, start or 0, end, MAX_READ_BYTES)
+        return f"Unsupported mode '{mode}'. Use one of: {', '.join(text_reader.READ_MODES)}."
+    except Exception as e:
+        return f"Failed to read file: {e}"
+
+
+register_tool("Read File Range",
+              "Reads the head, tail, a line range or a byte range of a large text file.",
+              read_file_range, access=("read", lambda args: [args.get("file_path")]))
 
 
 @tool
@@ -185,55 +344,172 @@ def append_to_file(file_path: str, content: str) -> str:
 
 
 register_tool("Append to File",
-              "Appends content to a specified file.", append_to_file)
+              "Appends content to a specified file.", append_to_file,
+              access=("write", lambda args: [args.get("file_path")]))
+
+
+class FileOperation(BaseModel):
+    """One step of `apply_file_operations`."""
+    op: Literal["create_folder", "create_file", "write", "append"]
+    path: str
+    content: str = ""
+
+
+@tool
+def apply_file_operations(operations: List[FileOperation], base_path: str = ".",
+                          rollback_on_error: bool = False) -> list:
+    """Creates folders and files and writes or appends to files, many in one call.
+
+    `operations` is a list of {"op": "create_folder" | "create_file" | "write" |
+    "append", "path": ..., "content": ...}; relative paths are under `base_path`.
+    Each file is written once however many operations touch it, and missing
+    parent folders are created. With `rollback_on_error`, the batch is applied
+    all-or-nothing. Returns one {"op", "path", "status", "message"} per operation.
+    """
+    operations = [operation.model_dump() if isinstance(operation, FileOperation) else operation
+                  for operation in operations]
+    results, created = apply_operations(operations, fix_ai_path(base_path), rollback_on_error)
+    for path in created:
+        record_created_path(path)
+    return results
+
+
+def operation_paths(args):
+    """The paths a batch of file operations writes, for scheduling."""
+    base_path = fix_ai_path(args.get("base_path") or ".")
+    operations = [operation for operation in args.get("operations") or []
+                  if isinstance(operation, dict)]
+    return [os.path.join(base_path, os.path.expanduser(operation.get("path", "")))
+            for operation in operations] or [base_path]
+
+
+register_tool("Apply File Operations",
+              "Creates several folders or files, or writes or appends to several files, "
+              "in one batch.", apply_file_operations,
+              access=("write", operation_paths), aliases=("Batch File Operations",))
+
+
+def target_name_argument(args):
+    """Accepts `folder_name`, `file_name` or `name` (from the prompt's search_for_folder /
+    search_for_file wording) as the target name."""
+    if "target_name" not in args:
+        for name in ("folder_name", "file_name", "name"):
+            if name in args:
+                args["target_name"] = args.pop(name)
+                break
+    return args
+
+
+@tool
+def search_for_target(target_name: str, search_path: Optional[str] = None, max_results: Optional[int] = None,
+                      max_depth: Optional[int] = None, time_budget: Optional[float] = None) -> list:
+    """Searches for a file or folder, answering from the filename index when possible.
+
+    `max_results` stops after that many matches, `max_depth` limits how many folder
+    levels below `search_path` are searched, and `time_budget` (seconds) returns
+    whatever was found when the time runs out.
+    """
+    return find_target_paths(target_name, search_path, max_results, max_depth, time_budget)
+
+
+register_tool("Search for Target",
+              "Searches for a file or folder in a given directory.", search_for_target,
+              access=("read", lambda args: [args.get("search_path") or os.path.expanduser("~")]),
+              aliases=("Search for Folder", "Search for File"), normalisers=[target_name_argument])
 
 
 @tool
-def search_for_target(target_name: str, search_path: str = None) -> list:
-    """Searches for a file or folder in parallel across all directories."""
+def find_matching_targets(pattern: str, search_path: Optional[str] = None, mode: str = "fuzzy",
+                          limit: int = 10) -> list:
+    """Finds files or folders whose names resemble `pattern`, ranked by score.
+
+    `mode` is "fuzzy" (default, typo and case tolerant), "glob" (e.g. "*.pdf"),
+    "prefix" or "exact" (case-insensitive).
+    """
+    if mode not in MATCH_MODES:
+        return [f"Unknown match mode '{mode}'. Use one of: {', '.join(MATCH_MODES)}."]
+    return [{"path": path, "score": round(score, 3)}
+            for path, score in match_target_paths(pattern, search_path, mode, limit)]
+
+
+register_tool("Find Matching Targets",
+              "Finds files or folders by fuzzy, glob, prefix or case-insensitive name, "
+              "returning the best-scored matches.", find_matching_targets,
+              access=("read", lambda args: [args.get("search_path") or os.path.expanduser("~")]))
+
+
+@tool
+def search_file_contents(query: str, search_path: Optional[str] = None, limit: int = 10) -> list:
+    """Finds .txt, .pdf and .docx files whose text mentions `query`.
+
+    Returns the best-ranked files with a snippet around the match, answered from
+    the content index as it stands. A stale index is brought up to date in the
+    background, re-reading only new or modified files.
+    """
     if search_path is None:
         search_path = os.path.expanduser("~")
+    search_path = os.path.abspath(resolve_path(search_path))
+
+    try:
+        index = get_content_index()
+        updating = index.refresh_in_background(search_path, CONTENT_INDEX_MAX_AGE)
+        hits = index.search(query, search_path, limit)
+        if not hits and updating is not None:
+            return [f"No matches yet: documents under {search_path} are still being indexed. "
+                    "Try again shortly."]
+        return hits
+    except sqlite3.Error as e:
+        return [f"Content index unavailable: {e}"]
 
-    max_workers = cpu_count()
-    manager = Manager()
-    queue = manager.Queue()
-    queue.put(search_path)
-    found_paths = manager.list()
 
-    with Pool(processes=max_workers) as pool:
-        while not queue.empty():
-            tasks = []
-            for _ in range(min(queue.qsize(), max_workers)):
-                current_dir = queue.get()
-                tasks.append(pool.apply_async(
-                    search_directory, (current_dir, target_name)))
+register_tool("Search File Contents",
+              "Finds documents whose text mentions a phrase, returning ranked files with snippets.",
+              search_file_contents,
+              access=("read", lambda args: [args.get("search_path") or os.path.expanduser("~")]))
 
-            for task in tasks:
-                result, new_dirs = task.get()
-                if result:
-                    found_paths.extend(result)
-                for new_dir in new_dirs:
-                    if should_exclude(new_dir):
-                        continue
-                    queue.put(new_dir)
 
-    return list(found_paths) if found_paths else []
+@tool
+def read_tool_result(reference: str, offset: int = 0, length: int = 4000) -> str:
+    """Reads part of an earlier tool result that was too large for the conversation."""
+    content = get_memory().results.get(reference)
+    if content is None:
+        return f"Error: No stored tool result '{reference}' (it may have expired)."
+    return content[max(offset, 0):max(offset, 0) + length]
 
 
-register_tool("Search for Target",
-              "Searches for a file or folder in a given directory.", search_for_target)
+register_tool("Read Tool Result",
+              "Reads more of a large earlier tool result that was shortened to a preview with a reference.",
+              read_tool_result, access=("read", lambda args: []))
 
 
 @tool
-def search_and_append_to_file(file_name: str, content: str, search_path: str = None) -> str:
+def fetch_result_chunks(reference: str, query: str, k: int = 3, skip: Optional[list] = None) -> list:
+    """Returns the `k` chunks of a large earlier tool result most relevant to `query`.
+
+    Pass the positions already seen in `skip` to get the next most relevant chunks.
+    """
+    chunks = get_memory().results.search(reference, query, k=k, skip=set(skip or ()))
+    if chunks is None:
+        return [f"Error: No stored tool result '{reference}' (it may have expired)."]
+    return chunks
+
+
+register_tool("Fetch Result Chunks",
+              "Finds the parts of a large earlier tool result that answer a question, by its reference.",
+              fetch_result_chunks, access=("read", lambda args: []))
+
+
+@tool
+def search_and_append_to_file(file_name: str, content: str, search_path: Optional[str] = None) -> str:
     """Searches for a file and appends content to it if found."""
     if search_path is None:
         search_path = os.path.expanduser("~")  # Default to home directory
 
-    found_files = search_for_target(file_name, search_path, is_file=True)
+    found_files = [path for path in find_target_paths(file_name, search_path)
+                   if os.path.isfile(path)]
 
     if len(found_files) == 1:
-        return append_to_file(found_files[0], content)
+        return append_to_file.invoke({"file_path": found_files[0], "content": content})
     elif len(found_files) > 1:
         return f"Multiple files found:\n" + "\n".join(found_files)
     else:
@@ -241,16 +517,25 @@ def search_and_append_to_file(file_name: str, content: str, search_path: str = N
 
 
 register_tool("Search and Append to File",
-              "Searches for a specific file and appends content to it.", search_and_append_to_file)
+              "Searches for a specific file and appends content to it.", search_and_append_to_file,
+              access=("write", lambda args: [args.get("search_path") or os.path.expanduser("~")]))
 
 
 @tool
-def open_file_or_folder(target_name: str, search_path: str = None) -> str:
+def open_file_or_folder(target_name: str, search_path: Optional[str] = None,
+                        time_budget: float = OPEN_TIME_BUDGET) -> str:
     """Searches for and opens a file or folder if found."""
     if search_path is None:
         search_path = os.path.expanduser("~")
 
-    found_targets = search_for_target(target_name, search_path)
+    # Two hits already make the request ambiguous, so stop streaming there.
+    found_targets = []
+    matches = iter_target_paths(target_name, search_path, time_budget=time_budget)
+    for path in matches:
+        found_targets.append(path)
+        if len(found_targets) > 1:
+            matches.close()
+            break
 
     if not found_targets:
         return f"'{target_name}' not found."
@@ -276,32 +561,156 @@ def open_file_or_folder(target_name: str, search_path: str = None) -> str:
 
 
 register_tool("Open File or Folder",
-              "Opens a file or folder in the system.", open_file_or_folder)
+              "Opens a file or folder in the system.", open_file_or_folder,
+              access=("read", lambda args: [args.get("search_path") or os.path.expanduser("~")]))
 
 
 ### HELPER FUNCTIONS ###
-def should_exclude(path):
-    """Checks if a directory should be skipped to speed up search."""
-    return any(excluded in path.split(os.sep) for excluded in EXCLUDED_FOLDERS)
+def find_target_paths(target_name, search_path=None, max_results=None, max_depth=None,
+                      time_budget=None):
+    """Finds a file or folder by name via the filename index, or a live walk without it.
+
+    The search takes at most `time_budget` seconds (ALFRED_SEARCH_TIME_BUDGET by
+    default). If the index cannot cover `search_path` within FILE_INDEX_WAIT, the
+    rest of the budget goes to a live walk while the index catches up in the background.
+    """
+    if search_path is None:
+        search_path = os.path.expanduser("~")
+    search_path = os.path.abspath(os.path.expanduser(search_path))
+    budget = SEARCH_TIME_BUDGET if time_budget is None else time_budget
+    started = time.monotonic()
+
+    if USE_FILE_INDEX:
+        try:
+            found = get_file_index().lookup(target_name, search_path, max_results, max_depth,
+                                            index_deadline(budget))
+            if found is not None:
+                return found
+        except sqlite3.Error as e:
+            print(f"⚠️ File index unavailable, falling back to a live walk: {e}")
 
+    remaining = max(0.0, budget - (time.monotonic() - started))
+    return walk_for_target(target_name, search_path, max_results, max_depth, remaining)
 
-def search_directory(path, target_name):
-    """Scans a directory for a file or folder and returns new directories to search."""
-    if should_exclude(path):
-        return [], []
 
-    found_paths = []
-    subdirectories = []
+def iter_target_paths(target_name, search_path=None, max_depth=None, time_budget=None):
+    """Yields matching paths as they are found, so callers can stop at the first hit."""
+    if search_path is None:
+        search_path = os.path.expanduser("~")
+    search_path = os.path.abspath(os.path.expanduser(search_path))
+
+    budget = SEARCH_TIME_BUDGET if time_budget is None else time_budget
+    started = time.monotonic()
 
+    if USE_FILE_INDEX:
+        try:
+            found = get_file_index().lookup(target_name, search_path, max_depth=max_depth,
+                                            deadline=index_deadline(budget))
+            if found is not None:
+                yield from found
+                return
+        except sqlite3.Error as e:
+            print(f"⚠️ File index unavailable, falling back to a live walk: {e}")
+
+    yield from WALKER.iter_find(search_path, target_name, max_depth,
+                                started + budget)
+
+
+def match_target_paths(pattern, search_path=None, mode="fuzzy", limit=10):
+    """Ranks paths whose names match `pattern`, via the index or a live walk without it."""
+    if search_path is None:
+        search_path = os.path.expanduser("~")
+    search_path = os.path.abspath(os.path.expanduser(search_path))
+
+    if USE_FILE_INDEX:
+        try:
+            found = get_file_index().match(pattern, search_path, mode, limit,
+                                           index_deadline(SEARCH_TIME_BUDGET))
+            if found is not None:
+                return found
+        except sqlite3.Error as e:
+            print(f"⚠️ File index unavailable, falling back to a live walk: {e}")
+
+    def visit(path, mtime_ns, entries):
+        scored = ((entry.path, score_name(pattern, entry.name, mode)) for entry in entries)
+        return [item for item in scored if item[1] > 0.0]
+
+    matches = WALKER.walk([search_path], visit, deadline=deadline_after(SEARCH_TIME_BUDGET))
+    return heapq.nlargest(limit, matches, key=lambda item: (item[1], -len(item[0])))
+
+
+def read_text_file(file_path, max_chars=None):
+    """Reads a text file through mmap, capped at ALFRED_MAX_READ_BYTES."""
+    size = os.path.getsize(file_path)
+    limit = MAX_READ_BYTES if max_chars is None else min(MAX_READ_BYTES, max_chars * 4)
+    content = truncate(text_reader.read_bytes(file_path, 0, None, limit), max_chars)
+
+    if size > limit and (max_chars is None or len(content) < max_chars):
+        content += (f"\n\n[Truncated: showing the first {limit} of {size} bytes. "
+                    "Use read_file_range to read the rest.]")
+    return content
+
+
+def extract_document_text(file_path):
+    """Extracts the text of a `.pdf` or `.docx` file (uncached)."""
+    file_extension = os.path.splitext(file_path)[1].lower()
+    content = ""
+
+    if file_extension == ".pdf":
+        content = extract_pdf_text(file_path)
+    elif file_extension == ".docx":
+        import docx
+        doc = docx.Document(file_path)
+        content = "\n".join([para.text for para in doc.paragraphs])
+    return content
+
+
+def list_document_files(root):
+    """Lists the .txt, .pdf and .docx files under `root` for the content index."""
+    if USE_FILE_INDEX:
+        try:
+            return get_file_index().files_with_extensions(root, DOCUMENT_EXTENSIONS)
+        except sqlite3.Error as e:
+            print(f"⚠️ File index unavailable, falling back to a live walk: {e}")
+
+    def visit(path, mtime_ns, entries):
+        return [entry.path for entry in entries
+                if entry.name.lower().endswith(DOCUMENT_EXTENSIONS) and entry.is_file()]
+
+    return list(WALKER.walk([root], visit))
+
+
+def extract_indexable_text(file_path):
+    """Returns the text of a document for the content index."""
+    if file_path.lower().endswith(".txt"):
+        return text_reader.read_bytes(file_path, max_bytes=CONTENT_INDEX_MAX_CHARS)
+    return get_document_cache().get_or_extract(file_path, extract_document_text)
+
+
+def record_created_path(path):
+    """Adds a path created by one of the tools to the filename index straight away."""
+    if not USE_FILE_INDEX:
+        return
     try:
-        with os.scandir(path) as entries:
-            for entry in entries:
-                if entry.name == target_name:
-                    found_paths.append(entry.path)
-                elif entry.is_dir(follow_symlinks=False):
-                    subdirectories.append(entry.path)
+        get_file_index().add_path(path)
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not add '{path}' to the file index: {e}")
+
+
+def walk_for_target(target_name, search_path, max_results=None, max_depth=None,
+                    time_budget=None):
+    """Searches for a file or folder with a live parallel walk of `search_path`."""
+    return sorted(WALKER.find(search_path, target_name, max_results, max_depth,
+                              deadline_after(time_budget)))
+
+
+def deadline_after(time_budget):
+    """Turns a budget in seconds into a `time.monotonic()` deadline (None = unbounded)."""
+    if time_budget is None:
+        return None
+    return time.monotonic() + time_budget
 
-    except (PermissionError, OSError):
-        pass
 
-    return found_paths, subdirectories
+def index_deadline(time_budget):
+    """How long a search waits on the filename index: FILE_INDEX_WAIT, at most half its budget."""
+    return deadline_after(min(FILE_INDEX_WAIT, time_budget / 2))
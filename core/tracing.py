@@ -0,0 +1,229 @@
+"""Spans, latency histograms and verbosity-gated diagnostics.
+
+Wrap a stage in `with span("llm.call"):`; every sink sees the finished span.
+Sinks are chosen with ALFRED_TRACE (comma-separated, default "histogram"):
+
+- histogram: in-process latency samples, summarised as p50/p99 per span name
+- jsonl: one JSON line per span appended to ALFRED_TRACE_LOG (a structured log)
+- record: keeps recent spans in memory so `export_json` can write them out
+
+ALFRED_TRACE=off disables spans entirely. Console diagnostics go through `log`
+and are gated by ALFRED_VERBOSITY: quiet, info (default) or debug. Full payload
+dumps only print at debug, so production runs do not pay to format them.
+"""
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+QUIET, INFO, DEBUG = 0, 1, 2
+LEVELS = {"quiet": QUIET, "info": INFO, "debug": DEBUG}
+VERBOSITY = LEVELS.get(os.getenv("ALFRED_VERBOSITY", "info").lower(), INFO)
+TRACE_SINKS = [name.strip() for name in os.getenv("ALFRED_TRACE", "histogram").lower().split(",")
+               if name.strip() and name.strip() != "off"]
+TRACE_LOG_PATH = os.getenv(
+    "ALFRED_TRACE_LOG", os.path.join(os.path.expanduser("~"), ".alfred", "trace.jsonl"))
+TRACE_EXPORT_PATH = os.getenv("ALFRED_TRACE_EXPORT")
+
+_CURRENT_SPAN = contextvars.ContextVar("alfred_span", default=None)
+_SPAN_IDS = itertools.count(1)
+
+
+def enabled(level):
+    """True if diagnostics at `level` are printed; guard expensive messages with it."""
+    return VERBOSITY >= level
+
+
+def log(level, message):
+    """Prints `message` if the verbosity allows it."""
+    if VERBOSITY >= level:
+        print(message)
+
+
+class Span:
+    """One timed stage; `attributes` describe it (tool name, sizes, ...)."""
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "trace_id", "started_at",
+                 "seconds", "error")
+
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_SPAN_IDS)
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else self.span_id
+        self.started_at = time.time()
+        self.seconds = None
+        self.error = None
+
+    def set(self, **attributes):
+        """Adds attributes once they are known, e.g. the size of a result."""
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {"name": self.name, "trace": self.trace_id, "span": self.span_id,
+                "parent": self.parent_id, "started_at": self.started_at,
+                "seconds": self.seconds, "error": self.error, **self.attributes}
+
+
+class HistogramSink:
+    """Keeps the latest `max_samples` durations per span name for percentile summaries."""
+
+    def __init__(self, max_samples=2048):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, span):
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.max_samples)
+            samples.append(span.seconds)
+            self._counts[span.name] = self._counts.get(span.name, 0) + 1
+
+    def summary(self, prefix=""):
+        """Returns {span name: {"count", "p50_ms", "p99_ms", "mean_ms", "max_ms"}}."""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()
+                       if name.startswith(prefix)}
+            counts = dict(self._counts)
+        return {name: {"count": counts[name],
+                       "p50_ms": round(percentile(values, 50) * 1000, 3),
+                       "p99_ms": round(percentile(values, 99) * 1000, 3),
+                       "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                       "max_ms": round(values[-1] * 1000, 3)}
+                for name, values in sorted(samples.items())}
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+class JsonLinesSink:
+    """Appends each finished span as one JSON line (a structured log)."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def record(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class RecordingSink:
+    """Keeps the latest `max_spans` spans in memory for `export_json`."""
+
+    def __init__(self, max_spans=10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def record(self, span):
+        self.spans.append(span.to_dict())
+
+
+class Tracer:
+    """Times spans and hands each finished one to every sink."""
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def remove_sink(self, sink):
+        self.sinks.remove(sink)
+
+    def find_sink(self, sink_type):
+        """Returns the first installed sink of `sink_type`, or None."""
+        return next((sink for sink in self.sinks if isinstance(sink, sink_type)), None)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Times the body as a span named `name`, nested under the current span."""
+        if not self.sinks:
+            yield None
+            return
+        current = Span(name, attributes, _CURRENT_SPAN.get())
+        token = _CURRENT_SPAN.set(current)
+        started = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            current.seconds = time.perf_counter() - started
+            _CURRENT_SPAN.reset(token)
+            for sink in self.sinks:
+                try:
+                    sink.record(current)
+                except Exception as e:
+                    log(INFO, f"⚠️ Trace sink {type(sink).__name__} failed: {e}")
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def create_sinks(names=TRACE_SINKS):
+    sinks = []
+    for name in names:
+        if name == "histogram":
+            sinks.append(HistogramSink())
+        elif name == "jsonl":
+            sinks.append(JsonLinesSink(TRACE_LOG_PATH))
+        elif name == "record":
+            sinks.append(RecordingSink())
+        else:
+            print(f"⚠️ Unknown trace sink '{name}' in ALFRED_TRACE; ignoring it.")
+    return sinks
+
+
+TRACER = Tracer(create_sinks())
+
+
+def span(name, **attributes):
+    """Times a stage on the shared tracer: `with span("tool.read_file_content"): ...`."""
+    return TRACER.span(name, **attributes)
+
+
+def latency_summary(prefix=""):
+    """p50/p99 latency per span name (optionally only names starting with `prefix`)."""
+    histogram = TRACER.find_sink(HistogramSink)
+    return histogram.summary(prefix) if histogram else {}
+
+
+def print_latency_summary():
+    """Prints the p50/p99 latency of each tool and pipeline stage seen so far."""
+    summary = latency_summary()
+    if not summary:
+        return
+    print("\n⏱️ Latency (p50 / p99, ms):")
+    for name, stats in summary.items():
+        print(f"   {name:32s} {stats['p50_ms']:10.1f} {stats['p99_ms']:10.1f}"
+              f"   x{stats['count']}")
+
+
+def export_json(path=TRACE_EXPORT_PATH):
+    """Writes the latency summary and any recorded spans to `path` as JSON."""
+    recording = TRACER.find_sink(RecordingSink)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"exported_at": time.time(), "summary": latency_summary(),
+                   "spans": list(recording.spans) if recording else []},
+                  file, indent=2, default=str)
+    return path
@@ -0,0 +1,208 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+
+_DONE = object()
+
+
+class _WorkerError:
+    """Carries an exception raised on a worker thread back to the caller."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class ParallelWalker:
+    """Work-stealing directory walker built on threads and `os.scandir`.
+
+    Each worker owns a deque of directories. It pops batches from its own end and,
+    when it runs dry, steals from the opposite end of another worker's deque. Only
+    small result lists cross thread boundaries, so there is no pickling and no
+    Manager proxy on the hot path.
+    """
+
+    def __init__(self, excluded=(), workers=None, batch_size=32):
+        self.excluded = frozenset(excluded)
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.batch_size = batch_size
+
+    def walk(self, roots, visit, skip=frozenset(), stat_dirs=False,
+             max_depth=None, deadline=None):
+        """Yields whatever `visit(path, mtime_ns, entries)` returns for every directory.
+
+        `visit` runs on the worker threads and must return an iterable. Directories
+        named in `EXCLUDED_FOLDERS` and paths in `skip` are not descended into. With
+        `stat_dirs`, `mtime_ns` is taken before the directory is listed. `max_depth`
+        limits how many levels below the roots are listed (1 = the roots only) and
+        `deadline` is a `time.monotonic()` value after which the walk just stops.
+        Closing the generator stops the walk early.
+        """
+        run = _WalkRun(self, visit, skip, stat_dirs, max_depth, deadline)
+        run.start(list(roots))
+        try:
+            finished = 0
+            while finished < len(run.threads):
+                try:
+                    batch = run.results.get(timeout=run.remaining())
+                except queue.Empty:
+                    return
+                if batch is _DONE:
+                    finished += 1
+                    continue
+                if isinstance(batch, _WorkerError):
+                    raise batch.error
+                yield from batch
+        finally:
+            run.stop()
+
+    def iter_find(self, root, target_name, max_depth=None, deadline=None):
+        """Yields the paths under `root` named exactly `target_name` as they are found."""
+        def visit(path, mtime_ns, entries):
+            return [entry.path for entry in entries if entry.name == target_name]
+
+        return self.walk([root], visit, max_depth=max_depth, deadline=deadline)
+
+    def find(self, root, target_name, max_results=None, max_depth=None, deadline=None):
+        """Returns the paths under `root` whose name is exactly `target_name`."""
+        found = []
+        walk = self.iter_find(root, target_name, max_depth, deadline)
+        for path in walk:
+            found.append(path)
+            if max_results is not None and len(found) >= max_results:
+                walk.close()
+                break
+        return found
+
+
+class _WalkRun:
+    """State shared by the worker threads of one `ParallelWalker.walk` call."""
+
+    def __init__(self, walker, visit, skip, stat_dirs, max_depth, deadline):
+        self.walker = walker
+        self.visit = visit
+        self.skip = skip
+        self.stat_dirs = stat_dirs
+        self.max_depth = max_depth
+        self.deadline = deadline
+        self.deques = [deque() for _ in range(walker.workers)]
+        self.results = queue.Queue()
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.stopped = threading.Event()
+        self.threads = []
+
+    def start(self, roots):
+        """Seeds the first worker with `roots` and starts every thread."""
+        self.pending = len(roots)
+        self.deques[0].extend((root, 0) for root in roots)
+        for worker_id in range(self.walker.workers):
+            thread = threading.Thread(
+                target=self.work, args=(worker_id,), daemon=True)
+            self.threads.append(thread)
+            thread.start()
+
+    def remaining(self):
+        """Seconds left before the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def stop(self):
+        """Tells every worker to exit and waits for them."""
+        self.stopped.set()
+        with self.wakeup:
+            self.wakeup.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+    def work(self, worker_id):
+        """Worker loop: drain the own deque in batches, steal when empty."""
+        try:
+            while not self.stopped.is_set():
+                batch = self.take_batch(worker_id)
+                if not batch:
+                    with self.wakeup:
+                        if self.pending == 0:
+                            self.wakeup.notify_all()
+                            return
+                        self.wakeup.wait(0.01)
+                    continue
+
+                if self.deadline is not None and time.monotonic() >= self.deadline:
+                    self.stopped.set()
+                    break
+
+                found = []
+                subdirectories = []
+                for path, depth in batch:
+                    found.extend(self.scan(path, depth, subdirectories))
+
+                if found:
+                    self.results.put(found)
+
+                with self.wakeup:
+                    # Count new directories before publishing them so `pending`
+                    # can never drop to zero while work is still in flight.
+                    self.pending += len(subdirectories) - len(batch)
+                    if subdirectories:
+                        self.deques[worker_id].extend(subdirectories)
+                        self.wakeup.notify(len(subdirectories))
+                    elif self.pending == 0:
+                        self.wakeup.notify_all()
+        except Exception as e:
+            self.results.put(_WorkerError(e))
+            self.stopped.set()
+        finally:
+            self.results.put(_DONE)
+
+    def take_batch(self, worker_id):
+        """Pops up to `batch_size` directories from the own deque, or steals some."""
+        own = self.deques[worker_id]
+        batch = []
+        try:
+            while len(batch) < self.walker.batch_size:
+                batch.append(own.pop())
+        except IndexError:
+            pass
+        if batch:
+            return batch
+
+        for offset in range(1, len(self.deques)):
+            victim = self.deques[(worker_id + offset) % len(self.deques)]
+            try:
+                # Steal half a batch from the oldest (shallowest) end.
+                while len(batch) < max(1, self.walker.batch_size // 2):
+                    batch.append(victim.popleft())
+            except IndexError:
+                pass
+            if batch:
+                return batch
+        return batch
+
+    def scan(self, path, depth, subdirectories):
+        """Lists one directory, queues its subdirectories and returns `visit`'s results."""
+        excluded = self.walker.excluded
+        descend = self.max_depth is None or depth + 1 < self.max_depth
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns if self.stat_dirs else None
+            with os.scandir(path) as iterator:
+                entries = list(iterator)
+        except (PermissionError, OSError):
+            return []
+
+        for entry in entries:
+            if not descend:
+                break
+            if entry.name in excluded:
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False) and entry.path not in self.skip:
+                    subdirectories.append((entry.path, depth + 1))
+            except OSError:
+                pass
+
+        return self.visit(path, mtime_ns, entries)
@@ -0,0 +1,58 @@
+"""Shared fixtures. Tests that touch Alfred's caches or indexes ask for `alfred_home`."""
+import os
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("ALFRED_VECTOR_BACKEND", "local")
+os.environ.pop("ALFRED_CHECKPOINT_PATH", None)
+os.environ.pop("ALFRED_WATCH_ROOTS", None)
+
+# core.tools settings that resolve to ~/.alfred, and the shared objects opened from them.
+CACHE_PATHS = {"FILE_INDEX_PATH": "file_index.db", "CONTENT_INDEX_PATH": "content_index.db",
+               "DOC_CACHE_DIR": "doc_cache", "EMBEDDING_CACHE_DIR": "embeddings"}
+SHARED_CACHES = ("FILE_INDEX", "FILE_WATCHER", "CONTENT_INDEX", "DOCUMENT_CACHE", "EMBEDDINGS",
+                 "VECTOR_STORE")
+
+
+@pytest.fixture
+def alfred_home(tmp_path_factory, monkeypatch):
+    """Points HOME and every core.tools cache path at a fresh directory, caches unopened."""
+    from core import tools
+
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    for name, leaf in CACHE_PATHS.items():
+        monkeypatch.setattr(tools, name, str(home / ".alfred" / leaf))
+    for name in SHARED_CACHES:
+        monkeypatch.setattr(tools, name, None)
+    return home
+
+
+@pytest.fixture
+def write_pdf():
+    """Returns a function that writes a minimal PDF with one line of text per page."""
+    def write(path, pages):
+        objects = [
+            "<< /Type /Catalog /Pages 2 0 R >>",
+            "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+                " ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        ]
+        for i, text in enumerate(pages):
+            stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+            objects.append("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                           f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+            objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+        out = "%PDF-1.4\n"
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += f"{number} 0 obj\n{body}\nendobj\n"
+        xref = len(out)
+        out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+        out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+        out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+        with open(path, "w", encoding="latin-1") as file:
+            file.write(out)
+    return write
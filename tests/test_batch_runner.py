@@ -0,0 +1,58 @@
+import asyncio
+import json
+from core.batch_runner import BatchRunner
+
+
+def write_requests(path, count):
+    with open(path, "w") as file:
+        for i in range(count):
+            file.write(json.dumps({"id": f"r{i}", "input": f"where is folder {i}"}) + "\n")
+
+
+def read_results(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def test_runs_concurrently_retries_and_writes_one_line_per_request(tmp_path):
+    requests, results = tmp_path / "requests.jsonl", tmp_path / "results.jsonl"
+    write_requests(requests, 6)
+    active, peak, failures = [0], [0], {"r2": 1}
+
+    async def run(request_id, text):
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        if failures.get(request_id):
+            failures[request_id] -= 1
+            raise TimeoutError("rate limited")
+        return {"reply": text.upper()}
+
+    runner = BatchRunner(run, concurrency=3, retries=2, backoff=0.01)
+    counts = asyncio.run(runner.run_file(str(requests), str(results)))
+
+    lines = read_results(results)
+    assert counts == {"ok": 6, "error": 0, "skipped": 0}
+    assert sorted(line["id"] for line in lines) == [f"r{i}" for i in range(6)]
+    assert next(line for line in lines if line["id"] == "r2")["attempts"] == 2
+    assert 1 < peak[0] <= 3
+
+
+def test_resumes_after_a_crash_without_redoing_finished_requests(tmp_path):
+    requests, results = tmp_path / "requests.jsonl", tmp_path / "results.jsonl"
+    write_requests(requests, 4)
+    results.write_text(json.dumps({"id": "r0", "status": "ok"}) + "\n"
+                       + json.dumps({"id": "r1", "status": "error"}) + "\n"
+                       + '{"id": "r2", "sta')
+    seen = []
+
+    async def run(request_id, text):
+        seen.append(request_id)
+        return {"reply": "done"}
+
+    counts = asyncio.run(BatchRunner(run).run_file(str(requests), str(results)))
+
+    assert sorted(seen) == ["r1", "r2", "r3"]
+    assert counts == {"ok": 3, "error": 0, "skipped": 1}
+    assert len(results.read_text().splitlines()) == 6
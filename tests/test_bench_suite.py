@@ -0,0 +1,26 @@
+from langchain_core.messages import HumanMessage, ToolMessage
+from benchmarks.bench_suite import ScriptedModel, regressions
+
+CALLS = [{"name": "search_for_target", "args": {"target_name": "Batman"}}]
+
+
+def test_scripted_model_plans_then_answers():
+    model = ScriptedModel(CALLS)
+    request = [HumanMessage(content="where is Batman?")]
+
+    plan = model.invoke(request)
+    assert [call["name"] for call in plan.tool_calls] == ["search_for_target"]
+
+    answer = model.invoke(request + [plan, ToolMessage(content="['/x/Batman']",
+                                                       tool_call_id=plan.tool_calls[0]["id"])])
+    assert not answer.tool_calls
+    assert "1 tools" in answer.content
+
+    assert model.invoke(request + [plan, answer, HumanMessage(content="again")]).tool_calls
+
+
+def test_regressions_only_flags_cases_slower_than_the_tolerance():
+    baseline = {"walk": {"median": 0.010}, "lookup": {"median": 0.001}}
+    results = {"walk": {"median": 0.012}, "lookup": {"median": 0.002}, "new": {"median": 1.0}}
+
+    assert regressions(results, baseline, 0.25) == [("lookup", 0.001, 0.002)]
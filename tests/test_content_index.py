@@ -0,0 +1,65 @@
+import os
+from core.content_index import ContentIndex
+
+
+def make_index(tmp_path, extracted):
+    def list_files(root):
+        return [os.path.join(root, name) for name in sorted(os.listdir(root))
+                if name.endswith(".txt")]
+
+    def extract(path):
+        extracted.append(path)
+        return open(path).read()
+
+    return ContentIndex(str(tmp_path / "content.db"), list_files, extract)
+
+
+def test_search_ranks_matching_files_and_returns_snippets(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "bill.txt").write_text("Please pay invoice INV-2024-0042 by Friday.")
+    (docs / "memo.txt").write_text("The invoice template is attached.")
+    (docs / "other.txt").write_text("Nothing to see here.")
+    index = make_index(tmp_path, [])
+
+    index.update(str(docs))
+    hits = index.search("invoice INV-2024-0042", str(docs))
+
+    assert [hit["path"] for hit in hits] == [
+        str(docs / "bill.txt"), str(docs / "memo.txt")]
+    assert "INV-2024-0042" in hits[0]["snippet"]
+
+
+def test_update_only_rereads_changed_files_and_drops_deleted_ones(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("alpha")
+    (docs / "b.txt").write_text("beta")
+    extracted = []
+    index = make_index(tmp_path, extracted)
+    index.update(str(docs))
+
+    (docs / "a.txt").write_text("alpha gamma")
+    os.remove(docs / "b.txt")
+
+    assert index.update(str(docs)) == 1
+    assert extracted[-1] == str(docs / "a.txt")
+    assert index.search("beta", str(docs)) == []
+    assert index.search("gamma", str(docs))[0]["path"] == str(docs / "a.txt")
+
+
+def test_background_refresh_runs_once_per_stale_root(tmp_path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("alpha")
+    extracted = []
+    index = make_index(tmp_path, extracted)
+
+    thread = index.refresh_in_background(str(docs), max_age=60)
+    thread.join()
+
+    assert index.search("alpha", str(docs))[0]["path"] == str(docs / "a.txt")
+    assert index.refresh_in_background(str(docs), max_age=60) is None
+    assert extracted == [str(docs / "a.txt")]
+    index.refresh_in_background(str(docs), max_age=0).join()
+    assert extracted == [str(docs / "a.txt")]
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import threading
+import time
+import core.chat_with_alfred as chat
+import core.client as client
+import core.daemon as daemon
+
+
+def test_client_streams_replies_from_a_running_daemon(tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "alfred.sock")
+    monkeypatch.setattr(client, "SOCKET_PATH", socket_path)
+    monkeypatch.setattr(daemon, "SOCKET_PATH", socket_path)
+    monkeypatch.setattr(client, "USE_TCP", False)
+    monkeypatch.setattr(daemon, "USE_TCP", False)
+
+    async def fake_chat(user_input, on_token):
+        for word in ["At ", "your ", "service."]:
+            on_token(word)
+        return f"answered: {user_input}"
+
+    monkeypatch.setattr(chat, "achat_with_alfred", fake_chat)
+    server = daemon.AlfredDaemon()
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not client.is_running() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert os.stat(socket_path).st_mode & 0o777 == 0o600
+    tokens = []
+    reply = client.request({"op": "chat", "input": "hello"}, tokens.append)
+    unknown = client.request({"op": "dance"})
+    client.request({"op": "shutdown"})
+    thread.join(5)
+
+    assert reply["result"] == "answered: hello"
+    assert "".join(tokens) == "At your service."
+    assert "error" in unknown
+    assert not thread.is_alive()
+    assert not client.is_running()
+
+
+def test_tcp_requests_need_the_daemon_token(tmp_path, monkeypatch):
+    import json
+    import socket
+
+    with socket.socket() as probe:
+        probe.bind((client.DAEMON_HOST, 0))
+        port = probe.getsockname()[1]
+    token_path = str(tmp_path / "daemon.token")
+    for module in (client, daemon):
+        monkeypatch.setattr(module, "USE_TCP", True)
+        monkeypatch.setattr(module, "DAEMON_PORT", port)
+        monkeypatch.setattr(module, "TOKEN_PATH", token_path)
+
+    server = daemon.AlfredDaemon()
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not client.is_running() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert os.stat(token_path).st_mode & 0o777 == 0o600
+    with client.connect(timeout=2) as connection:
+        connection.sendall(b'{"op": "ping", "token": "guess"}\n')
+        refused = json.loads(connection.makefile("r").readline())
+    client.request({"op": "shutdown"})
+    thread.join(5)
+
+    assert "error" in refused
+    assert not thread.is_alive()
+    assert not os.path.exists(token_path)
+
+
+def test_a_daemon_that_cannot_bind_keeps_the_running_token(tmp_path, monkeypatch):
+    import socket
+    import pytest
+
+    token_path = tmp_path / "daemon.token"
+    token_path.write_text("running-daemon-token")
+    with socket.socket() as taken:
+        taken.bind((client.DAEMON_HOST, 0))
+        taken.listen()
+        for module in (client, daemon):
+            monkeypatch.setattr(module, "USE_TCP", True)
+            monkeypatch.setattr(module, "DAEMON_PORT", taken.getsockname()[1])
+            monkeypatch.setattr(module, "TOKEN_PATH", str(token_path))
+
+        with pytest.raises(OSError):
+            asyncio.run(daemon.AlfredDaemon().serve())
+
+    assert token_path.read_text() == "running-daemon-token"
+    assert os.path.exists(token_path)
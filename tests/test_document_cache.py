@@ -0,0 +1,56 @@
+import os
+import time
+from core.document_cache import DocumentCache
+
+
+def test_repeated_reads_hit_the_cache_until_the_file_changes(tmp_path):
+    document = tmp_path / "manual.pdf"
+    document.write_text("v1")
+    calls = []
+
+    def extract(path):
+        calls.append(path)
+        return open(path).read().upper()
+
+    cache = DocumentCache(disk_dir=str(tmp_path / "cache"))
+
+    assert cache.get_or_extract(str(document), extract) == "V1"
+    assert cache.get_or_extract(str(document), extract) == "V1"
+    document.write_text("v2, edited")
+    assert cache.get_or_extract(str(document), extract) == "V2, EDITED"
+
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_disk_level_survives_a_new_process_and_respects_limits(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"doc{i}.docx"
+        path.write_bytes(os.urandom(2000))
+        paths.append(str(path))
+
+    first = DocumentCache(disk_dir=cache_dir, max_disk_bytes=5000)
+    for path in paths:
+        first.put(first.key_for(path), open(path, "rb").read().hex())
+        time.sleep(0.01)
+
+    second = DocumentCache(max_memory_bytes=10, disk_dir=cache_dir)
+    assert second.get(second.key_for(paths[-1])) is not None
+    assert second.get(second.key_for(paths[0])) is None
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_disk_entries_are_private_to_the_owner(tmp_path):
+    cache_dir = tmp_path / "cache"
+    path = tmp_path / "doc.txt"
+    path.write_text("salary review notes")
+
+    cache = DocumentCache(disk_dir=str(cache_dir))
+    cache.put(cache.key_for(str(path)), path.read_text())
+
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    entries = [entry for entry in cache_dir.rglob("*") if entry.is_file()]
+    assert entries and all(entry.stat().st_mode & 0o777 == 0o600 for entry in entries)
@@ -0,0 +1,82 @@
+import os
+from core.embedding_cache import CachedEmbeddings
+
+
+class FakeEmbeddings:
+    """Embeds a text as [length, number of vowels] and counts what it was asked."""
+
+    model = "fake-embeddings"
+
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [self.vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self.vector(text)
+
+    @staticmethod
+    def vector(text):
+        return [float(len(text)), float(sum(ch in "aeiou" for ch in text))]
+
+
+def test_documents_are_embedded_once_and_reloaded_from_disk(tmp_path):
+    fake = FakeEmbeddings()
+    cache = CachedEmbeddings(fake, str(tmp_path))
+
+    assert cache.embed_documents(["alfred", "wayne"]) == [[6.0, 2.0], [5.0, 2.0]]
+    assert cache.embed_documents(["wayne", "manor", "alfred"]) == [[5.0, 2.0], [5.0, 2.0], [6.0, 2.0]]
+    assert fake.documents == ["alfred", "wayne", "manor"]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+    reloaded_fake = FakeEmbeddings()
+    reloaded = CachedEmbeddings(reloaded_fake, str(tmp_path))
+    assert reloaded.embed_documents(["manor", "alfred"]) == [[5.0, 2.0], [6.0, 2.0]]
+    assert reloaded_fake.documents == []
+    assert reloaded.hits == 2
+
+
+def test_queries_stay_in_memory(tmp_path):
+    fake = FakeEmbeddings()
+    cache = CachedEmbeddings(fake, str(tmp_path), max_queries=1)
+
+    assert cache.embed_query("cave") == [4.0, 2.0]
+    assert cache.embed_query("cave") == [4.0, 2.0]
+    cache.embed_query("gotham")
+    cache.embed_query("cave")
+
+    assert fake.queries == ["cave", "gotham", "cave"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_oldest_vectors_are_evicted_past_the_cap(tmp_path):
+    fake = FakeEmbeddings()
+    cache = CachedEmbeddings(fake, str(tmp_path), max_entries=4)
+    texts = [f"text {'x' * i}" for i in range(5)]
+    for text in texts:
+        cache.embed_documents([text])
+
+    reloaded = CachedEmbeddings(fake, str(tmp_path), max_entries=4)
+    fake.documents.clear()
+    reloaded.embed_documents(texts)
+    assert fake.documents == texts[:2]
+
+
+def test_a_torn_last_record_is_dropped_on_load(tmp_path):
+    fake = FakeEmbeddings()
+    cache = CachedEmbeddings(fake, str(tmp_path))
+    cache.embed_documents(["alfred", "wayne"])
+    [path] = [tmp_path / name for name in os.listdir(tmp_path) if name.endswith(".emb")]
+    with open(path, "ab") as file:
+        file.write(b"\x01" * 40)  # a crash part-way through the next record
+
+    fake.documents.clear()
+    reloaded = CachedEmbeddings(fake, str(tmp_path))
+    assert reloaded.embed_documents(["wayne", "alfred", "manor"]) == \
+        [[5.0, 2.0], [6.0, 2.0], [5.0, 2.0]]
+    assert fake.documents == ["manor"]
+    assert CachedEmbeddings(fake, str(tmp_path)).embed_documents(["manor"]) == [[5.0, 2.0]]
@@ -0,0 +1,61 @@
+import os
+from core.file_batch import apply_operations
+
+
+def test_operations_run_in_one_pass_with_per_operation_results(tmp_path):
+    (tmp_path / "README.md").write_text("# Project\n")
+
+    results, created = apply_operations([
+        {"op": "create_folder", "path": "src/app"},
+        {"op": "write", "path": "src/app/main.py", "content": "print('hi')\n"},
+        {"op": "append", "path": "src/app/main.py", "content": "print('bye')"},
+        {"op": "append", "path": "README.md", "content": "Usage"},
+        {"op": "create_file", "path": "tests/__init__.py"},
+        {"op": "append", "path": "missing.txt", "content": "x"},
+        {"op": "delete", "path": "README.md"},
+    ], str(tmp_path))
+
+    assert [r["status"] for r in results] == ["ok"] * 5 + ["error"] * 2
+    assert (tmp_path / "src/app/main.py").read_text() == "print('hi')\nprint('bye')\n"
+    assert (tmp_path / "README.md").read_text() == "# Project\nUsage\n"
+    assert (tmp_path / "tests/__init__.py").read_text() == ""
+    assert str(tmp_path / "src") in created and str(tmp_path / "tests/__init__.py") in created
+
+
+def test_rollback_undoes_every_change_when_an_operation_fails(tmp_path):
+    (tmp_path / "notes.txt").write_text("keep me\n")
+    (tmp_path / "taken").mkdir()
+    operations = [
+        {"op": "append", "path": "notes.txt", "content": "more"},
+        {"op": "write", "path": "new/plan.txt", "content": "draft"},
+        {"op": "write", "path": "taken", "content": "a folder cannot be written"},
+    ]
+
+    results, created = apply_operations(operations, str(tmp_path), rollback=True)
+
+    assert {r["status"] for r in results} == {"rolled back", "error"}
+    assert created == []
+    assert (tmp_path / "notes.txt").read_text() == "keep me\n"
+    assert not os.path.exists(tmp_path / "new")
+
+    results, _ = apply_operations(operations[:2] + [{"op": "rename"}], str(tmp_path), rollback=True)
+    assert [r["status"] for r in results] == ["skipped", "skipped", "error"]
+    assert not os.path.exists(tmp_path / "new")
+
+
+def test_tool_schema_describes_each_operation_and_paths_expand_home(tmp_path, alfred_home):
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+    from core.tools import apply_file_operations, operation_paths
+
+    schema = convert_to_openai_tool(apply_file_operations)["function"]["parameters"]
+    items = schema["properties"]["operations"]["items"]
+    assert items["properties"]["op"]["enum"] == ["create_folder", "create_file", "write", "append"]
+    assert items["required"] == ["op", "path"]
+
+    results = apply_file_operations.invoke({"operations": [
+        {"op": "write", "path": "notes.txt", "content": "hi"}], "base_path": str(tmp_path)})
+    assert results[0]["status"] == "ok"
+    assert (tmp_path / "notes.txt").read_text() == "hi"
+
+    assert operation_paths({"operations": [{"op": "write", "path": "~/notes.txt"}]}) == \
+        [os.path.join(os.path.expanduser("~"), "notes.txt")]
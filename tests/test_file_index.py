@@ -0,0 +1,82 @@
+import os
+import time
+from core.file_index import FileIndex
+
+
+def make_tree(root):
+    os.makedirs(root / "Movies" / "Batman")
+    os.makedirs(root / "node_modules" / "Batman")
+    (root / "Movies" / "notes.txt").write_text("")
+
+
+def test_lookup_builds_index_and_skips_excluded_folders(tmp_path):
+    make_tree(tmp_path)
+    index = FileIndex(str(tmp_path / "index.db"), {"node_modules"})
+
+    found = index.lookup("Batman", str(tmp_path))
+
+    assert found == [str(tmp_path / "Movies" / "Batman")]
+
+
+def test_refresh_picks_up_changes_in_stale_directories(tmp_path):
+    make_tree(tmp_path)
+    index = FileIndex(str(tmp_path / "index.db"), max_age=0)
+    index.lookup("notes.txt", str(tmp_path))
+
+    time.sleep(0.01)
+    os.remove(tmp_path / "Movies" / "notes.txt")
+    os.makedirs(tmp_path / "Movies" / "Joker" / "notes.txt")
+
+    found = index.lookup("notes.txt", str(tmp_path))
+
+    assert found == [str(tmp_path / "Movies" / "Joker" / "notes.txt")]
+
+
+def test_lookup_is_limited_to_the_search_path(tmp_path):
+    make_tree(tmp_path)
+    os.makedirs(tmp_path / "Comics" / "Batman")
+    index = FileIndex(str(tmp_path / "index.db"))
+    index.lookup("Batman", str(tmp_path))
+
+    found = index.lookup("Batman", str(tmp_path / "Comics"))
+
+    assert found == [str(tmp_path / "Comics" / "Batman")]
+
+
+def test_add_path_records_new_entries_without_a_rescan(tmp_path):
+    make_tree(tmp_path)
+    index = FileIndex(str(tmp_path / "index.db"), max_age=3600)
+    index.lookup("Batman", str(tmp_path))
+
+    os.makedirs(tmp_path / "Projects" / "Joker")
+    index.add_path(str(tmp_path / "Projects" / "Joker"))
+
+    assert index._query_name("Joker", str(tmp_path)) == [
+        str(tmp_path / "Projects" / "Joker")]
+    assert index._query_name("Projects", str(tmp_path)) == [
+        str(tmp_path / "Projects")]
+
+
+def test_lookup_past_its_deadline_finishes_the_build_in_the_background(tmp_path):
+    make_tree(tmp_path)
+    index = FileIndex(str(tmp_path / "index.db"), {"node_modules"})
+
+    assert index.lookup("Batman", str(tmp_path), deadline=time.monotonic()) is None
+    for thread in list(index._updating.values()):
+        thread.join()
+
+    assert index.lookup("Batman", str(tmp_path), deadline=time.monotonic()) == [
+        str(tmp_path / "Movies" / "Batman")]
+
+
+def test_watched_roots_are_not_rescanned_for_staleness(tmp_path):
+    make_tree(tmp_path)
+    index = FileIndex(str(tmp_path / "index.db"), max_age=0)
+    index.lookup("Batman", str(tmp_path))
+    index.watch(str(tmp_path))
+
+    os.makedirs(tmp_path / "Movies" / "Joker")
+    assert index.lookup("Joker", str(tmp_path)) == []
+
+    index.unwatch(str(tmp_path))
+    assert index.lookup("Joker", str(tmp_path)) == [str(tmp_path / "Movies" / "Joker")]
@@ -0,0 +1,89 @@
+import errno
+import os
+import platform
+import threading
+import time
+import pytest
+from core.file_index import FileIndex
+from core.fs_watcher import InotifyWatcher, PollingWatcher
+
+linux_only = pytest.mark.skipif(platform.system() != "Linux", reason="inotify is Linux-only")
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_polling_watcher_picks_up_new_folders(tmp_path):
+    root = tmp_path / "root"
+    (root / "Movies").mkdir(parents=True)
+    index = FileIndex(str(tmp_path / "index.db"))
+    watcher = PollingWatcher(index, [str(root)], interval=0.05).start()
+    try:
+        assert wait_for(lambda: index.is_watched(str(root)))
+        (root / "Movies" / "Batman").mkdir()
+        assert wait_for(lambda: index.lookup("Batman", str(root)) == [str(root / "Movies" / "Batman")])
+    finally:
+        watcher.stop()
+
+
+@linux_only
+def test_inotify_watcher_picks_up_new_folders(tmp_path):
+    root = tmp_path / "root"
+    (root / "Movies").mkdir(parents=True)
+    index = FileIndex(str(tmp_path / "index.db"), max_age=3600)
+    watcher = InotifyWatcher(index, [str(root)], settle=0.05).start()
+    try:
+        assert wait_for(lambda: index.is_watched(str(root)))
+        (root / "Movies" / "Batman").mkdir()
+        assert wait_for(lambda: index.lookup("Batman", str(root)) == [str(root / "Movies" / "Batman")])
+    finally:
+        watcher.stop()
+
+
+@linux_only
+def test_inotify_watcher_polls_roots_past_the_watch_limit(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    (root / "Movies").mkdir(parents=True)
+    (root / "Comics").mkdir()
+    index = FileIndex(str(tmp_path / "index.db"), max_age=3600)
+    watcher = InotifyWatcher(index, [str(root)], settle=0.05, interval=0.05)
+    add_watch = watcher._add_watch
+
+    def limited_add_watch(path):
+        if os.path.basename(path) == "Comics":
+            raise OSError(errno.ENOSPC, "No space left on device", path)
+        add_watch(path)
+    monkeypatch.setattr(watcher, "_add_watch", limited_add_watch)
+
+    watcher.start()
+    try:
+        assert wait_for(lambda: index.is_watched(str(root)))
+        assert watcher.polling.roots == [str(root)]
+        (root / "Comics" / "Batman").mkdir()
+        assert wait_for(lambda: index.lookup("Batman", str(root)) == [str(root / "Comics" / "Batman")])
+    finally:
+        watcher.stop()
+
+
+def test_starting_a_watcher_does_not_index_on_the_caller_thread(tmp_path, monkeypatch):
+    root = tmp_path / "root"
+    (root / "Movies").mkdir(parents=True)
+    index = FileIndex(str(tmp_path / "index.db"))
+    callers = []
+    build = index.build
+    monkeypatch.setattr(index, "build", lambda *args: callers.append(threading.current_thread())
+                        or build(*args))
+
+    watcher = PollingWatcher(index, [str(root)], interval=60).start()
+    try:
+        assert wait_for(lambda: index.is_watched(str(root)))
+        assert callers and threading.current_thread() not in callers
+    finally:
+        watcher.stop()
+    assert not index.is_watched(str(root))
@@ -0,0 +1,39 @@
+from core.intent_router import IntentRouter
+
+
+def routed(text):
+    calls = IntentRouter().route(text)
+    return calls and (calls[0]["name"], calls[0]["args"].get("target_name")
+                      or calls[0]["args"].get("folder_name"))
+
+
+def test_commands_naming_one_target_skip_the_model():
+    assert routed("where is my Batman folder located?") == ("search_for_target", "Batman")
+    assert routed("find notes.txt") == ("search_for_target", "notes.txt")
+    assert routed("find the file 'Tax Returns 2023'") == ("search_for_target", "Tax Returns 2023")
+    assert routed("open the folder Documents") == ("open_file_or_folder", "Documents")
+    assert routed("please open my Projects folder") == ("open_file_or_folder", "Projects")
+    assert routed("create a folder named Reports") == ("create_folder", "Reports")
+
+
+def test_ordinary_sentences_and_compound_requests_go_to_the_model():
+    for text in ["find a recipe for pancakes", "find me a good book", "open the pod bay doors",
+                 "where is the nearest coffee shop", "find Batman and open it",
+                 "search for files mentioning invoices"]:
+        assert IntentRouter().route(text) is None, text
+
+
+def test_create_and_list_need_a_specific_name():
+    router = IntentRouter()
+    assert router.route("create a folder named 'Tax Returns' on my Desktop")[0]["args"] == \
+        {"folder_name": "Tax Returns", "path": "Desktop"}
+    assert router.route("make a file called notes.txt in Documents")[0]["args"] == \
+        {"file_name": "notes.txt", "path": "Documents"}
+    assert router.route("show me the files in my Downloads folder")[0]["args"] == \
+        {"path": "Downloads"}
+
+    for text in ["create a folder on my desktop", "make a file called report for tomorrow",
+                 "create a new folder", "create a folder called it", "make a file in here",
+                 "list all files", "list my recent emails", "list files", "list everything",
+                 "show me everything", "find it", "open this", "where is my stuff"]:
+        assert router.route(text) is None, text
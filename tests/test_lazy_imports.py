@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = ("langchain_openai", "PyPDF2", "docx")
+
+
+def test_entry_points_do_not_import_heavy_modules():
+    code = ("import sys, json\n"
+            "import core.ai, core.command_handler, core.chat_with_alfred\n"
+            f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-test"))
+    finished = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                              capture_output=True, text=True)
+
+    assert finished.returncode == 0, finished.stderr
+    assert json.loads(finished.stdout.strip().splitlines()[-1]) == []
+
+
+def test_importing_tools_creates_nothing_under_the_home_directory(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path),
+               OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "sk-test"))
+    for name in list(env):
+        if name.startswith("ALFRED_") and name.endswith(("_PATH", "_DIR", "_LOG")):
+            del env[name]
+    finished = subprocess.run([sys.executable, "-c", "import core.tools"], cwd=ROOT, env=env,
+                              capture_output=True, text=True)
+
+    assert finished.returncode == 0, finished.stderr
+    assert not (tmp_path / ".alfred").exists()
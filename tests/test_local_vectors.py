@@ -0,0 +1,43 @@
+import numpy as np
+from core.local_vectors import HashingEmbeddings, NumpyVectorStore
+
+
+def test_hashing_embeddings_are_deterministic_and_normalised():
+    embeddings = HashingEmbeddings(size=256)
+    first = embeddings.embed_documents(["Create a txt file called Joker", ""])
+    again = HashingEmbeddings(size=256).embed_query("Create a txt file called Joker")
+
+    assert first[0] == again
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+    assert len(first[0]) == 256
+    assert not any(first[1])
+
+
+def test_search_returns_the_top_k_in_score_order():
+    store = NumpyVectorStore(HashingEmbeddings())
+    store.add_texts(["create a new text file", "open a folder in finder",
+                     "read the content of a text file", "search for a folder by name"],
+                    ids=["create", "open", "read", "search"])
+
+    hits = store.similarity_search_with_score("create a text file", k=2)
+
+    assert [document.id for document, _ in hits] == ["create", "read"]
+    assert hits[0][1] >= hits[1][1]
+    assert len(store.similarity_search("anything", k=10)) == 4
+
+
+def test_empty_store_finds_nothing():
+    store = NumpyVectorStore(HashingEmbeddings())
+    assert len(store) == 0
+    assert store.similarity_search_with_score("create a file") == []
+
+
+def test_add_texts_keeps_metadata_and_replaces_by_id():
+    store = NumpyVectorStore(HashingEmbeddings())
+    store.add_texts(["create a file"], metadatas=[{"tool_name": "create_file"}], ids=["tool"])
+    store.add_texts(["open a folder"], metadatas=[{"tool_name": "open_folder"}], ids=["tool"])
+
+    [document] = store.similarity_search("open a folder", k=1)
+    assert len(store) == 1
+    assert document.page_content == "open a folder"
+    assert document.metadata == {"tool_name": "open_folder"}
@@ -0,0 +1,66 @@
+import json
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.checkpoint.memory import MemorySaver
+import core.langgraph_workflow as workflow
+from core.memory import MemoryManager
+from core.result_index import ResultIndex
+
+
+def test_large_tool_results_are_cut_to_the_relevant_chunks():
+    memory = MemoryManager(tool_result_tokens=100, results=ResultIndex(chunk_chars=200, overlap=0))
+    filler = "The butler polished the silver in the east wing. " * 60
+    document = filler + "The Batcave key is hidden under the grandfather clock. " + filler
+
+    content = json.loads(memory.tool_message_content(
+        document, "where is the batcave key hidden?", "wayne"))["result"]
+    reference = content.split('reference="')[1].split('"')[0]
+    more = memory.results.search(reference, "silver polish", k=2)
+
+    assert len(content) < 800
+    assert "grandfather clock" in content
+    assert memory.results.get(reference) == document
+    assert len(more) == 2 and "silver" in more[0]["text"]
+    assert json.loads(memory.tool_message_content(["a.txt"], "list"))["result"] == ["a.txt"]
+
+
+def test_history_stays_within_budget_across_checkpointed_turns(monkeypatch):
+    summaries = []
+
+    def summarize(summary, messages):
+        summaries.append(len(messages))
+        return (summary + " " + " ".join(m.content for m in messages
+                                         if isinstance(m, HumanMessage))).strip()
+
+    memory = MemoryManager(token_budget=300, summarize=summarize)
+    reply = "Certainly, sir. " * 20
+    monkeypatch.setattr(workflow, "get_memory", lambda: memory)
+    monkeypatch.setattr(workflow, "get_model_for_request", lambda *args: GenericFakeChatModel(
+        messages=iter([AIMessage(content=reply)] * 100)))
+    graph = workflow.graph.builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "batman"}}
+
+    sizes = []
+    for turn in range(12):
+        state = graph.invoke({"messages": [HumanMessage(content=f"request {turn}")]}, config)
+        sizes.append(memory.count(state["messages"]))
+
+    assert summaries
+    assert max(sizes[4:]) <= 300 + memory.count([AIMessage(content=reply)])
+    assert "request 0" in state["summary"]
+    assert state["messages"][-2].content == "request 11"
+    assert not isinstance(state["messages"][0], ToolMessage)
+
+
+def test_result_sessions_are_capped_and_can_be_dropped():
+    index = ResultIndex(chunk_chars=50, overlap=0, max_sessions=2)
+    first = index.put("alpha " * 20, "first")
+    second = index.put("beta " * 20, "second")
+    index.get(first)
+    third = index.put("gamma " * 20, "third")
+
+    assert index.get(second) is None
+    assert index.get(first) and index.get(third)
+
+    index.drop_session("third")
+    assert index.get(third) is None
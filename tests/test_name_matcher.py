@@ -0,0 +1,27 @@
+from core.name_matcher import TrigramIndex
+
+
+NAMES = ["Batman", "batman.txt", "Batman Begins.pdf", "Robin", "notes.txt", "Catwoman"]
+
+
+def test_fuzzy_search_ranks_case_and_extension_variants_in_one_pass():
+    index = TrigramIndex(NAMES)
+
+    ranked = [name for name, _ in index.search("batman", limit=3)]
+
+    assert ranked == ["Batman", "batman.txt", "Batman Begins.pdf"]
+
+
+def test_fuzzy_search_tolerates_typos():
+    index = TrigramIndex(NAMES)
+
+    assert index.search("catwomen", limit=1)[0][0] == "Catwoman"
+
+
+def test_glob_and_prefix_modes():
+    index = TrigramIndex(NAMES)
+
+    assert {name for name, _ in index.search("*.txt", mode="glob")} == {
+        "batman.txt", "notes.txt"}
+    assert {name for name, _ in index.search("BAT", mode="prefix")} == {
+        "Batman", "batman.txt", "Batman Begins.pdf"}
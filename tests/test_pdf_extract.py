@@ -0,0 +1,58 @@
+import pytest
+from core import pdf_extract
+from core.pdf_extract import extract_pdf_text
+
+PAGES = [f"Page {number} of the Wayne ledger" for number in range(1, 7)]
+
+
+@pytest.fixture
+def ledger(tmp_path, write_pdf):
+    path = tmp_path / "ledger.pdf"
+    write_pdf(str(path), PAGES)
+    return str(path)
+
+
+def page_numbers(text):
+    return [int(part.split()[0]) for part in text.split("Page ")[1:]]
+
+
+def test_page_range_is_clamped_to_the_document(ledger):
+    assert page_numbers(extract_pdf_text(ledger)) == [1, 2, 3, 4, 5, 6]
+    assert page_numbers(extract_pdf_text(ledger, start_page=0, end_page=99)) == [1, 2, 3, 4, 5, 6]
+    assert page_numbers(extract_pdf_text(ledger, start_page=2, end_page=4)) == [2, 3, 4]
+
+
+def test_empty_range_returns_no_text(ledger):
+    assert extract_pdf_text(ledger, start_page=5, end_page=4) == ""
+    assert extract_pdf_text(ledger, end_page=0) == ""
+    assert extract_pdf_text(ledger, start_page=7) == ""
+
+
+def test_serial_extraction_stops_at_max_chars(ledger):
+    text = extract_pdf_text(ledger, max_chars=40)
+    assert len(text) == 40
+    assert text.startswith("Page 1")
+
+
+def test_parallel_extraction_matches_serial(ledger, monkeypatch):
+    serial = extract_pdf_text(ledger, start_page=2)
+    monkeypatch.setattr(pdf_extract, "PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(pdf_extract, "PAGES_PER_TASK", 2)
+    monkeypatch.setattr(pdf_extract, "_POOL", None)
+    try:
+        assert extract_pdf_text(ledger, start_page=2) == serial
+        assert extract_pdf_text(ledger, start_page=2, max_chars=10) == serial[:10]
+    finally:
+        pdf_extract.get_pdf_pool().shutdown()
+
+
+def test_workers_reuse_their_reader_until_the_file_changes(ledger, write_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_extract, "_WORKER_READER", None)
+    assert pdf_extract.extract_pages(ledger, 0, 2)[1].startswith("Page 2")
+    reader = pdf_extract._WORKER_READER[2]
+    assert pdf_extract.extract_pages(ledger, 4, 6)[0].startswith("Page 5")
+    assert pdf_extract._WORKER_READER[2] is reader
+
+    write_pdf(ledger, ["Rewritten page"] * 2)
+    assert pdf_extract.extract_pages(ledger, 0, 1)[0].startswith("Rewritten")
+    pdf_extract._WORKER_READER[1].close()
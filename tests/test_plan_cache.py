@@ -0,0 +1,73 @@
+import time
+from core.local_vectors import HashingEmbeddings
+from core.plan_cache import PlanCache
+
+
+def plan(name, **args):
+    return [{"name": name, "args": args, "id": "call_1"}]
+
+
+def test_exact_and_similar_requests_reuse_the_plan_only_for_the_same_arguments():
+    cache = PlanCache(HashingEmbeddings(), threshold=0.5)
+    cache.put("prompt: where is my Batman folder", "where is my Batman folder",
+              plan("search_for_target", target_name="Batman"))
+
+    exact = cache.get("prompt: where is my Batman folder", "where is my Batman folder")
+    similar = cache.get("prompt: where is my batman folder?", "where is my batman folder?")
+    other = cache.get("prompt: where is my Robin folder", "where is my Robin folder")
+
+    assert exact[0]["args"] == {"target_name": "Batman"}
+    assert exact[0]["id"] != "call_1"
+    assert similar[0]["name"] == "search_for_target"
+    assert other is None
+    assert cache.stats()["exact_hits"] == 1
+    assert cache.stats()["similar_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_and_are_evicted_least_recently_used_first():
+    cache = PlanCache(max_entries=2, ttl=0.05)
+    cache.put("a", "a", plan("list_files_and_folders", path="a"))
+    cache.put("b", "b", plan("list_files_and_folders", path="b"))
+    cache.get("a", "a")
+    cache.put("c", "c", plan("list_files_and_folders", path="c"))
+
+    assert cache.get("b", "b") is None
+    assert cache.get("a", "a") is not None
+    time.sleep(0.06)
+    assert cache.get("a", "a") is None
+
+
+def test_write_plans_are_only_replayed_for_the_exact_prompt():
+    cache = PlanCache(HashingEmbeddings(), threshold=0.0)
+    cache.put("prompt: append hello to notes.txt", "append hello to notes.txt",
+              plan("append_to_file", content="hello", file_path="notes.txt"))
+    cache.put("prompt: create a file called a in the folder b",
+              "create a file called a in the folder b", plan("create_file", file_name="a", path="b"))
+
+    assert cache.get("prompt: append hello world to notes.txt",
+                     "append hello world to notes.txt") is None
+    assert cache.get("prompt: create a file called abc in the folder bcd",
+                     "create a file called abc in the folder bcd") is None
+    assert cache.get("prompt: append hello to notes.txt", "append hello to notes.txt")
+
+
+def test_aliases_of_write_tools_and_non_text_arguments_only_match_exactly():
+    cache = PlanCache(HashingEmbeddings(), threshold=0.0)
+    cache.put("prompt: make notes", "make notes", plan(
+        "Batch File Operations", operations=[{"op": "create_file", "path": "notes.txt"}]))
+    cache.put("prompt: read pages 5 of report.pdf", "read pages 5 of report.pdf",
+              plan("read_file_content", file_path="report.pdf", start_page=5))
+
+    assert cache.get("prompt: make notes again", "make notes again") is None
+    assert cache.get("prompt: read pages 1 of report.pdf", "read pages 1 of report.pdf") is None
+    assert cache.get("prompt: make notes", "make notes")
+
+
+def test_read_plans_need_whole_word_arguments():
+    cache = PlanCache(HashingEmbeddings(), threshold=0.0)
+    cache.put("prompt: where is Bat", "where is Bat", plan("search_for_target", target_name="Bat"))
+
+    assert cache.get("prompt: where is Batman", "where is Batman") is None
+    assert cache.get("prompt: where's my bat?", "where's my bat?")[0]["args"] == \
+        {"target_name": "Bat"}
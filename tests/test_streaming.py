@@ -0,0 +1,39 @@
+import asyncio
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+import core.chat_with_alfred as chat
+import core.langgraph_workflow as workflow
+
+REPLY = "Ah, the weather. Dreadful, as usual."
+
+
+def fake_model(user_input, required_tools=()):
+    return GenericFakeChatModel(messages=iter([AIMessage(content=REPLY)]))
+
+
+def test_chat_streams_tokens_and_sessions_share_one_loop(monkeypatch):
+    monkeypatch.setattr(chat, "get_model_for_request", fake_model)
+    monkeypatch.setattr(chat, "USE_PLAN_CACHE", False)
+    sessions = {"first": [], "second": []}
+
+    async def run():
+        return await asyncio.gather(*(
+            chat.achat_with_alfred("tell me a joke and then sing", tokens.append)
+            for tokens in sessions.values()))
+
+    replies = asyncio.run(run())
+
+    assert replies == [REPLY, REPLY]
+    for tokens in sessions.values():
+        assert len(tokens) > 1
+        assert "".join(tokens) == REPLY
+
+
+def test_graph_streams_tokens_from_the_ai_node(monkeypatch):
+    monkeypatch.setattr(workflow, "get_model_for_request", fake_model)
+    tokens = []
+
+    messages = asyncio.run(workflow.astream_reply("what's the weather like?", tokens.append))
+
+    assert "".join(tokens) == REPLY
+    assert messages[-1].content == REPLY
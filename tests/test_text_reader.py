@@ -0,0 +1,21 @@
+from core import text_reader
+
+
+def test_head_tail_and_line_ranges(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 101)))
+
+    assert text_reader.head(str(path), 2) == "line 1\nline 2\n"
+    assert text_reader.tail(str(path), 2) == "line 99\nline 100\n"
+    assert text_reader.read_lines(str(path), 10, 11) == "line 10\nline 11\n"
+    assert text_reader.head(str(path), 100, max_bytes=10) == "line 1\nlin"
+
+
+def test_chunks_do_not_split_multibyte_characters(tmp_path):
+    path = tmp_path / "accents.txt"
+    path.write_text("café " * 1000, encoding="utf-8")
+
+    chunks = list(text_reader.iter_chunks(str(path), chunk_size=7))
+
+    assert "".join(chunks) == "café " * 1000
+    assert "�" not in "".join(chunks)
@@ -0,0 +1,55 @@
+import threading
+import time
+import pytest
+from langchain_core.tools import tool
+import core.tool_execution as tool_execution
+from core.tool_registry import ToolRegistry
+from core.tool_execution import execute_tool_call
+
+pytestmark = pytest.mark.usefixtures("alfred_home")
+
+
+def test_writes_to_one_path_keep_their_order_and_results_stay_aligned(tmp_path):
+    notes = str(tmp_path / "notes.txt")
+    calls = [
+        {"name": "create_file", "args": {"file_name": "notes.txt", "path": str(tmp_path)}},
+        {"name": "no_such_tool", "args": {}},
+        {"name": "append_to_file", "args": {"file_path": notes, "content": "one "}},
+        {"name": "append_to_file", "args": {"file_path": notes, "content": "two"}},
+        {"name": "list_files_and_folders", "args": {"path": str(tmp_path)}},
+    ]
+
+    results = execute_tool_call(calls)
+
+    assert [r["tool"] for r in results] == [c["name"] for c in calls]
+    assert "error" in results[1]
+    assert results[4]["result"] == ["notes.txt"]
+    assert open(notes).read() == "one \ntwo\n"
+
+
+def test_independent_reads_run_concurrently(monkeypatch):
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    @tool
+    def search_for_target(target_name: str) -> str:
+        """Pretends to search slowly."""
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.pop()
+        return target_name
+
+    registry = ToolRegistry()
+    registry.register(search_for_target, access=("read", lambda args: ["/"]))
+    monkeypatch.setattr(tool_execution, "get_registry", lambda: registry)
+
+    names = ["Batman", "Robin", "Alfred", "Joker"]
+    results = execute_tool_call(
+        [{"name": "search_for_target", "args": {"target_name": n}} for n in names])
+
+    assert [r["result"] for r in results] == names
+    assert max(peak) > 1
@@ -0,0 +1,42 @@
+import os
+from core.tool_execution import execute_tool_call
+from core.tool_registry import get_registry
+
+
+def test_aliases_resolve_to_one_spec_with_compiled_required_and_optional_arguments():
+    registry = get_registry()
+    spec = registry.get("read_file_content")
+
+    assert registry.get("Read_File_Content") is spec
+    assert registry.get("Read File Content") is spec
+    assert registry.get("READ_FILE_CONTENT") is spec
+    assert spec.required == {"file_path"}
+    assert spec.allowed == {"file_path", "start_page", "end_page", "max_chars"}
+    assert registry.get("no_such_tool") is None
+
+
+def test_normalisers_remap_legacy_names_and_arguments():
+    registry = get_registry()
+
+    search = registry.get("Search_for_Folder")
+    assert search.name == "search_for_target"
+    assert search.normalise({"param": "Batman"}) == {"target_name": "Batman"}
+    assert search.normalise({"folder_name": "Batman", "colour": "black"}) == \
+        {"target_name": "Batman"}
+
+    create = registry.get("create_folder")
+    assert create.normalise({"folder_name": "x", "path": "desktop"})["path"] == \
+        os.path.join(os.path.expanduser("~"), "Desktop")
+
+
+def test_calls_with_only_required_arguments_run_and_missing_ones_are_rejected(tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello")
+
+    results = execute_tool_call([
+        {"name": "Read_File_Content", "args": {"file_path": str(notes)}},
+        {"name": "read_file_content", "args": {"max_chars": 3}},
+    ])
+
+    assert results[0] == {"tool": "read_file_content", "result": "hello"}
+    assert "file_path" in results[1]["error"]
@@ -0,0 +1,81 @@
+import pytest
+from core import ai, tool_selector
+from core.local_vectors import HashingEmbeddings, NumpyVectorStore
+from core.tools import get_tool_registry
+
+
+class FakeModel:
+    """Records every bind_tools call instead of talking to an API."""
+
+    def __init__(self):
+        self.bindings = []
+
+    def bind_tools(self, tools):
+        names = tuple(tool.name for tool in tools)
+        self.bindings.append(names)
+        return ("bound", names)
+
+
+@pytest.fixture
+def tool_store(monkeypatch):
+    registry = get_tool_registry()
+    store = NumpyVectorStore(HashingEmbeddings())
+    store.add_texts([tool.description for tool in registry.values()], ids=list(registry))
+    monkeypatch.setattr(tool_selector, "get_vector_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    tools = list(get_tool_registry().values())
+    monkeypatch.setattr(ai, "MODELS", {"model": model, "tools": tools,
+                                       "model_with_tools": "all tools"})
+    monkeypatch.setattr(ai, "BOUND_MODELS", {})
+    monkeypatch.setattr(ai, "SELECTIONS", ai.OrderedDict())
+    monkeypatch.setattr(ai, "USE_TOOL_SELECTION", True)
+    return model
+
+
+def test_selects_the_best_matching_tools(tool_store):
+    selected = tool_selector.select_tools("read the text content of my file", k=3, min_score=0.0)
+    assert len(selected) == 3
+    assert "read_file_content" in [tool.name for tool in selected]
+
+
+def test_low_confidence_falls_back_to_every_tool(tool_store, fake_model):
+    assert tool_selector.select_tools("read my file", min_score=0.99) is None
+
+    assert ai.get_model_for_request("zzqx vvkj") == "all tools"
+    assert fake_model.bindings == []
+
+
+def test_required_tools_are_always_bound(fake_model, monkeypatch):
+    read_file = get_tool_registry()["read_file_content"]
+    monkeypatch.setattr(tool_selector, "select_tools", lambda user_input: [read_file])
+
+    ai.get_model_for_request("summarise it", required_tools={"create_file"})
+
+    assert fake_model.bindings == [("read_file_content", "create_file")]
+
+
+def test_bind_tool_subset_reuses_bindings(fake_model):
+    registry = get_tool_registry()
+    first = ai.bind_tool_subset([registry["create_file"], registry["read_file_content"]])
+    second = ai.bind_tool_subset([registry["read_file_content"], registry["create_file"]])
+
+    assert first is second
+    assert len(fake_model.bindings) == 1
+
+
+def test_selection_runs_once_per_user_turn(fake_model, monkeypatch):
+    read_file = get_tool_registry()["read_file_content"]
+    calls = []
+    monkeypatch.setattr(tool_selector, "select_tools",
+                        lambda user_input: calls.append(user_input) or [read_file])
+
+    for _ in range(3):
+        ai.get_model_for_request("summarise report.txt", required_tools={"create_file"})
+
+    assert calls == ["summarise report.txt"]
+    assert fake_model.bindings == [("read_file_content", "create_file")]
@@ -0,0 +1,54 @@
+import json
+from core import tool_execution, tracing
+from core.tracing import HistogramSink, JsonLinesSink, RecordingSink, Tracer
+
+
+def test_spans_nest_and_reach_every_sink(tmp_path):
+    histogram, recording = HistogramSink(), RecordingSink()
+    log = JsonLinesSink(str(tmp_path / "trace.jsonl"))
+    tracer = Tracer([histogram, recording, log])
+
+    with tracer.span("chat"):
+        for _ in range(3):
+            with tracer.span("tool.read_file_content", chars=10):
+                pass
+    try:
+        with tracer.span("tool.create_file"):
+            raise OSError("disk full")
+    except OSError:
+        pass
+    log.close()
+
+    outer = recording.spans[3]
+    inner = recording.spans[0]
+    assert outer["name"] == "chat" and outer["parent"] is None
+    assert inner["parent"] == outer["span"] and inner["trace"] == outer["trace"]
+    assert recording.spans[-1]["error"] == "OSError"
+
+    summary = histogram.summary("tool.")
+    assert set(summary) == {"tool.read_file_content", "tool.create_file"}
+    assert summary["tool.read_file_content"]["count"] == 3
+    assert summary["tool.read_file_content"]["p50_ms"] <= summary["tool.read_file_content"]["p99_ms"]
+
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines][-1] == "tool.create_file"
+
+
+def test_tool_runs_are_timed_per_tool_and_quiet_mode_prints_nothing(tmp_path, monkeypatch, capsys):
+    histogram = HistogramSink()
+    monkeypatch.setattr(tracing, "TRACER", Tracer([histogram]))
+    monkeypatch.setattr(tracing, "VERBOSITY", tracing.QUIET)
+    target = tmp_path / "notes.txt"
+    target.write_text("hello")
+    calls = [{"name": "read_file_content",
+              "args": {"file_path": str(target), "start_page": None, "end_page": None,
+                       "max_chars": None}}] * 2
+
+    results = tool_execution.execute_tool_call(calls)
+
+    assert [result["result"] for result in results] == ["hello", "hello"]
+    assert capsys.readouterr().out == ""
+    summary = histogram.summary()
+    assert summary["tool.read_file_content"]["count"] == 2
+    assert summary["tools.execute"]["count"] == 1
+    assert summary["tools.validate"]["count"] == 2
@@ -1,10 +1,9 @@
 import os
 import json
 from langchain_core.documents import Document
-from langchain_core.vectorstores import InMemoryVectorStore
-from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
-from core.tools import get_tool_registry
+from core.local_vectors import NumpyVectorStore
+from core.tools import get_tool_registry, create_embeddings
 
 load_dotenv()
 
@@ -13,11 +12,10 @@ api_key = os.getenv("OPENAI_API_KEY")
 if not api_key:
     raise ValueError("Error: OPENAI_API_KEY is not set in .env!")
 
-embeddings = OpenAIEmbeddings(
-    openai_api_key=api_key, model="text-embedding-3-large"
-)
+# Offline hashed embeddings unless ALFRED_VECTOR_BACKEND asks for another backend.
+embeddings = create_embeddings(os.getenv("ALFRED_VECTOR_BACKEND", "local"))
 
-vectorstore = InMemoryVectorStore(embedding=embeddings)
+vectorstore = NumpyVectorStore(embedding=embeddings)
 
 tool_registry = get_tool_registry()
 tool_documents = [
@@ -0,0 +1,27 @@
+import os
+from core.walker import ParallelWalker
+
+
+def test_find_skips_excluded_folders_and_stops_early(tmp_path):
+    for i in range(50):
+        os.makedirs(tmp_path / f"dir_{i}" / "Batman")
+    os.makedirs(tmp_path / "node_modules" / "pkg" / "Batman")
+    walker = ParallelWalker({"node_modules"}, workers=4, batch_size=4)
+
+    found = walker.find(str(tmp_path), "Batman")
+    first = walker.find(str(tmp_path), "Batman", max_results=1)
+
+    assert len(found) == 50
+    assert not any("node_modules" in path for path in found)
+    assert len(first) == 1
+
+
+def test_find_respects_max_depth_and_deadline(tmp_path):
+    os.makedirs(tmp_path / "Batman")
+    os.makedirs(tmp_path / "a" / "b" / "Batman")
+    walker = ParallelWalker(workers=2)
+
+    assert walker.find(str(tmp_path), "Batman", max_depth=1) == [
+        str(tmp_path / "Batman")]
+    assert len(walker.find(str(tmp_path), "Batman", max_depth=3)) == 2
+    assert walker.find(str(tmp_path), "Batman", deadline=0) == []